@@ -14,11 +14,15 @@ import multiprocessing as mp
 from rdflib import Graph
 from pyoxigraph import Store
 from io import BytesIO
-from itertools import repeat
+from functools import partial
 
 from .args_parser import load_config_from_command_line
 from .mapping.mapping_parser import retrieve_mappings, MappingParser
-from .materializer import _materialize_mapping_group_to_set
+from .mapping.mapping_scheduler import schedule_mapping_groups
+from .materializer import _materialize_mapping_groups_to_set
+from .data_source.source_cache import SOURCE_CACHE
+from .fnml.function_cache import FUNCTION_CACHE
+from .data_source.relational_db import clear_relational_db_caches
 from .args_parser import load_config_from_argument
 from .constants import RML_TRIPLES_MAP_CLASS, LOGGING_NAMESPACE
 from .mapping.yarrrml import load_yarrrml
@@ -38,26 +42,40 @@ def materialize_set(config, python_source=None):
             f'If you need to speed up your data integration pipeline, please run through the command line.')
         config.set_number_of_processes('1')
 
+    # the schemas of the tables cached in previous calls could be outdated
+    clear_relational_db_caches()
+
     rml_df, fnml_df, http_api_df = retrieve_mappings(config)
     config.set('CONFIGURATION', 'http_api_df', http_api_df.to_csv())
 
     # keep only asserted mapping rules
     asserted_mapping_df = rml_df.loc[rml_df['triples_map_type'] == RML_TRIPLES_MAP_CLASS]
     mapping_groups = [group for _, group in asserted_mapping_df.groupby(by='mapping_partition')]
+    # mapping groups reading the same sources are materialized in the same process
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, config)
+
+    # data and function results cached in previous calls could be outdated (e.g., different UDFs)
+    SOURCE_CACHE.clear()
+    FUNCTION_CACHE.clear()
 
     if config.is_multiprocessing_enabled():
         LOGGER.debug(f'Parallelizing with {config.get_number_of_processes()} cores.')
 
         pool = mp.Pool(config.get_number_of_processes())
-        triples = set().union(*pool.starmap(_materialize_mapping_group_to_set,
-                                            zip(mapping_groups, repeat(rml_df), repeat(fnml_df), repeat(config),
-                                                repeat(python_source))))
+        # the most costly tasks are dispatched first, one at a time
+        triples = set().union(*pool.imap_unordered(partial(_materialize_mapping_groups_to_set, rml_df=rml_df,
+                                                           fnml_df=fnml_df, config=config, python_source=python_source),
+                                                   mapping_tasks, chunksize=1))
         pool.close()
         pool.join()
     else:
         triples = set()
-        for mapping_group in mapping_groups:
-            triples.update(_materialize_mapping_group_to_set(mapping_group, rml_df, fnml_df, config, python_source))
+        for mapping_task in mapping_tasks:
+            triples.update(_materialize_mapping_groups_to_set(mapping_task, rml_df, fnml_df, config, python_source))
+        SOURCE_CACHE.clear()
+        FUNCTION_CACHE.clear()
+    # do not keep idle connections to the databases
+    clear_relational_db_caches()
 
     LOGGER.info(f'Number of triples generated in total: {len(triples)}.')
 
@@ -11,13 +11,16 @@ import logging
 
 import multiprocessing as mp
 
-from itertools import repeat
+from functools import partial
 
 from .args_parser import load_config_from_command_line
-from .materializer import _materialize_mapping_group_to_file
-from .materializer import _materialize_mapping_group_to_kafka
+from .materializer import _materialize_mapping_groups_to_file
+from .materializer import _materialize_mapping_groups_to_kafka
+from .data_source.source_cache import SOURCE_CACHE
+from .fnml.function_cache import FUNCTION_CACHE
 from .utils import get_delta_time
 from .mapping.mapping_parser import retrieve_mappings
+from .mapping.mapping_scheduler import schedule_mapping_groups
 from .constants import LOGGING_NAMESPACE, RML_TRIPLES_MAP_CLASS
 from .utils import prepare_output_files
 
@@ -66,6 +69,8 @@ def main():
     # keep only asserted mapping rules
     asserted_mapping_df = rml_df.loc[rml_df['triples_map_type'] == RML_TRIPLES_MAP_CLASS]
     mapping_groups = [group for _, group in asserted_mapping_df.groupby(by='mapping_partition')]
+    # mapping groups reading the same sources are materialized in the same process
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, config)
 
     prepare_output_files(config, rml_df)
 
@@ -76,19 +81,22 @@ def main():
 
         pool = mp.Pool(config.get_number_of_processes())
         if not config.get_output_kafka_server():
-            num_triples = sum(pool.starmap(_materialize_mapping_group_to_file,
-                                           zip(mapping_groups, repeat(rml_df), repeat(fnml_df), repeat(config))))
+            materialize_mapping_groups = _materialize_mapping_groups_to_file
         else:
-            num_triples = sum(pool.starmap(_materialize_mapping_group_to_kafka,
-                                           zip(mapping_groups, repeat(rml_df), repeat(fnml_df), repeat(config))))
+            materialize_mapping_groups = _materialize_mapping_groups_to_kafka
+        # the most costly tasks are dispatched first, one at a time
+        num_triples = sum(pool.imap_unordered(partial(materialize_mapping_groups, rml_df=rml_df, fnml_df=fnml_df,
+                                                      config=config), mapping_tasks, chunksize=1))
         pool.close()
         pool.join()
     else:
-        for mapping_group in mapping_groups:
+        for mapping_task in mapping_tasks:
             if not config.get_output_kafka_server():
-                num_triples += _materialize_mapping_group_to_file(mapping_group, rml_df, fnml_df, config)
+                num_triples += _materialize_mapping_groups_to_file(mapping_task, rml_df, fnml_df, config)
             else:
-                num_triples += _materialize_mapping_group_to_kafka(mapping_group, rml_df, fnml_df, config)
+                num_triples += _materialize_mapping_groups_to_kafka(mapping_task, rml_df, fnml_df, config)
+        SOURCE_CACHE.clear()
+        FUNCTION_CACHE.clear()
 
     LOGGER.info(f'Number of triples generated in total: {num_triples}.')
     LOGGER.info(f'Materialization finished in {get_delta_time(start_time)} seconds.')
@@ -0,0 +1,210 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import logging
+
+import pandas as pd
+
+from .constants import *
+from .utils import get_rml_rule, get_references_in_join_condition, get_references_in_term_map, has_graph_map, \
+    get_term_map_positions, is_template_rml_rule
+from .template import compile_template
+from .encoding import percent_encode_arrow, escape_literal_arrow
+from .data_source.data_file import get_file_arrow_data
+
+
+LOGGER = logging.getLogger(LOGGING_NAMESPACE)
+
+ARROW_SOURCE_TYPES = [CSV, TSV, PARQUET, ORC] + FEATHER
+
+
+def _is_supported_source(rml_rule):
+    return rml_rule['source_type'] in ARROW_SOURCE_TYPES and rml_rule['logical_source_type'] == RML_SOURCE and \
+        os.path.isfile(str(rml_rule['logical_source_value']).strip())
+
+
+def is_supported_by_arrow(rml_rule, rml_df, config):
+    """
+    Checks whether a mapping rule can be materialized with pyarrow. Only local CSV, TSV, Parquet, Feather and ORC
+    files, and term maps that are templates, constants or references are supported. The rest of mapping rules
+    (functions, RML-star, other data sources) are materialized with pandas.
+    """
+
+    return is_template_rml_rule(rml_rule, rml_df, config, _is_supported_source)
+
+
+def _to_string_column(column):
+    import pyarrow as pa
+
+    if column.null_count == 0 and (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        return column.cast(pa.string())
+
+    # the rest of columns are converted as in the pandas engine
+    return pa.array(column.to_pandas().map(str).to_numpy(dtype=object), type=pa.string())
+
+
+def _preprocess_table(table, references, config):
+    """
+    Converts the referenced columns to strings, removes the rows with null values in them and duplicated rows.
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    references = list(dict.fromkeys(references))
+    table = pa.table({reference: _to_string_column(table.column(reference)) for reference in references})
+
+    na_values = pa.array(config.get_na_values(), type=pa.string())
+    for reference in references:
+        table = table.filter(pc.invert(pc.is_in(table.column(reference), value_set=na_values)))
+
+    return table.group_by(references).aggregate([])
+
+
+def _normalize_literal_datatype(values, datatype):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    # same normalization as in the materializer, Natural Mapping of SQL Values
+    if datatype == XSD_BOOLEAN:
+        return pc.utf8_lower(values)
+    elif datatype == XSD_DATETIME:
+        return pc.replace_substring(values, ' ', 'T')
+    elif datatype == XSD_INTEGER or datatype == XSD_NONNEGATIVEINTEGER:
+        return pc.cast(pc.cast(pc.trunc(pc.cast(values, pa.float64())), pa.int64()), pa.string())
+
+    return values
+
+
+def _materialize_term(table, template, expression_type, config, columns_alias='', termtype='', datatype=''):
+    """
+    Returns a pyarrow array (or a scalar for constant term maps) with the terms of a term map, equivalent to
+    `_materialize_template` in the materializer.
+    """
+
+    import pyarrow.compute as pc
+
+    compiled_template = compile_template(template, expression_type)
+
+    if termtype.strip() == RML_IRI:
+        prefix, suffix = '<', '>'
+    elif termtype.strip() == RML_BLANK_NODE:
+        prefix, suffix = '_:', ''
+    elif termtype.strip() == RML_LITERAL:
+        prefix, suffix = '"', '"'
+    else:
+        prefix, suffix = '', ''
+
+    segments = list(compiled_template.segments)
+    segments[0] = prefix + segments[0]
+    segments[-1] = segments[-1] + suffix
+
+    term_parts = [segments[0]]
+    for reference, segment in zip(compiled_template.references, segments[1:]):
+        values = table.column(columns_alias + reference)
+        if termtype.strip() == RML_IRI and expression_type == RML_TEMPLATE:
+            safe_percent_encoding = config.get_safe_percent_encoding()
+            values = percent_encode_arrow(values, safe_percent_encoding if safe_percent_encoding else None)
+        elif termtype.strip() == RML_LITERAL:
+            values = _normalize_literal_datatype(values, datatype)
+            values = escape_literal_arrow(values, config.get_literal_escaping_chars())
+        term_parts.extend([values, segment])
+
+    return pc.binary_join_element_wise(*term_parts, '')
+
+
+def _get_parent_table(rml_rule, rml_df, config):
+    """
+    Reads the data of the parent triples map of a referencing object map, its columns are prefixed with `parent_`.
+    """
+
+    parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+    _, parent_join_references = get_references_in_join_condition(rml_rule, 'object_join_conditions')
+
+    parent_references = get_references_in_term_map(parent_triples_map_rule, 'subject') + parent_join_references
+    parent_table = get_file_arrow_data(parent_triples_map_rule, set(parent_references),
+                                       na_values=config.get_na_values())
+    parent_table = _preprocess_table(parent_table, parent_references, config)
+
+    return parent_table.rename_columns(['parent_' + column for column in parent_table.column_names])
+
+
+def _materialize_table(table, rml_rule, rml_df, config):
+    import pyarrow.compute as pc
+
+    subject_term = _materialize_term(table, rml_rule['subject_map_value'], rml_rule['subject_map_type'], config,
+                                     termtype=rml_rule['subject_termtype'])
+    predicate_term = _materialize_term(table, rml_rule['predicate_map_value'], rml_rule['predicate_map_type'], config,
+                                       termtype=RML_IRI)
+
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+        parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+        object_term = _materialize_term(table, parent_triples_map_rule['subject_map_value'],
+                                        parent_triples_map_rule['subject_map_type'], config, columns_alias='parent_',
+                                        termtype=rml_rule['object_termtype'])
+    else:
+        object_term = _materialize_term(table, rml_rule['object_map_value'], rml_rule['object_map_type'], config,
+                                        termtype=rml_rule['object_termtype'],
+                                        datatype=rml_rule['lang_datatype_map_value'])
+
+    if rml_rule['lang_datatype'] == RML_LANGUAGE_MAP:
+        language_term = _materialize_term(table, rml_rule['lang_datatype_map_value'],
+                                          rml_rule['lang_datatype_map_type'], config)
+        object_term = pc.binary_join_element_wise(object_term, language_term, '@')
+    elif rml_rule['lang_datatype'] == RML_DATATYPE_MAP:
+        datatype_term = _materialize_term(table, rml_rule['lang_datatype_map_value'],
+                                          rml_rule['lang_datatype_map_type'], config, termtype=RML_IRI)
+        object_term = pc.binary_join_element_wise(object_term, datatype_term, '^^')
+
+    triple_terms = [subject_term, predicate_term, object_term]
+    if config.get_output_format() == NQUADS:
+        if has_graph_map(rml_rule, config):
+            triple_terms.append(_materialize_term(table, rml_rule['graph_map_value'], rml_rule['graph_map_type'],
+                                                  config, termtype=RML_IRI))
+        else:
+            triple_terms.append('')
+
+    triples = pc.unique(pc.binary_join_element_wise(*triple_terms, ' '))
+
+    # the triples are converted to Python strings for the deduplication and the serialization
+    return pd.DataFrame({'triple': triples.to_numpy(zero_copy_only=False)})
+
+
+def materialize_rml_rule_with_arrow(rml_rule, rml_df, config):
+    """
+    Generator of DataFrames with the triples of a mapping rule, in a column `triple`. The logical source is read into
+    pyarrow Tables and the triples are generated with pyarrow compute kernels. If `chunk_size` is enabled in the
+    config, the logical source is processed in batches of at most `chunk_size` rows (the parent triples map of a
+    referencing object map is read at once).
+    """
+
+    references = set()
+    for position in get_term_map_positions(rml_rule, config):
+        references.update(get_references_in_term_map(rml_rule, position))
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+        references.update(get_references_in_join_condition(rml_rule, 'object_join_conditions')[0])
+
+    parent_table = None
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+        parent_table = _get_parent_table(rml_rule, rml_df, config)
+
+    tables = get_file_arrow_data(rml_rule, references, config.get_chunk_size(), config.get_na_values())
+    if not config.get_chunk_size():
+        tables = [tables]
+
+    for table in tables:
+        table = _preprocess_table(table, references, config)
+        if parent_table is not None:
+            child_join_references, parent_join_references = get_references_in_join_condition(
+                rml_rule, 'object_join_conditions')
+            table = table.join(parent_table, keys=child_join_references,
+                               right_keys=['parent_' + reference for reference in parent_join_references],
+                               join_type='inner', coalesce_keys=False)
+
+        yield _materialize_table(table, rml_rule, rml_df, config)
@@ -9,6 +9,7 @@ __email__ = "arenas.guerrero.julian@outlook.com"
 import errno
 import os
 import logging
+import importlib.util
 import multiprocessing as mp
 
 from configparser import ConfigParser
@@ -37,8 +38,20 @@ SAFE_PERCENT_ENCODING = 'safe_percent_encoding'
 MAPPING_PARTITIONING = 'mapping_partitioning'
 INFER_SQL_DATATYPES = 'infer_sql_datatypes'
 ENFORCE_SQL_QUERY_FILTER_NULL = 'enforce_sql_filter_null'
+SQL_PUSHDOWN = 'sql_pushdown'
+FNML_MEMOIZATION = 'fnml_memoization'
 
 NUMBER_OF_PROCESSES = 'number_of_processes'
+CHUNK_SIZE = 'chunk_size'
+DEDUPLICATION = 'deduplication'
+DEDUPLICATION_BUFFER_SIZE = 'deduplication_buffer_size'
+SOURCE_CACHE_SIZE = 'source_cache_size'
+FNML_CACHE_SIZE = 'fnml_cache_size'
+SHARD_MAPPING_GROUPS = 'shard_mapping_groups'
+TABLE_PARTITIONS = 'table_partitions'
+JOIN_PARTITIONS = 'join_partitions'
+ENGINE = 'engine'
+CSV_READER = 'csv_reader'
 
 UDFS = 'udfs'
 API_TOKEN = 'api_token'
@@ -58,6 +71,7 @@ MAPPINGS = 'mappings'
 FILE_PATH = 'file_path'
 DB_URL = 'db_url'
 CONNECT_ARGS = 'connect_args'
+FETCH_SIZE = 'fetch_size'
 
 ##############################################################################
 ##########################  KAFKA PARAMETERS  ################################
@@ -76,7 +90,19 @@ DEFAULT_SAFE_PERCENT_ENCODING = ''
 DEFAULT_LOGGING_FILE = ''
 DEFAULT_LOGGING_LEVEL = 'INFO'
 DEFAULT_INFER_SQL_DATATYPES = 'no'
+DEFAULT_SQL_PUSHDOWN = 'no'
+DEFAULT_FNML_MEMOIZATION = 'yes'
 DEFAULT_NUMBER_OF_PROCESSES = 2 * mp.cpu_count()
+DEFAULT_CHUNK_SIZE = 0   # 0 disables chunked materialization
+DEFAULT_DEDUPLICATION = EXACT_DEDUPLICATION
+DEFAULT_DEDUPLICATION_BUFFER_SIZE = 1000000
+DEFAULT_SOURCE_CACHE_SIZE = 0   # in MB per process, 0 disables the source cache
+DEFAULT_FNML_CACHE_SIZE = 0   # in number of function results, 0 disables the function cache
+DEFAULT_SHARD_MAPPING_GROUPS = 'no'   # shards re-read the whole source, only for CPU-bound mapping groups
+DEFAULT_TABLE_PARTITIONS = 0   # 0 disables range-partitioned tables
+DEFAULT_JOIN_PARTITIONS = 0   # 0 disables partitioned joins
+DEFAULT_ENGINE = PANDAS_ENGINE
+DEFAULT_CSV_READER = PANDAS_ENGINE
 DEFAULT_NA_VALUES = ',nan' # ',#N/A,N/A,#N/A N/A,n/a,NA,<NA>,#NA,NULL,null,NaN,nan,None'
 DEFAULT_LITERAL_ESCAPING_CHARS = '",\n,\r' # \n,\t,\b,\f,\r,",'
 DEFAULT_ONLY_PRINTABLE_CHARS = 'no'
@@ -116,8 +142,20 @@ CONFIGURATION_OPTIONS_EMPTY_NON_VALID = {
             OUTPUT_FORMAT: DEFAULT_OUTPUT_FORMAT,
             ONLY_PRINTABLE_CHARS: DEFAULT_ONLY_PRINTABLE_CHARS,
             INFER_SQL_DATATYPES: DEFAULT_INFER_SQL_DATATYPES,
+            SQL_PUSHDOWN: DEFAULT_SQL_PUSHDOWN,
+            FNML_MEMOIZATION: DEFAULT_FNML_MEMOIZATION,
             LOGGING_LEVEL: DEFAULT_LOGGING_LEVEL,
-            NUMBER_OF_PROCESSES: DEFAULT_NUMBER_OF_PROCESSES
+            NUMBER_OF_PROCESSES: DEFAULT_NUMBER_OF_PROCESSES,
+            CHUNK_SIZE: DEFAULT_CHUNK_SIZE,
+            DEDUPLICATION: DEFAULT_DEDUPLICATION,
+            DEDUPLICATION_BUFFER_SIZE: DEFAULT_DEDUPLICATION_BUFFER_SIZE,
+            SOURCE_CACHE_SIZE: DEFAULT_SOURCE_CACHE_SIZE,
+            FNML_CACHE_SIZE: DEFAULT_FNML_CACHE_SIZE,
+            SHARD_MAPPING_GROUPS: DEFAULT_SHARD_MAPPING_GROUPS,
+            TABLE_PARTITIONS: DEFAULT_TABLE_PARTITIONS,
+            JOIN_PARTITIONS: DEFAULT_JOIN_PARTITIONS,
+            ENGINE: DEFAULT_ENGINE,
+            CSV_READER: DEFAULT_CSV_READER
         }
 
 LOGGER = logging.getLogger(LOGGING_NAMESPACE)
@@ -192,6 +230,73 @@ class Config(ConfigParser):
                 f'{MAPPING_PARTITIONING} value `{self.get_mapping_partitioning()}` is not valid. '
                 f'It must be in: {[MAXIMAL_PARTITIONING] + [PARTIAL_AGGREGATIONS_PARTITIONING] + NO_PARTITIONING}.')
 
+        # CHUNK SIZE
+        if self.get_chunk_size() < 0:
+            raise ValueError(f'{CHUNK_SIZE} value `{self.get_chunk_size()}` is not valid. It must be a non-negative '
+                             f'integer (0 disables chunked materialization).')
+
+        # DEDUPLICATION
+        deduplication = str(self.get_deduplication()).upper()
+        self.set_deduplication(deduplication)
+        valid_deduplication = [EXACT_DEDUPLICATION, HASH64_DEDUPLICATION, HASH128_DEDUPLICATION,
+                               SORT_DEDUPLICATION]
+        if deduplication not in valid_deduplication:
+            raise ValueError(f'{DEDUPLICATION} value `{self.get_deduplication()}` is not valid. '
+                             f'It must be in: {valid_deduplication}.')
+        if self.get_deduplication_buffer_size() < 1:
+            raise ValueError(f'{DEDUPLICATION_BUFFER_SIZE} value `{self.get_deduplication_buffer_size()}` is not '
+                             f'valid. It must be a positive integer.')
+
+        # SOURCE CACHE SIZE
+        if self.get_source_cache_size() < 0:
+            raise ValueError(f'{SOURCE_CACHE_SIZE} value `{self.get_source_cache_size()}` is not valid. It must be a '
+                             f'non-negative integer (0 disables the source cache).')
+
+        # FNML CACHE SIZE
+        if self.get_fnml_cache_size() < 0:
+            raise ValueError(f'{FNML_CACHE_SIZE} value `{self.get_fnml_cache_size()}` is not valid. It must be a '
+                             f'non-negative integer (0 disables the function cache).')
+
+        # TABLE PARTITIONS
+        if self.get_table_partitions() < 0:
+            raise ValueError(f'{TABLE_PARTITIONS} value `{self.get_table_partitions()}` is not valid. It must be a '
+                             f'non-negative integer (0 disables range-partitioned tables).')
+
+        # JOIN PARTITIONS
+        if self.get_join_partitions() < 0:
+            raise ValueError(f'{JOIN_PARTITIONS} value `{self.get_join_partitions()}` is not valid. It must be a '
+                             f'non-negative integer (0 disables partitioned joins).')
+
+        # ENGINE
+        engine = str(self.get_engine()).upper()
+        self.set_engine(engine)
+        valid_engines = [PANDAS_ENGINE, DUCKDB_ENGINE, ARROW_ENGINE]
+        if engine not in valid_engines:
+            raise ValueError(f'{ENGINE} value `{self.get_engine()}` is not valid. It must be in: {valid_engines}.')
+
+        # CSV READER
+        csv_reader = str(self.get_csv_reader()).upper()
+        self.set_csv_reader(csv_reader)
+        valid_csv_readers = [PANDAS_ENGINE, ARROW_ENGINE]
+        if csv_reader not in valid_csv_readers:
+            raise ValueError(f'{CSV_READER} value `{self.get_csv_reader()}` is not valid. It must be in: '
+                             f'{valid_csv_readers}.')
+
+        # the DuckDB and Arrow engines and the Arrow CSV reader require pyarrow, check it before materializing
+        if ARROW_ENGINE in [engine, csv_reader] or engine == DUCKDB_ENGINE:
+            if importlib.util.find_spec('pyarrow') is None:
+                option = f'{ENGINE} value `{engine}`' if engine != PANDAS_ENGINE else \
+                    f'{CSV_READER} value `{csv_reader}`'
+                raise ValueError(f'{option} requires pyarrow, which is not installed. '
+                                 "Install it with: pip install 'morph-kgc[tabular]'.")
+
+        # FETCH SIZE
+        for data_source_section in self.get_data_sources_sections():
+            if self.get_fetch_size(data_source_section) < 0:
+                raise ValueError(f'{FETCH_SIZE} value `{self.get_fetch_size(data_source_section)}` of data source '
+                                 f'`{data_source_section}` is not valid. It must be a non-negative integer (0 disables '
+                                 f'streaming).')
+
     def log_config_info(self):
         LOGGER.debug(f'CONFIGURATION: {dict(self.items(self.configuration_section))}')
 
@@ -223,15 +328,51 @@ class Config(ConfigParser):
     def enforce_sql_filter_null(self):
         return self.getboolean(self.configuration_section, ENFORCE_SQL_QUERY_FILTER_NULL)
 
+    def sql_pushdown(self):
+        return self.getboolean(self.configuration_section, SQL_PUSHDOWN)
+
+    def fnml_memoization(self):
+        return self.getboolean(self.configuration_section, FNML_MEMOIZATION)
+
     def only_write_printable_characters(self):
         return self.getboolean(self.configuration_section, ONLY_PRINTABLE_CHARS)
 
+    def shard_mapping_groups(self):
+        return self.getboolean(self.configuration_section, SHARD_MAPPING_GROUPS)
+
     def get_configuration_option(self, option):
         return self.get(self.configuration_section, option)
 
     def get_number_of_processes(self):
         return self.getint(self.configuration_section, NUMBER_OF_PROCESSES)
 
+    def get_chunk_size(self):
+        return self.getint(self.configuration_section, CHUNK_SIZE)
+
+    def get_deduplication(self):
+        return self.get(self.configuration_section, DEDUPLICATION)
+
+    def get_deduplication_buffer_size(self):
+        return self.getint(self.configuration_section, DEDUPLICATION_BUFFER_SIZE)
+
+    def get_source_cache_size(self):
+        return self.getint(self.configuration_section, SOURCE_CACHE_SIZE)
+
+    def get_fnml_cache_size(self):
+        return self.getint(self.configuration_section, FNML_CACHE_SIZE)
+
+    def get_table_partitions(self):
+        return self.getint(self.configuration_section, TABLE_PARTITIONS)
+
+    def get_join_partitions(self):
+        return self.getint(self.configuration_section, JOIN_PARTITIONS)
+
+    def get_engine(self):
+        return self.get(self.configuration_section, ENGINE)
+
+    def get_csv_reader(self):
+        return self.get(self.configuration_section, CSV_READER)
+
     def get_logging_level(self):
         return self.get(self.configuration_section, LOGGING_LEVEL)
 
@@ -298,6 +439,9 @@ class Config(ConfigParser):
     def set_mapping_partitioning(self, mapping_partitioning):
         self.set(self.configuration_section, MAPPING_PARTITIONING, mapping_partitioning.upper())
 
+    def set_deduplication(self, deduplication):
+        self.set(self.configuration_section, DEDUPLICATION, deduplication)
+
     def set_logging_level(self, logging_level):
         self.set(self.configuration_section, LOGGING_LEVEL, logging_level)
 
@@ -307,6 +451,12 @@ class Config(ConfigParser):
     def set_number_of_processes(self, number_of_processes):
         self.set(self.configuration_section, NUMBER_OF_PROCESSES, number_of_processes)
 
+    def set_engine(self, engine):
+        self.set(self.configuration_section, ENGINE, engine)
+
+    def set_csv_reader(self, csv_reader):
+        self.set(self.configuration_section, CSV_READER, csv_reader)
+
     ################################################################################
     #######################   DATA SOURCE SECTIONS METHODS   #######################
     ################################################################################
@@ -326,6 +476,10 @@ class Config(ConfigParser):
     def get_connect_args(self, source_section):
         return self.get(source_section, CONNECT_ARGS)
 
+    def get_fetch_size(self, source_section):
+        # 0 disables streaming with server-side cursors
+        return self.getint(source_section, FETCH_SIZE, fallback=0)
+
     def get_mappings_files(self, source_section):
         mapping_file_paths = []
 
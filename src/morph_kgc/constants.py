@@ -15,6 +15,25 @@ MAXIMAL_PARTITIONING = 'MAXIMAL'
 NO_PARTITIONING = ['NO', 'FALSE', 'OFF', '0']
 
 
+##############################################################################
+#####################   TRIPLE DEDUPLICATION STRATEGIES   ####################
+##############################################################################
+
+EXACT_DEDUPLICATION = 'EXACT'
+HASH64_DEDUPLICATION = 'HASH64'
+HASH128_DEDUPLICATION = 'HASH128'
+SORT_DEDUPLICATION = 'SORT'
+
+
+##############################################################################
+#######################   MATERIALIZATION ENGINES   ##########################
+##############################################################################
+
+PANDAS_ENGINE = 'PANDAS'
+DUCKDB_ENGINE = 'DUCKDB'
+ARROW_ENGINE = 'ARROW'
+
+
 ##############################################################################
 #########################   DATA SOURCE TYPES   ##############################
 ##############################################################################
@@ -32,6 +51,7 @@ STATA = 'DTA'
 SAS = ['XPT', 'SAS7BDAT']
 SPSS = 'SAV'
 JSON = ['JSON', 'GEOJSON', 'JSONPATH']
+JSONL = ['JSONL', 'NDJSON']
 XML = ['XML', 'XPATH']
 SHP = 'SHP'
 
@@ -55,7 +75,7 @@ DATAFRAME = 'DATAFRAME'
 DICTIONARY = 'DICTIONARY'
 JSON_STRING = 'JSON_STRING'
 
-FILE_SOURCE_TYPES = [CSV, TSV, PARQUET, GEOPARQUET, ORC, STATA, SPSS, SHP] + XML + JSON + EXCEL + FEATHER + SAS + ODS
+FILE_SOURCE_TYPES = [CSV, TSV, PARQUET, GEOPARQUET, ORC, STATA, SPSS, SHP] + XML + JSON + JSONL + EXCEL + FEATHER + SAS + ODS
 DATA_SOURCE_TYPES = [RDB] + FILE_SOURCE_TYPES
 IN_MEMORY_TYPES = [PYTHON_SOURCE, DATAFRAME, DICTIONARY, JSON_STRING]
 
@@ -6,7 +6,13 @@ __maintainer__ = "Julián Arenas-Guerrero"
 __email__ = "arenas.guerrero.julian@outlook.com"
 
 
+import io
+import re
+import csv
+import glob
+import itertools
 import json
+import codecs
 import urllib.request
 import xml.etree.ElementTree as et
 from io import BytesIO
@@ -17,10 +23,27 @@ import duckdb
 import elementpath
 import pandas as pd
 from elementpath.xpath3 import XPath3Parser
-from jsonpath import JSONPath
 
 from ..constants import *
 from ..utils import normalize_hierarchical_data
+from .json_stream import get_streamable_jsonpath_keys, iter_json_items
+from .json_extractor import get_json_extractor, get_jsonpath
+
+
+# formats of the files that are read as pyarrow datasets
+ARROW_DATASET_FORMATS = {PARQUET: 'parquet', ORC: 'orc', **{feather: 'feather' for feather in FEATHER}}
+
+# paths of data files with glob wildcards, e.g., `data/*.parquet` or `data/**/*.orc`
+GLOB_PATTERN_REGEX = re.compile(r'[*?\[]')
+
+# number of bytes read from the beginning of CSV files to infer their delimiter
+CSV_SAMPLE_SIZE = 64 * 1024
+
+# number of items of the iterated arrays that are projected at once when JSON files are streamed
+JSON_BATCH_SIZE = 10000
+
+# XPath iterators that are absolute paths of element names, e.g., `/a/b/c` or `/ns:a/ns:b`
+STREAMABLE_XPATH_REGEX = re.compile(r'(/[^\W\d][\w.-]*(:[^\W\d][\w.-]*)?)+')
 
 
 def _is_http_uri(path_or_uri):
@@ -28,28 +51,31 @@ def _is_http_uri(path_or_uri):
     return parsed.scheme.lower() in {'http', 'https'} and bool(parsed.netloc)
 
 
-def get_file_data(rml_rule, references):
+def get_file_data(rml_rule, references, chunk_size=0, csv_reader=PANDAS_ENGINE, na_values=()):
+    """
+    Reads the data of a file logical source. If `chunk_size` is provided, readers that support it return an iterator
+    of DataFrames with at most `chunk_size` rows each, the rest return a single DataFrame. CSV and TSV files are read
+    with pandas or pyarrow depending on `csv_reader`. If `na_values` is provided, readers that support it discard the
+    rows with nulls in the references (see `_get_not_null_filter`).
+    """
+
     references = list(references)
     file_source_type = rml_rule['source_type']
 
     if rml_rule['logical_source_type'] == RML_QUERY:
         return _read_tabular_view(rml_rule)
     elif file_source_type in [CSV, TSV]:
-        return _read_csv(rml_rule, references, file_source_type)
+        return _read_csv(rml_rule, references, file_source_type, chunk_size, csv_reader)
     elif file_source_type in EXCEL:
         return _read_excel(rml_rule, references)
     elif file_source_type in ODS:
         return _read_ods(rml_rule, references)
-    elif file_source_type == PARQUET:
-        return _read_parquet(rml_rule, references)
+    elif file_source_type in ARROW_DATASET_FORMATS:
+        return _read_arrow_dataset(rml_rule, references, chunk_size, na_values)
     elif file_source_type == GEOPARQUET:
         return _read_geoparquet(rml_rule, references)
     elif file_source_type == SHP:
         return _read_shapefile(rml_rule, references)
-    elif file_source_type in FEATHER:
-        return _read_feather(rml_rule, references)
-    elif file_source_type == ORC:
-        return _read_orc(rml_rule, references)
     elif file_source_type == STATA:
         return _read_stata(rml_rule, references)
     elif file_source_type in SAS:
@@ -57,47 +83,296 @@ def get_file_data(rml_rule, references):
     elif file_source_type == SPSS:
         return _read_spss(rml_rule, references)
     elif file_source_type in JSON:
-        return _read_json(rml_rule, references)
+        return _read_json(rml_rule, references, chunk_size)
+    elif file_source_type in JSONL:
+        return _read_jsonl(rml_rule, references, chunk_size)
     elif file_source_type in XML:
-        return _read_xml(rml_rule, references)
+        return _read_xml(rml_rule, references, chunk_size)
     else:
         raise ValueError(f'Found an invalid source type. Found value `{file_source_type}`.')
 
 
+def get_file_arrow_data(rml_rule, references, chunk_size=0, na_values=()):
+    """
+    Reads the data of a CSV, TSV, Parquet, Feather or ORC logical source as a pyarrow Table. If `chunk_size` is
+    provided, an iterator of Tables with at most `chunk_size` rows each is returned. If `na_values` is provided, the
+    rows with nulls in the references are discarded when reading Parquet, Feather and ORC files.
+    """
+
+    references = list(references)
+    file_source_type = rml_rule['source_type']
+    file_path = rml_rule['logical_source_value']
+
+    if file_source_type in [CSV, TSV]:
+        delimiter = _get_csv_delimiter(file_path, references, file_source_type)
+        if chunk_size:
+            return _iter_arrow_csv_tables(file_path, references, delimiter, chunk_size)
+
+        return _read_arrow_csv(file_path, references, delimiter)
+    elif file_source_type in ARROW_DATASET_FORMATS:
+        scanner = _get_arrow_dataset_scanner(rml_rule, references, chunk_size, na_values)
+        if chunk_size:
+            return _iter_arrow_dataset_tables(scanner)
+
+        return scanner.to_table()
+    else:
+        raise ValueError(f'Found an invalid source type for pyarrow. Found value `{file_source_type}`.')
+
+
 def _read_tabular_view(rml_rule):
     return duckdb.query(rml_rule['logical_source_value']).df()
 
 
-def _read_csv(rml_rule, references, file_source_type):
-    delimiter = ',' if file_source_type == 'CSV' else '\t'
+def _open_csv_sample(logical_source_value):
+    if _is_http_uri(logical_source_value):
+        with urllib.request.urlopen(logical_source_value) as csv_url:
+            return csv_url.read(CSV_SAMPLE_SIZE)
+
+    with open(logical_source_value, 'rb') as csv_file:
+        return csv_file.read(CSV_SAMPLE_SIZE)
+
+
+def _sniff_csv_delimiter(logical_source_value, references, delimiter):
+    """
+    Returns the delimiter of a CSV file. The default delimiter is used if the references are columns in the header
+    with it, otherwise the delimiter is sniffed from the header (issue #81). Only the first `CSV_SAMPLE_SIZE` bytes of
+    the file are read.
+    """
+
+    try:
+        # the last character of the sample could be truncated
+        csv_sample = codecs.getincrementaldecoder('utf-8-sig')().decode(_open_csv_sample(logical_source_value))
+    except (OSError, UnicodeDecodeError):
+        # compressed files, the reader reports the errors
+        return delimiter
+
+    header = csv_sample.splitlines()[0] if csv_sample else ''
+    header_columns = next(csv.reader([header], delimiter=delimiter), [])
+    if set(references).issubset(header_columns):
+        return delimiter
+
+    try:
+        # as the python engine of pandas, the delimiter is sniffed from the first line
+        return csv.Sniffer().sniff(header).delimiter
+    except csv.Error:
+        return delimiter
+
+
+def _get_csv_delimiter(logical_source_value, references, file_source_type):
+    """
+    Returns the delimiter of a CSV or TSV file. The delimiter of TSV files is fixed by their extension, the one of CSV
+    files is sniffed (see `_sniff_csv_delimiter`).
+    """
+
+    if file_source_type == TSV:
+        return '\t'
+
+    return _sniff_csv_delimiter(logical_source_value, references, ',')
+
+
+def _read_csv(rml_rule, references, file_source_type, chunk_size=0, csv_reader=PANDAS_ENGINE):
+    logical_source_value = rml_rule['logical_source_value']
+
+    if csv_reader == ARROW_ENGINE and references and not _is_http_uri(logical_source_value):
+        delimiter = _get_csv_delimiter(logical_source_value, references, file_source_type)
+        if chunk_size:
+            return (table.to_pandas() for table in
+                    _iter_arrow_csv_tables(logical_source_value, references, delimiter, chunk_size))
+        return _read_arrow_csv(logical_source_value, references, delimiter).to_pandas()
 
+    # the file is only sampled to sniff the delimiter if the references are not columns with the default one
+    default_delimiter = ',' if file_source_type == CSV else '\t'
     try:
-        return pd.read_table(rml_rule['logical_source_value'],
-                             sep=delimiter,
-                             index_col=False,
-                             encoding='utf-8',
-                             encoding_errors='strict',
-                             usecols=references,
-                             engine='c',
-                             dtype=str,
-                             keep_default_na=False,
-                             na_filter=False)
-    except:
-        # if delimiter is other than comma or tab, then infer it (issue #81)
-        return pd.read_table(rml_rule['logical_source_value'],
-                             index_col=False,
-                             sep=None,
-                             encoding='utf-8',
-                             encoding_errors='strict',
-                             usecols=references,
-                             engine='python',
-                             dtype=str,
-                             keep_default_na=False,
-                             na_filter=False)
-
-
-def _read_parquet(rml_rule, references):
-    return pd.read_parquet(rml_rule['logical_source_value'], engine='pyarrow', columns=references)
+        return _read_pandas_csv(logical_source_value, references, default_delimiter, chunk_size)
+    except ValueError:
+        delimiter = _get_csv_delimiter(logical_source_value, references, file_source_type)
+        if delimiter == default_delimiter:
+            raise
+        return _read_pandas_csv(logical_source_value, references, delimiter, chunk_size)
+
+
+def _read_pandas_csv(logical_source_value, references, delimiter, chunk_size=0):
+    # with chunksize pandas returns an iterator of DataFrames, the header (and usecols) are validated eagerly
+    return pd.read_table(logical_source_value,
+                         sep=delimiter,
+                         index_col=False,
+                         encoding='utf-8',
+                         encoding_errors='strict',
+                         usecols=references,
+                         engine='c',
+                         dtype=str,
+                         keep_default_na=False,
+                         na_filter=False,
+                         chunksize=chunk_size if chunk_size else None)
+
+
+def _get_arrow_csv_options(references, delimiter):
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    references = list(dict.fromkeys(references))
+
+    # as with pandas, all the values are read as strings and empty values are not nulls
+    parse_options = pa_csv.ParseOptions(delimiter=delimiter, newlines_in_values=True)
+    convert_options = pa_csv.ConvertOptions(include_columns=references,
+                                            column_types={reference: pa.string() for reference in references},
+                                            strings_can_be_null=False,
+                                            quoted_strings_can_be_null=False)
+
+    return parse_options, convert_options
+
+
+def _get_pandas_csv_table(csv_df, references):
+    import pyarrow as pa
+
+    schema = pa.schema([(reference, pa.string()) for reference in dict.fromkeys(references)])
+    return pa.Table.from_pandas(csv_df, schema=schema, preserve_index=False)
+
+
+def _read_arrow_csv(file_path, references, delimiter):
+    """
+    Reads the referenced columns of a CSV file as a pyarrow Table, the blocks of the file are parsed in parallel.
+    Files that pyarrow cannot parse, e.g., with rows with more or less fields than the header, are read with pandas.
+    """
+
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    parse_options, convert_options = _get_arrow_csv_options(references, delimiter)
+    try:
+        return pa_csv.read_csv(file_path, read_options=pa_csv.ReadOptions(use_threads=True),
+                               parse_options=parse_options, convert_options=convert_options)
+    except pa.ArrowInvalid:
+        # pandas keeps these rows, the missing fields are empty and the extra ones are ignored
+        return _get_pandas_csv_table(_read_pandas_csv(file_path, references, delimiter), references)
+
+
+def _iter_arrow_csv_tables(file_path, references, delimiter, chunk_size):
+    """
+    Generator of pyarrow Tables with at most `chunk_size` rows of a CSV file, the file is streamed. At least one Table
+    is generated. If pyarrow cannot parse the file (see `_read_arrow_csv`), the rest of the file is read with pandas.
+    """
+
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    parse_options, convert_options = _get_arrow_csv_options(references, delimiter)
+
+    number_of_generated_chunks = 0
+    try:
+        csv_reader = pa_csv.open_csv(file_path, parse_options=parse_options, convert_options=convert_options)
+
+        tables = [csv_reader.schema.empty_table()]
+        number_of_rows = 0
+        for record_batch in csv_reader:
+            tables.append(pa.Table.from_batches([record_batch]))
+            number_of_rows += record_batch.num_rows
+            while number_of_rows >= chunk_size:
+                table = pa.concat_tables(tables)
+                number_of_generated_chunks += 1
+                yield table.slice(0, chunk_size)
+                tables = [table.slice(chunk_size)]
+                number_of_rows -= chunk_size
+    except pa.ArrowInvalid:
+        # only full chunks have been generated, pandas reads the file in chunks of the same size and skips them
+        csv_chunks = _read_pandas_csv(file_path, references, delimiter, chunk_size)
+        is_empty = not number_of_generated_chunks
+        for csv_df in itertools.islice(csv_chunks, number_of_generated_chunks, None):
+            is_empty = False
+            yield _get_pandas_csv_table(csv_df, references)
+        if is_empty:
+            yield _get_pandas_csv_table(pd.DataFrame(columns=list(dict.fromkeys(references))), references)
+        return
+
+    if number_of_rows or not number_of_generated_chunks:
+        yield pa.concat_tables(tables)
+
+
+def _get_arrow_dataset(file_path, file_source_type):
+    """
+    Opens a data file, a directory of data files (which can be Hive partitioned) or the data files matching a glob
+    pattern as a single pyarrow dataset.
+    """
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    file_path = str(file_path).strip()
+    if _is_http_uri(file_path):
+        # remote files are downloaded and read from memory
+        file_format = {'parquet': ds.ParquetFileFormat, 'orc': ds.OrcFileFormat,
+                       'feather': ds.IpcFileFormat}[ARROW_DATASET_FORMATS[file_source_type]]()
+        with urllib.request.urlopen(file_path) as data_url:
+            fragment = file_format.make_fragment(pa.BufferReader(data_url.read()))
+        return ds.FileSystemDataset([fragment], fragment.physical_schema, file_format)
+    elif GLOB_PATTERN_REGEX.search(file_path):
+        file_paths = sorted(glob.glob(file_path, recursive=True))
+        if not file_paths:
+            raise FileNotFoundError(f'No data files match the glob pattern `{file_path}`.')
+        file_path = file_paths
+
+    return ds.dataset(file_path, format=ARROW_DATASET_FORMATS[file_source_type], partitioning='hive')
+
+
+def _get_not_null_filter(schema, references, na_values):
+    """
+    Returns the filter discarding the rows with nulls in the references, which are removed when the data is
+    preprocessed. Only nulls that are converted to values in `na_values` are filtered. Integer columns are not filtered,
+    pandas converts them to floats if they have nulls, and that changes their string values.
+    """
+
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    not_null_filter = None
+    for reference in dict.fromkeys(references):
+        if schema.get_field_index(reference) == -1 or pa.types.is_integer(schema.field(reference).type):
+            continue
+        # the string of nulls as converted by the materializer
+        if str(pa.array([None], type=schema.field(reference).type).to_pandas()[0]) in na_values:
+            is_valid = ds.field(reference).is_valid()
+            not_null_filter = is_valid if not_null_filter is None else not_null_filter & is_valid
+
+    return not_null_filter
+
+
+def _get_arrow_dataset_scanner(rml_rule, references, chunk_size=0, na_values=()):
+    """
+    Scanner of the referenced columns of a Parquet, ORC or Feather logical source. The files are read in parallel,
+    and the filter of nulls in the references is pushed into the scan if `na_values` is provided.
+    """
+
+    dataset = _get_arrow_dataset(rml_rule['logical_source_value'], rml_rule['source_type'])
+
+    scanner_options = {'batch_size': chunk_size} if chunk_size else {}
+    return dataset.scanner(columns=list(dict.fromkeys(references)),
+                           filter=_get_not_null_filter(dataset.schema, references, na_values),
+                           use_threads=True, **scanner_options)
+
+
+def _iter_arrow_dataset_tables(scanner):
+    """
+    Generator of pyarrow Tables with the record batches of a scanner. At least one Table is generated.
+    """
+
+    import pyarrow as pa
+
+    is_empty = True
+    for record_batch in scanner.to_batches():
+        if record_batch.num_rows:
+            is_empty = False
+            yield pa.Table.from_batches([record_batch])
+
+    if is_empty:
+        yield scanner.projected_schema.empty_table()
+
+
+def _read_arrow_dataset(rml_rule, references, chunk_size=0, na_values=()):
+    scanner = _get_arrow_dataset_scanner(rml_rule, references, chunk_size, na_values)
+    if chunk_size:
+        return (table.to_pandas() for table in _iter_arrow_dataset_tables(scanner))
+
+    return scanner.to_table().to_pandas()
 
 
 def _read_geoparquet(rml_rule, references) -> pd.DataFrame:
@@ -133,14 +408,6 @@ def _read_shapefile(rml_rule, references) -> pd.DataFrame:
     return pd.DataFrame(gdf)
 
 
-def _read_feather(rml_rule, references):
-    return pd.read_feather(rml_rule['logical_source_value'], use_threads=False, columns=references)
-
-
-def _read_orc(rml_rule, references):
-    return pd.read_orc(rml_rule['logical_source_value'], columns=references)
-
-
 def _read_stata(rml_rule, references):
     return pd.read_stata(rml_rule['logical_source_value'],
                          columns=references,
@@ -179,29 +446,51 @@ def _read_ods(rml_rule, references):
                          na_filter=False)
 
 
-def _read_json(rml_rule, references):
-    logical_source_value = rml_rule['logical_source_value'].strip()
-
+def _open_json_file(logical_source_value):
     if _is_http_uri(logical_source_value):
-        with urllib.request.urlopen(logical_source_value) as json_url:
-            json_data = json.loads(json_url.read().decode())
-    else:
-        json_data = json.loads(Path(logical_source_value).read_bytes())
+        return io.TextIOWrapper(urllib.request.urlopen(logical_source_value), encoding='utf-8-sig')
 
-    jsonpath_expression = rml_rule['iterator'] + '.('
+    return open(logical_source_value, encoding='utf-8-sig')
+
+
+def _get_jsonpath_projection(references):
+    jsonpath_projection = '.('
     # add top level object of the references to reduce intermediate results (THIS IS NOT STRICTLY NECESSARY)
     for reference in references:
-        jsonpath_expression += reference.split('.')[0] + ','
-    jsonpath_expression = jsonpath_expression[:-1] + ')'
+        jsonpath_projection += reference.split('.')[0] + ','
+
+    return jsonpath_projection[:-1] + ')'
+
 
-    jsonpath_result = JSONPath(jsonpath_expression).parse(json_data)
-    # normalize and remove nulls
-    json_df = pd.json_normalize([
+def _filter_json_objects(jsonpath_result, references):
+    # flatten and remove nulls
+    return [
         json_object
         for json_object in normalize_hierarchical_data(jsonpath_result)
         if None not in json_object.values()
         and all(reference.split('.')[0] in json_object for reference in references)
-    ])
+    ]
+
+
+def _extract_json_records(json_items, references, json_extractor):
+    """
+    Returns the data records of the objects selected by the iterator, with the compiled extractor of the references if
+    there is one.
+    """
+
+    if json_extractor:
+        return json_extractor.extract_items(json_items)
+
+    # the projection is evaluated over lists of items, `$.a.b[*].(x)` is equivalent to `$[*].(x)` over the items of b
+    return _filter_json_objects(get_jsonpath(f'$[*]{_get_jsonpath_projection(references)}').parse(json_items),
+                                references)
+
+
+def _get_json_dataframe(json_records, references, json_extractor):
+    if json_extractor:
+        return json_extractor.get_dataframe(json_records)
+
+    json_df = pd.json_normalize(json_records)
 
     # add columns with null values for those references in the mapping rule that are not present in the data file
     missing_references_in_df = list(set(references).difference(set(json_df.columns)))
@@ -211,18 +500,217 @@ def _read_json(rml_rule, references):
     return json_df
 
 
-def _read_xml(rml_rule, references):
+def _iter_json_dataframes(json_records_batches, references, json_extractor, chunk_size):
+    """
+    Builds DataFrames of at most `chunk_size` rows from batches of data records. At least one DataFrame is generated.
+    """
+
+    json_records = []
+    is_empty = True
+    for json_records_batch in json_records_batches:
+        json_records.extend(json_records_batch)
+        while len(json_records) >= chunk_size:
+            is_empty = False
+            yield _get_json_dataframe(json_records[:chunk_size], references, json_extractor)
+            json_records = json_records[chunk_size:]
+
+    if json_records or is_empty:
+        yield _get_json_dataframe(json_records, references, json_extractor)
+
+
+def _read_json(rml_rule, references, chunk_size=0):
+    """
+    Reads a JSON file. For iterators over the items of an array (e.g., `$.a.b[*]`) the file is parsed incrementally
+    and only the referenced fields of the items are kept in memory. If `chunk_size` is provided, they are returned in
+    DataFrames of at most `chunk_size` rows. The rest of iterators are evaluated over the whole JSON document.
+    """
+
     logical_source_value = rml_rule['logical_source_value'].strip()
+    json_extractor = get_json_extractor(rml_rule['iterator'], tuple(references))
+
+    keys = get_streamable_jsonpath_keys(rml_rule['iterator'])
+    if keys is not None:
+        json_records_batches = _iter_json_records_batches(logical_source_value, keys, references, json_extractor,
+                                                          chunk_size if chunk_size else JSON_BATCH_SIZE)
+        if chunk_size:
+            return _iter_json_dataframes(json_records_batches, references, json_extractor, chunk_size)
+        return _get_json_dataframe([json_record for json_records_batch in json_records_batches
+                                    for json_record in json_records_batch], references, json_extractor)
 
     if _is_http_uri(logical_source_value):
+        with urllib.request.urlopen(logical_source_value) as json_url:
+            json_data = json.loads(json_url.read().decode())
+    else:
+        json_data = json.loads(Path(logical_source_value).read_bytes())
+
+    if json_extractor:
+        return json_extractor.get_dataframe(json_extractor.extract(json_data))
+
+    jsonpath_expression = f"{rml_rule['iterator']}{_get_jsonpath_projection(references)}"
+    jsonpath_result = get_jsonpath(jsonpath_expression).parse(json_data)
+
+    return _get_json_dataframe(_filter_json_objects(jsonpath_result, references), references, json_extractor)
+
+
+def _iter_json_records_batches(logical_source_value, keys, references, json_extractor, batch_size):
+    """
+    Generator of lists with the data records of batches of `batch_size` items of the iterated array.
+    """
+
+    with _open_json_file(logical_source_value) as json_file:
+        json_items = []
+        for json_item in iter_json_items(json_file, keys):
+            json_items.append(json_item)
+            if len(json_items) == batch_size:
+                yield _extract_json_records(json_items, references, json_extractor)
+                json_items = []
+        if json_items:
+            yield _extract_json_records(json_items, references, json_extractor)
+
+
+def _read_jsonl(rml_rule, references, chunk_size=0):
+    """
+    Reads a JSON Lines file, the iterator is evaluated over the JSON document in each line. The file is read line by
+    line. If `chunk_size` is provided, the data is returned in DataFrames of at most `chunk_size` rows.
+    """
+
+    iterator = str(rml_rule['iterator']).strip() if pd.notna(rml_rule['iterator']) else '$'
+    json_extractor = get_json_extractor(iterator, tuple(references))
+
+    json_records_batches = _iter_jsonl_records_batches(rml_rule, iterator, references, json_extractor,
+                                                       chunk_size if chunk_size else JSON_BATCH_SIZE)
+    if chunk_size:
+        return _iter_json_dataframes(json_records_batches, references, json_extractor, chunk_size)
+
+    return _get_json_dataframe([json_record for json_records_batch in json_records_batches
+                                for json_record in json_records_batch], references, json_extractor)
+
+
+def _iter_jsonl_records_batches(rml_rule, iterator, references, json_extractor, batch_size):
+    with _open_json_file(rml_rule['logical_source_value'].strip()) as jsonl_file:
+        json_items = []
+        for line in jsonl_file:
+            if not line.strip():
+                continue
+            elif iterator == '$':
+                json_items.append(json.loads(line))
+            else:
+                json_items.extend(get_jsonpath(iterator).parse(json.loads(line)))
+            if len(json_items) >= batch_size:
+                yield _extract_json_records(json_items, references, json_extractor)
+                json_items = []
+        if json_items:
+            yield _extract_json_records(json_items, references, json_extractor)
+
+
+def _open_xml_file(logical_source_value):
+    if _is_http_uri(logical_source_value):
+        return urllib.request.urlopen(logical_source_value)
+
+    return Path(logical_source_value).open(encoding='utf-8')
+
+
+def _read_xml(rml_rule, references, chunk_size=0):
+    """
+    Reads an XML file. For iterators that are absolute paths of element names (e.g., `/a/b/c`) the matched elements
+    are processed while the file is parsed and discarded afterwards. If `chunk_size` is provided, they are returned in
+    DataFrames of at most `chunk_size` rows. The rest of iterators are evaluated with XPath 3.0 over the whole tree.
+    """
+
+    logical_source_value = rml_rule['logical_source_value'].strip()
+
+    xpath_steps = _get_streamable_xpath_steps(rml_rule['iterator'])
+    if xpath_steps is not None and chunk_size:
+        return _iter_xml_dataframes(logical_source_value, xpath_steps, references, chunk_size)
+
+    if _is_http_uri(logical_source_value) and xpath_steps is None:
         with urllib.request.urlopen(logical_source_value) as xml_url:
             xml_string = xml_url.read()
         # Turn into file object for compatibility with iterparse
         with BytesIO(xml_string) as xml_file:
             return _parse_xml_file(xml_file, rml_rule, references)
+
+    with _open_xml_file(logical_source_value) as xml_file:
+        if xpath_steps is not None:
+            return _get_xml_dataframe(list(_iter_xml_data_records(xml_file, xpath_steps, references)), references)
+        return _parse_xml_file(xml_file, rml_rule, references)
+
+
+def _get_streamable_xpath_steps(iterator):
+    if pd.isna(iterator) or not STREAMABLE_XPATH_REGEX.fullmatch(str(iterator).strip()):
+        return None
+
+    return str(iterator).strip().split('/')[1:]
+
+
+def _matches_xpath_step(tag, xpath_step, namespaces):
+    if ':' in xpath_step:
+        prefix, local_name = xpath_step.split(':')
+        if prefix not in namespaces:
+            return False
+        namespace = namespaces[prefix]
     else:
-        with Path(logical_source_value).open(encoding='utf-8') as xml_file:
-            return _parse_xml_file(xml_file, rml_rule, references)
+        # as with elementpath, names without prefix are in the default namespace
+        local_name = xpath_step
+        namespace = namespaces.get('')
+
+    return tag == (f'{{{namespace}}}{local_name}' if namespace else local_name)
+
+
+def _iter_xml_data_records(xml_file, xpath_steps, references):
+    """
+    Generator of the data records of the elements matched by an absolute path iterator while the XML file is parsed.
+    The elements are discarded once they are processed, only the elements in the current path are kept in memory.
+    """
+
+    namespaces = {}
+    path = []
+    # number of elements at the beginning of the path that match the steps of the iterator
+    matching_depth = 0
+    for event, element in et.iterparse(xml_file, events=['start', 'end', 'start-ns']):
+        if event == 'start-ns':
+            namespaces[element[0]] = element[1]
+        elif event == 'start':
+            if matching_depth == len(path) < len(xpath_steps) and \
+                    _matches_xpath_step(element.tag, xpath_steps[len(path)], namespaces):
+                matching_depth += 1
+            path.append(element)
+        else:
+            path.pop()
+            if len(path) >= matching_depth == len(xpath_steps):
+                # element in the subtree of a matched element, it is processed with it
+                continue
+            elif len(path) < matching_depth:
+                matching_depth = len(path)
+                if len(path) + 1 < len(xpath_steps):
+                    # the ancestors of the matched elements are kept until they end
+                    continue
+                yield _get_xml_data_record(element, references, namespaces)
+
+            element.clear()
+            if path:
+                path[-1].remove(element)
+
+
+def _iter_xml_dataframes(logical_source_value, xpath_steps, references, chunk_size):
+    with _open_xml_file(logical_source_value) as xml_file:
+        data_records = []
+        is_empty = True
+        for data_record in _iter_xml_data_records(xml_file, xpath_steps, references):
+            data_records.append(data_record)
+            if len(data_records) == chunk_size:
+                is_empty = False
+                yield from _split_xml_dataframe(_get_xml_dataframe(data_records, references), chunk_size)
+                data_records = []
+
+        if data_records or is_empty:
+            yield from _split_xml_dataframe(_get_xml_dataframe(data_records, references), chunk_size)
+
+
+def _split_xml_dataframe(xml_df, chunk_size):
+    # references with several values are exploded, the DataFrame can have more than `chunk_size` rows
+    for i in range(0, max(len(xml_df), 1), chunk_size):
+        yield xml_df.iloc[i:i + chunk_size]
 
 
 def _parse_xml_file(xml_file, rml_rule, references):
@@ -239,40 +727,47 @@ def _parse_xml_file(xml_file, rml_rule, references):
     xpath_result = elementpath.iter_select(xml_root, rml_rule['iterator'], namespaces=namespaces, parser=XPath3Parser)
 
     # we need to retrieve both ELEMENTS and ATTRIBUTES in the XML
-    data_records = []
-    for e in xpath_result:
-        data_record = []
-        for reference in references:
-            data_value = []
-            reference = reference.replace('/@', '@')  # deals with `route/stop/@id`
-
-            if reference.startswith('@'):
-                element = None
-                attribute = reference
-            elif '@' in reference:
-                element = reference.split('@')[0]
-                attribute = reference.split('@')[1]
-            else:
-                element = reference
-                attribute = None
-
-            if element:
-                for r in e.findall(element, namespaces=namespaces):
-                    if attribute:
-                        data_value.append(r.get(attribute))
-                    else:
-                        data_value.append(r.text)
-            else:
-                attribute = attribute[1:]  # do not use the starting @ from the attribute
-                data_value.append(e.attrib[attribute])
-            data_record.append(data_value)
-        data_records.append(data_record)
+    data_records = [_get_xml_data_record(e, references, namespaces) for e in xpath_result]
 
     # IMPORTANT NOTES
     # XPath 3.0 is used (XPath 3.1 is in the roadmap of the elementpath library)
     # with XPath 3.1 the above could be achieved using just an XPath expression by including the references in it
     # for instance, the XPath expression: /root/[id,creator/name] obtaining for example ["2479", ["Julián", "Jhon"]]
 
+    return _get_xml_dataframe(data_records, references)
+
+
+def _get_xml_data_record(e, references, namespaces):
+    data_record = []
+    for reference in references:
+        data_value = []
+        reference = reference.replace('/@', '@')  # deals with `route/stop/@id`
+
+        if reference.startswith('@'):
+            element = None
+            attribute = reference
+        elif '@' in reference:
+            element = reference.split('@')[0]
+            attribute = reference.split('@')[1]
+        else:
+            element = reference
+            attribute = None
+
+        if element:
+            for r in e.findall(element, namespaces=namespaces):
+                if attribute:
+                    data_value.append(r.get(attribute))
+                else:
+                    data_value.append(r.text)
+        else:
+            attribute = attribute[1:]  # do not use the starting @ from the attribute
+            data_value.append(e.attrib[attribute])
+        data_record.append(data_value)
+
+    return data_record
+
+
+def _get_xml_dataframe(data_records, references):
     xml_df = pd.DataFrame.from_records(data_records, columns=references)
 
     # add columns with null values for those references in the mapping rule that are not present in the data file
@@ -12,8 +12,8 @@ import importlib.util
 import sys
 
 from pathlib import Path
-from jsonpath import JSONPath
 from io import StringIO
+from .json_extractor import get_json_extractor, get_jsonpath
 from ..utils import normalize_hierarchical_data
 
 
@@ -58,25 +58,29 @@ def get_http_api_data(config, rml_rule, references):
     simple_refs = [r for r in references if not has_filter(r)]
     filter_refs = [r for r in references if has_filter(r)]
 
-    jsonpath_expression = rml_rule['iterator'] + '.('
-    # add top level object of the references to reduce intermediate results (THIS IS NOT STRICTLY NECESSARY)
-    for reference in simple_refs:
-        jsonpath_expression += reference.split('.')[0] + ','
-        #jsonpath_expression += reference + ','
-    jsonpath_expression = jsonpath_expression[:-1] + ')'
-
-    jsonpath_result = JSONPath(jsonpath_expression).parse(json_data)
-
-    # normalize and remove nulls
-    json_df = pd.json_normalize([
-        json_object
-        for json_object in normalize_hierarchical_data(jsonpath_result)
-        if None not in json_object.values()
-        and all(reference.split('.')[0] in json_object for reference in simple_refs)
-    ])
+    json_extractor = get_json_extractor(rml_rule['iterator'], tuple(simple_refs))
+    if json_extractor:
+        json_df = json_extractor.get_dataframe(json_extractor.extract(json_data))
+    else:
+        jsonpath_expression = rml_rule['iterator'] + '.('
+        # add top level object of the references to reduce intermediate results (THIS IS NOT STRICTLY NECESSARY)
+        for reference in simple_refs:
+            jsonpath_expression += reference.split('.')[0] + ','
+            #jsonpath_expression += reference + ','
+        jsonpath_expression = jsonpath_expression[:-1] + ')'
+
+        jsonpath_result = get_jsonpath(jsonpath_expression).parse(json_data)
+
+        # normalize and remove nulls
+        json_df = pd.json_normalize([
+            json_object
+            for json_object in normalize_hierarchical_data(jsonpath_result)
+            if None not in json_object.values()
+            and all(reference.split('.')[0] in json_object for reference in simple_refs)
+        ])
     if filter_refs:
         join_key = simple_refs[0]
-        entries = JSONPath("$.*").parse(json_data)
+        entries = get_jsonpath("$.*").parse(json_data)
         lookup_data = {item.get(join_key): item for item in entries if item.get(join_key)}
 
         for filter_ref in filter_refs:
@@ -84,7 +88,7 @@ def get_http_api_data(config, rml_rule, references):
             for key_value in json_df[join_key]:
                 match = lookup_data.get(key_value)
                 if match:
-                    res = JSONPath(f"$..{filter_ref}").parse(match)
+                    res = get_jsonpath(f"$..{filter_ref}").parse(match)
                     column_value.append(res[0] if res else None)
                 else:
                     column_value.append(None)
@@ -0,0 +1,110 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import re
+
+from functools import lru_cache
+from jsonpath import JSONPath
+
+import pandas as pd
+
+
+# references that are paths of object keys, e.g., `name` or `address.city`
+SIMPLE_REFERENCE_REGEX = re.compile(r"[^.\[\]()*@?$'\"]+(\.[^.\[\]()*@?$'\"]+)*")
+
+
+@lru_cache(maxsize=1024)
+def get_jsonpath(jsonpath_expression):
+    """
+    Parses a JSONPath expression once per process.
+    """
+
+    return JSONPath(jsonpath_expression)
+
+
+@lru_cache(maxsize=1024)
+def get_json_extractor(iterator, references):
+    """
+    Compiles the extraction plan of an iterator and a tuple of references once per process. None is returned if some
+    reference is not a path of object keys (e.g., filters), or if there are no references.
+    """
+
+    if not references or not all(SIMPLE_REFERENCE_REGEX.fullmatch(reference) for reference in references):
+        return None
+
+    return JSONExtractor(iterator, references)
+
+
+class JSONExtractor:
+    """
+    Extraction plan of the references of a hierarchical logical source. The references are compiled into a tree of
+    object keys, the values of the references are extracted from the objects selected by the iterator walking this
+    tree. Arrays are only expanded if a reference crosses them, the references under the same array are expanded
+    together (i.e., they take the values of the same item) and the values of independent references are combined.
+    Objects with missing or null values for some reference do not generate data records.
+    """
+
+    def __init__(self, iterator, references):
+        self.iterator = iterator
+        self.references = list(references)
+
+        # nodes are tuples with the references ending in them and their children by key
+        self.reference_tree = ([], {})
+        for reference in self.references:
+            node = self.reference_tree
+            for key in reference.split('.'):
+                node = node[1].setdefault(key, ([], {}))
+            node[0].append(reference)
+
+    def _extract_records(self, value, node):
+        if isinstance(value, list):
+            records = []
+            for item in value:
+                records.extend(self._extract_records(item, node))
+            return records
+
+        records = [{}]
+        node_references, node_children = node
+        if node_references:
+            if value is None or isinstance(value, dict):
+                return []
+            records = [{reference: value for reference in node_references}]
+
+        if node_children:
+            if not isinstance(value, dict):
+                return []
+            for key, child_node in node_children.items():
+                if key not in value:
+                    return []
+                child_records = self._extract_records(value[key], child_node)
+                if not child_records:
+                    return []
+                records = [{**record, **child_record} for record in records for child_record in child_records]
+
+        return records
+
+    def extract_items(self, json_items):
+        """
+        Returns the data records of the objects selected by the iterator.
+        """
+
+        records = []
+        for json_item in json_items:
+            records.extend(self._extract_records(json_item, self.reference_tree))
+
+        return records
+
+    def extract(self, json_data):
+        """
+        Evaluates the iterator over a JSON document and returns the data records of the selected objects.
+        """
+
+        return self.extract_items(get_jsonpath(self.iterator).parse(json_data))
+
+    def get_dataframe(self, records):
+        return pd.DataFrame(records, columns=self.references)
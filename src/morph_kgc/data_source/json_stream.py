@@ -0,0 +1,141 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import re
+import json
+
+
+# JSONPath iterators over the items of an array reached through object keys, e.g., `$.a.b[*]` or `$[*]`
+STREAMABLE_JSONPATH_REGEX = re.compile(r"\$((?:\.[^.\[\]()*@?$'\"\s]+)*)\[\*\]")
+
+JSON_BLOCK_SIZE = 1024 ** 2
+JSON_WHITESPACE_REGEX = re.compile(r'[ \t\n\r]*')
+
+
+def get_streamable_jsonpath_keys(iterator):
+    """
+    Returns the object keys leading to the array iterated by a JSONPath iterator such as `$.a.b[*]`. None is returned
+    for the rest of iterators.
+    """
+
+    match = STREAMABLE_JSONPATH_REGEX.fullmatch(str(iterator).strip())
+    if not match:
+        return None
+
+    return [key for key in match.group(1).split('.') if key]
+
+
+class JSONTokenizer:
+    """
+    Incremental parser of a JSON text file. The file is read in blocks and the values are decoded with the JSON
+    decoder of the standard library, only the consumed part of the file is discarded from the buffer.
+    """
+
+    def __init__(self, json_file, block_size=JSON_BLOCK_SIZE):
+        self.json_file = json_file
+        self.block_size = block_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def _read(self, size):
+        if self.position:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+
+        block = self.json_file.read(size)
+        if not block:
+            self.eof = True
+        self.buffer += block
+
+    def peek(self):
+        """
+        Returns the next non-whitespace character, or an empty string at the end of the file.
+        """
+
+        while True:
+            self.position = JSON_WHITESPACE_REGEX.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            elif self.eof:
+                return ''
+            self._read(self.block_size)
+
+    def advance(self):
+        self.position += 1
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f'Expecting `{char}`', self.buffer, self.position)
+        self.advance()
+
+    def decode_value(self):
+        """
+        Decodes the next JSON value. The buffer is extended until the value is complete, numbers at the end of the
+        buffer could be truncated.
+        """
+
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # the size of the blocks grows with the value to avoid decoding it too many times
+            self._read(max(self.block_size, len(self.buffer) - self.position))
+
+
+def iter_json_items(json_file, keys):
+    """
+    Generator of the items of the array (or the values of the object) reached through the object `keys` in a JSON
+    file. Only the items of the array are kept in memory. Nothing is generated if the keys are not found.
+    """
+
+    tokenizer = JSONTokenizer(json_file)
+
+    for key in keys:
+        if tokenizer.peek() != '{':
+            return
+        tokenizer.advance()
+
+        while True:
+            char = tokenizer.peek()
+            if char == '}' or char == '':
+                return
+            elif char == ',':
+                tokenizer.advance()
+                continue
+
+            object_key = tokenizer.decode_value()
+            tokenizer.expect(':')
+            if object_key == key:
+                break
+            # values of other keys are skipped
+            tokenizer.decode_value()
+
+    char = tokenizer.peek()
+    if char == '[':
+        tokenizer.advance()
+        while True:
+            char = tokenizer.peek()
+            if char == ']':
+                return
+            elif char == ',':
+                tokenizer.advance()
+            elif char == '':
+                raise json.JSONDecodeError('Unterminated array', tokenizer.buffer, tokenizer.position)
+            else:
+                yield tokenizer.decode_value()
+    elif char == '{':
+        # `[*]` also iterates over the values of objects
+        yield from tokenizer.decode_value().values()
@@ -10,7 +10,7 @@ import json
 import pandas as pd
 import numpy as np
 
-from jsonpath import JSONPath
+from .json_extractor import get_json_extractor, get_jsonpath
 from ..utils import normalize_hierarchical_data
 
 
@@ -48,13 +48,17 @@ def _check_if_json(json_file):
 def _read_inmemory_json(source_value, rml_rule, references):
     json_data = json.loads(source_value)
 
+    json_extractor = get_json_extractor(rml_rule['iterator'], tuple(references))
+    if json_extractor:
+        return json_extractor.get_dataframe(json_extractor.extract(json_data))
+
     jsonpath_expression = rml_rule['iterator'] + '.('
     # add top level object of the references to reduce intermediate results (THIS IS NOT STRICTLY NECESSARY)
     for reference in references:
         jsonpath_expression += reference + ','
     jsonpath_expression = jsonpath_expression[:-1] + ')'
 
-    jsonpath_result = JSONPath(jsonpath_expression).parse(json_data)
+    jsonpath_result = get_jsonpath(jsonpath_expression).parse(json_data)
     # normalize and remove nulls
     json_df = pd.json_normalize([
         json_object
@@ -6,13 +6,19 @@ __maintainer__ = "Julián Arenas-Guerrero"
 __email__ = "arenas.guerrero.julian@outlook.com"
 
 
+import os
 import logging
 
+from functools import lru_cache
+
 import pandas as pd
 import sql_metadata
 from sqlalchemy.exc import SQLAlchemyError
 
 from ..constants import *
+from ..utils import get_references_in_term_map, has_graph_map, get_term_map_positions, is_template_rml_rule
+from ..template import compile_template
+from ..encoding import get_literal_escaping_replacements
 
 LOGGER = logging.getLogger(LOGGING_NAMESPACE)
 
@@ -60,6 +66,26 @@ SQL_RDF_DATATYPE = {
     'TIMESTAMP': XSD_DATETIME
 }
 
+# dialects for which the terms of the mapping rules can be generated by the database (see `get_sql_pushdown_data`)
+SQL_PUSHDOWN_DIALECTS = [POSTGRESQL, MYSQL, MARIADB, SQLITE, ORACLE, MSSQL]
+
+# data types whose values are converted to the same strings by the databases and pandas, only columns of these types
+# are used to generate terms in the databases (fixed-length character types are not as their values are blank-padded)
+SQL_PUSHDOWN_STRING_TYPES = ['VARCHAR', 'NVARCHAR', 'VARCHAR2', 'NVARCHAR2', 'CHARACTER VARYING', 'TEXT', 'TINYTEXT',
+                             'MEDIUMTEXT', 'LONGTEXT', 'NTEXT', 'STRING']
+SQL_PUSHDOWN_INTEGER_TYPES = ['INTEGER', 'INT', 'SMALLINT', 'MEDIUMINT', 'BIGINT', 'INT2', 'INT4', 'INT8', 'SERIAL',
+                              'SMALLSERIAL', 'BIGSERIAL', 'SERIAL2', 'SERIAL4', 'SERIAL8']
+
+# column with the triples generated by the database
+SQL_PUSHDOWN_TRIPLE_COLUMN = 'morph_kgc_triple'
+
+# SQLAlchemy engines by process, database URL and connection arguments (see `_relational_db_connection`)
+DB_ENGINES = {}
+# column data types by database URL and table (see `_get_table_schema`)
+TABLE_SCHEMAS = {}
+# primary key columns by database URL and table (see `_get_table_primary_key`)
+TABLE_PRIMARY_KEYS = {}
+
 
 def _replace_query_enclosing_characters(sql_query, db_dialect):
     dialect_sql_query = ''
@@ -87,12 +113,27 @@ def _replace_query_enclosing_characters(sql_query, db_dialect):
 
 
 def _relational_db_connection(config, source_name):
+    """
+    Returns the SQLAlchemy engine of a data source and its dialect. Engines are created once per process, and their
+    connection pools are shared by all the queries to the data source.
+    """
+
     from sqlalchemy import create_engine
-    from sqlalchemy.pool import NullPool
 
-    connect_args = eval(config.get_connect_args(source_name)) if config.has_connect_args(source_name) else {}
+    db_url = config.get_db_url(source_name)
+    connect_args = config.get_connect_args(source_name) if config.has_connect_args(source_name) else ''
+
+    # engines inherited from the parent process are not used, their connections belong to the parent
+    for engine_key in [engine_key for engine_key in DB_ENGINES if engine_key[0] != os.getpid()]:
+        DB_ENGINES.pop(engine_key).dispose(close=False)
+
+    engine_key = (os.getpid(), db_url, connect_args)
+    if engine_key not in DB_ENGINES:
+        # pre ping to discard the connections in the pool that were closed by the database
+        DB_ENGINES[engine_key] = create_engine(db_url, connect_args=eval(connect_args) if connect_args else {},
+                                               pool_pre_ping=True)
 
-    db_connection = create_engine(config.get_db_url(source_name), connect_args=connect_args, poolclass=NullPool)
+    db_connection = DB_ENGINES[engine_key]
     db_dialect = db_connection.dialect.name.upper()
 
     return db_connection, db_dialect
@@ -101,24 +142,17 @@ def _relational_db_connection(config, source_name):
 def _get_column_table_datatype(config, source_name, table_name, column_name):
     db_connection, db_dialect = _relational_db_connection(config, source_name)
 
-    if db_dialect == ORACLE:
-        sql_query = f"SELECT t.data_type FROM all_tab_columns t " \
-                    f"WHERE t.TABLE_NAME = '{table_name}' AND t.COLUMN_NAME='{column_name}'"
-    elif db_dialect == SQLITE:
+    if db_dialect == SQLITE:
         sql_query = f"SELECT typeof('{column_name}') as data_type FROM '{table_name}' LIMIT 1"
-    else:
-        sql_query = f"SELECT `data_type` FROM `information_schema`.`columns` " \
-                    f"WHERE `table_name`='{table_name}' AND `column_name`='{column_name}'"
-        sql_query = _replace_query_enclosing_characters(sql_query, db_dialect)
-
-    query_results_df = pd.read_sql_query(sql_query, con=db_connection)
-
-    if 'data_type' in query_results_df.columns and len(query_results_df) == 1:
+        query_results_df = pd.read_sql_query(sql_query, con=db_connection)
+        if len(query_results_df) != 1:
+            return None
         data_type = query_results_df['data_type'][0]
-    elif 'DATA_TYPE' in query_results_df.columns and len(query_results_df) == 1:
-        data_type = query_results_df['DATA_TYPE'][0]
     else:
-        return None
+        # the data types of all the columns of the table are retrieved once
+        data_type = _get_table_schema(db_connection, db_dialect, table_name).get(column_name)
+        if not data_type:
+            return None
 
     data_type = data_type.upper()
     for k, v in SQL_RDF_DATATYPE.items():
@@ -134,10 +168,8 @@ def get_rdb_reference_datatype(config, rml_rule, reference):
         inferred_data_type = _get_column_table_datatype(config, rml_rule['source_name'],
                                                         rml_rule['logical_source_value'], reference)
     elif rml_rule['logical_source_type'] == RML_QUERY:
-        import sql_metadata
-
         # if mapping rule has a query, get the table names in the query
-        table_names = sql_metadata.Parser(rml_rule['logical_source_value']).tables
+        table_names = _get_query_tables(rml_rule['logical_source_value'])
         for table_name in table_names:
             # for each table in the query get the datatype of the object reference in that table if an
             # exception is thrown, then the reference is not a column in that table, and nothing is done
@@ -171,6 +203,9 @@ def _build_sql_query(rml_rule, references):
         for reference in references:
             query = f"{query}`{reference.replace('.', '`.`')}` IS NOT NULL AND "
         query = query[:-5]
+        if pd.notna(rml_rule.get('sql_table_range')):
+            # only the rows in the range of the table assigned to the mapping group (see `get_sql_table_ranges`)
+            query = f"{query} AND {rml_rule['sql_table_range']}"
     else:
         query = None
 
@@ -181,8 +216,13 @@ def _get_table_schema(connection_database, dialect: str, name_table: str) -> dic
 
     """
     Get schema information for a table to ensure `DataFrame` columns have proper types.
-    Returns a dict mapping column names to their SQL data types.
+    Returns a dict mapping column names to their SQL data types. The schema of each table is retrieved once per
+    process.
     """
+    schema_key = (str(connection_database.url), name_table)
+    if schema_key in TABLE_SCHEMAS:
+        return TABLE_SCHEMAS[schema_key]
+
     schema_dict = {}
 
     try:
@@ -215,6 +255,8 @@ def _get_table_schema(connection_database, dialect: str, name_table: str) -> dic
         LOGGER.warning(f"Schema information not available for table {name_table}, using Pandas type inference")
         LOGGER.debug(f"Schema retrieval error details: {exception}")
 
+    TABLE_SCHEMAS[schema_key] = schema_dict
+
     return schema_dict
 
 
@@ -253,7 +295,219 @@ def _apply_schema_types_to_columns(dataframe: pd.DataFrame, schema_dict: dict[st
     return dataframe
 
 
-def get_sql_data(config, rml_rule, references):
+@lru_cache(maxsize=None)
+def _get_query_tables(sql_query):
+    return sql_metadata.Parser(sql_query).tables
+
+
+def _get_schema_dict(connection_database, dialect, rml_rule):
+    schema_dict = {}
+
+    if rml_rule['logical_source_type'] == RML_TABLE_NAME:
+        name_table = rml_rule['logical_source_value']
+        # Handle schema-qualified table names.
+        if '.' in name_table:
+            name_table = name_table.split('.')[-1]
+        schema_dict = dict(_get_table_schema(connection_database, dialect, name_table))
+    elif rml_rule['logical_source_type'] == RML_QUERY:
+        # For queries, try to extract table names and merge their schemas.
+        try:
+            names_table = _get_query_tables(rml_rule['logical_source_value'])
+            for name_table in names_table:
+                table_schema = _get_table_schema(connection_database, dialect, name_table)
+                schema_dict.update(table_schema)
+        except (ValueError, AttributeError) as exception:
+            # SQL parsing failed or unexpected parser structure
+            LOGGER.exception(f"Could not extract table names from query.")
+            raise
+
+    return schema_dict
+
+
+def _stream_sql_query(sql_query, connection_database, chunk_size, fetch_size):
+    # server-side cursor (PostgreSQL, MySQL, Oracle...), the driver buffers at most `fetch_size` rows
+    with connection_database.connect().execution_options(stream_results=True,
+                                                         max_row_buffer=fetch_size) as connection:
+        yield from pd.read_sql_query(sql_query, con=connection, coerce_float=False, chunksize=chunk_size)
+
+
+def _read_sql_query(sql_query, connection_database, chunk_size=0, fetch_size=0):
+    """
+    Runs a query and returns a DataFrame, or an iterator of DataFrames with at most `chunk_size` rows each. If
+    `fetch_size` is provided the result set is streamed with a server-side cursor instead of being buffered by the
+    driver.
+    """
+
+    if not fetch_size:
+        return pd.read_sql_query(sql_query, con=connection_database, coerce_float=False, chunksize=chunk_size or None)
+    elif chunk_size:
+        return _stream_sql_query(sql_query, connection_database, chunk_size, fetch_size)
+
+    return pd.concat(_stream_sql_query(sql_query, connection_database, fetch_size, fetch_size), ignore_index=True)
+
+
+def _iter_sql_data_chunks(sql_query, connection_database, get_schema_dict, chunk_size, fetch_size=0):
+    schema_dict = None
+    for dataframe in _read_sql_query(sql_query, connection_database, chunk_size, fetch_size):
+        # the schema is retrieved once, with the first chunk
+        if schema_dict is None and len(dataframe.columns) > 0:
+            schema_dict = get_schema_dict()
+        if schema_dict:
+            dataframe = _apply_schema_types_to_columns(dataframe, schema_dict)
+
+        yield dataframe
+
+
+def estimate_sql_table_rows(config, rml_rule):
+    """
+    Estimates the number of rows of the table of a relational logical source with the statistics in the catalog of the
+    DBMS (PostgreSQL, MySQL/MariaDB, SQLite, MS SQL Server and Oracle). The table is never scanned, None is returned if
+    the statistics are not available (e.g., the table was never analyzed) or the logical source is a query.
+    """
+
+    if rml_rule['logical_source_type'] != RML_TABLE_NAME:
+        return None
+
+    table_name = rml_rule['logical_source_value']
+    table_name_without_schema = table_name.split('.')[-1]
+
+    try:
+        connection_database, dialect = _relational_db_connection(config, rml_rule['source_name'])
+
+        if dialect == POSTGRESQL:
+            sql_query = f"SELECT `reltuples` FROM `pg_class` WHERE `relname`='{table_name_without_schema}'"
+        elif dialect in [MYSQL, MARIADB]:
+            sql_query = f"SELECT `table_rows` FROM `information_schema`.`tables` " \
+                        f"WHERE `table_name`='{table_name_without_schema}'"
+        elif dialect == SQLITE:
+            # only available after ANALYZE, the first integer of the statistics is the number of rows
+            sql_query = f"SELECT `stat` FROM `sqlite_stat1` WHERE `tbl`='{table_name_without_schema}' LIMIT 1"
+        elif dialect == MSSQL:
+            sql_query = f"SELECT SUM(`rows`) FROM `sys`.`partitions` " \
+                        f"WHERE `object_id`=OBJECT_ID('{table_name}') AND `index_id` IN (0, 1)"
+        elif dialect == ORACLE:
+            sql_query = f"SELECT `num_rows` FROM `all_tables` WHERE `table_name`='{table_name_without_schema.upper()}'"
+        else:
+            return None
+
+        sql_query = _replace_query_enclosing_characters(sql_query, dialect)
+        query_results_df = pd.read_sql_query(sql_query, con=connection_database)
+        if len(query_results_df) == 1 and pd.notna(query_results_df.iat[0, 0]):
+            number_of_rows = int(float(str(query_results_df.iat[0, 0]).split()[0]))
+            # statistics are not reliable (0 or -1) for tables that were never analyzed
+            if number_of_rows > 0:
+                return number_of_rows
+    except (SQLAlchemyError, ValueError, TypeError) as e:
+        LOGGER.debug(f'The number of rows of table `{table_name}` could not be estimated: {e}')
+
+    return None
+
+
+def _get_table_primary_key(connection_database, table_name):
+    """
+    Returns the columns of the primary key of a table (empty if it has no primary key). The primary key of each table is
+    retrieved once per process.
+    """
+
+    from sqlalchemy import inspect
+
+    primary_key_key = (str(connection_database.url), table_name)
+    if primary_key_key not in TABLE_PRIMARY_KEYS:
+        schema_name, _, name_table = table_name.rpartition('.')
+        try:
+            TABLE_PRIMARY_KEYS[primary_key_key] = inspect(connection_database).get_pk_constraint(
+                name_table, schema=schema_name or None)['constrained_columns']
+        except SQLAlchemyError as e:
+            LOGGER.debug(f'The primary key of table `{table_name}` could not be retrieved: {e}')
+            TABLE_PRIMARY_KEYS[primary_key_key] = []
+
+    return TABLE_PRIMARY_KEYS[primary_key_key]
+
+
+def get_sql_table_primary_key(config, rml_rule):
+    """
+    Returns the columns of the primary key of the table of a relational logical source (empty if it has no primary
+    key or the logical source is a query).
+    """
+
+    if rml_rule['logical_source_type'] != RML_TABLE_NAME:
+        return []
+
+    connection_database, _ = _relational_db_connection(config, rml_rule['source_name'])
+
+    return _get_table_primary_key(connection_database, rml_rule['logical_source_value'])
+
+
+def _get_range_bounds(min_value, max_value, number_of_ranges):
+    # bounds splitting [min_value, max_value] into ranges of (almost) the same width
+    width = max_value - min_value + 1
+    return sorted(set(min_value + width * i // number_of_ranges for i in range(1, number_of_ranges)) - {min_value})
+
+
+def get_sql_table_ranges(config, rml_rule, number_of_ranges):
+    """
+    Splits the table of a relational logical source into at most `number_of_ranges` ranges of rows. Returns the
+    conditions selecting the rows in each range (using backticks '`' as enclosing character, see `_build_sql_query`).
+    Tables are split by their primary key if it is a single integer column, otherwise by the physical location of the
+    rows (`rowid` in SQLite and `ctid` in PostgreSQL). The first and last ranges are unbounded, so that rows inserted
+    after splitting the table are not missed. None is returned if the table cannot be split.
+    """
+
+    if rml_rule['logical_source_type'] != RML_TABLE_NAME or number_of_ranges < 2:
+        return None
+
+    table_name = rml_rule['logical_source_value']
+    quoted_table_name = f"`{table_name.replace('.', '`.`')}`"
+
+    try:
+        connection_database, dialect = _relational_db_connection(config, rml_rule['source_name'])
+        primary_key = _get_table_primary_key(connection_database, table_name)
+        schema_dict = _get_table_schema(connection_database, dialect, table_name.split('.')[-1])
+
+        format_bound = str
+        if len(primary_key) == 1 and _get_sql_data_type(schema_dict, primary_key[0]) in SQL_PUSHDOWN_INTEGER_TYPES:
+            range_column = f'`{primary_key[0]}`'
+            bounds_query = f'SELECT MIN({range_column}), MAX({range_column}) FROM {quoted_table_name}'
+        elif dialect == SQLITE:
+            range_column = 'rowid'
+            bounds_query = f'SELECT MIN(rowid), MAX(rowid) FROM {quoted_table_name}'
+        elif dialect == POSTGRESQL:
+            # ranges of pages of the table, scanned with TID range scans
+            range_column = 'ctid'
+            bounds_query = f"SELECT 0, pg_relation_size('{quoted_table_name}') / current_setting('block_size')::int - 1"
+            format_bound = lambda bound: f"'({bound},0)'::tid"
+        else:
+            return None
+
+        bounds_query = _replace_query_enclosing_characters(bounds_query, dialect)
+        bounds_df = pd.read_sql_query(bounds_query, con=connection_database)
+    except (SQLAlchemyError, KeyError, ValueError, TypeError) as e:
+        LOGGER.debug(f'Table `{table_name}` could not be split into ranges: {e}')
+        return None
+
+    if len(bounds_df) != 1 or bounds_df.iloc[0].isna().any():
+        # empty table
+        return None
+
+    bounds = _get_range_bounds(int(bounds_df.iat[0, 0]), int(bounds_df.iat[0, 1]), number_of_ranges)
+    if not bounds:
+        return None
+
+    table_ranges = [f'{range_column} < {format_bound(bounds[0])}']
+    table_ranges.extend(f'{range_column} >= {format_bound(lower_bound)} AND '
+                        f'{range_column} < {format_bound(upper_bound)}'
+                        for lower_bound, upper_bound in zip(bounds[:-1], bounds[1:]))
+    table_ranges.append(f'{range_column} >= {format_bound(bounds[-1])}')
+
+    return table_ranges
+
+
+def get_sql_data(config, rml_rule, references, chunk_size=0):
+    """
+    Retrieves the data of a relational logical source. If `chunk_size` is provided, an iterator of DataFrames with at
+    most `chunk_size` rows each is returned.
+    """
+
     sql_query = _build_sql_query(rml_rule, references)
     if sql_query is None:
         # in case all term maps are constants e.g. R2RML test case R2RMLTC0006a
@@ -264,31 +518,376 @@ def get_sql_data(config, rml_rule, references):
 
     LOGGER.debug(f"SQL query for mapping rule `{rml_rule['triples_map_id']}`: [{sql_query}]")
 
-    dataframe = pd.read_sql_query(sql_query, con=connection_database, coerce_float=False)
+    fetch_size = config.get_fetch_size(rml_rule['source_name'])
+    if chunk_size:
+        return _iter_sql_data_chunks(sql_query, connection_database,
+                                     lambda: _get_schema_dict(connection_database, dialect, rml_rule), chunk_size,
+                                     fetch_size)
+
+    dataframe = _read_sql_query(sql_query, connection_database, fetch_size=fetch_size)
 
     # Apply schema-based types when Pandas’ type inference is ambiguous.
     if len(dataframe.columns) > 0:
-        schema_dict = {}
-
-        if rml_rule['logical_source_type'] == RML_TABLE_NAME:
-            name_table = rml_rule['logical_source_value']
-            # Handle schema-qualified table names.
-            if '.' in name_table:
-                name_table = name_table.split('.')[-1]
-            schema_dict = _get_table_schema(connection_database, dialect, name_table)
-        elif rml_rule['logical_source_type'] == RML_QUERY:
-            # For queries, try to extract table names and merge their schemas.
-            try:
-                names_table = sql_metadata.Parser(rml_rule['logical_source_value']).tables
-                for name_table in names_table:
-                    table_schema = _get_table_schema(connection_database, dialect, name_table)
-                    schema_dict.update(table_schema)
-            except (ValueError, AttributeError) as exception:
-                # SQL parsing failed or unexpected parser structure
-                LOGGER.exception(f"Could not extract table names from query.")
-                raise
+        schema_dict = _get_schema_dict(connection_database, dialect, rml_rule)
+        if schema_dict:
+            dataframe = _apply_schema_types_to_columns(dataframe, schema_dict)
+
+    return dataframe
+
+
+def _build_sql_join_query(rml_rule, references, parent_rml_rule, parent_references, join_references):
+    """
+    Build the joint SQL query of a referencing object map (see https://www.w3.org/TR/r2rml/#joint-sql-query) using
+    backticks '`' as enclosing character. The columns of the parent are renamed with the `parent_` prefix.
+    """
+
+    child_query = _build_sql_query(rml_rule, references).strip().rstrip(';')
+    parent_query = _build_sql_query(parent_rml_rule, parent_references).strip().rstrip(';')
+
+    select_columns = [f'`child`.`{reference}` AS `{reference}`' for reference in references] + \
+                     [f'`parent`.`{reference}` AS `parent_{reference}`' for reference in parent_references]
+    join_conditions = [f'`child`.`{reference}` = `parent`.`{parent_reference}`'
+                       for reference, parent_reference in join_references]
+
+    return f"SELECT {', '.join(select_columns)} FROM ({child_query}) AS `child` " \
+           f"JOIN ({parent_query}) AS `parent` ON {' AND '.join(join_conditions)}"
 
+
+def get_sql_join_data(config, rml_rule, references, parent_rml_rule, parent_references, join_references, chunk_size=0):
+    """
+    Retrieves the result of joining the logical source of a mapping rule with the one of its parent triples map, both
+    in the same relational database. The join is evaluated by the database, the columns of the parent are prefixed
+    with `parent_`. `join_references` is a list of (child reference, parent reference) pairs. If `chunk_size` is
+    provided, an iterator of DataFrames with at most `chunk_size` rows each is returned.
+    """
+
+    references, parent_references = list(dict.fromkeys(references)), list(dict.fromkeys(parent_references))
+    sql_query = _build_sql_join_query(rml_rule, references, parent_rml_rule, parent_references, join_references)
+
+    connection_database, dialect = _relational_db_connection(config, rml_rule['source_name'])
+    sql_query = _replace_query_enclosing_characters(sql_query, dialect)
+
+    LOGGER.debug(f"SQL join query for mapping rule `{rml_rule['triples_map_id']}`: [{sql_query}]")
+
+    def get_schema_dict():
+        schema_dict = {column: data_type for column, data_type in
+                       _get_schema_dict(connection_database, dialect, rml_rule).items() if column in references}
+        schema_dict.update({f'parent_{column}': data_type for column, data_type in
+                            _get_schema_dict(connection_database, dialect, parent_rml_rule).items()})
+        return schema_dict
+
+    fetch_size = config.get_fetch_size(rml_rule['source_name'])
+    if chunk_size:
+        return _iter_sql_data_chunks(sql_query, connection_database, get_schema_dict, chunk_size, fetch_size)
+
+    dataframe = _read_sql_query(sql_query, connection_database, fetch_size=fetch_size)
+
+    if len(dataframe.columns) > 0:
+        schema_dict = get_schema_dict()
         if schema_dict:
             dataframe = _apply_schema_types_to_columns(dataframe, schema_dict)
 
     return dataframe
+
+
+def _is_pushdown_supported_source(rml_rule):
+    return rml_rule['source_type'] == RDB and rml_rule['logical_source_type'] in [RML_TABLE_NAME, RML_QUERY]
+
+
+def is_supported_by_sql_pushdown(rml_rule, rml_df, config):
+    """
+    Checks whether the terms of a mapping rule can be generated by its relational database. Only tables and queries,
+    and term maps that are templates, constants or references are supported (referencing object maps are not, their
+    joins are pushed down separately).
+    """
+
+    return rml_rule['object_map_type'] != RML_PARENT_TRIPLES_MAP and \
+        is_template_rml_rule(rml_rule, rml_df, config, _is_pushdown_supported_source)
+
+
+def _quote_sql_identifier(identifier, dialect):
+    if dialect in [MYSQL, MARIADB]:
+        return '`' + identifier.replace('`', '``') + '`'
+    elif dialect == MSSQL:
+        return '[' + identifier.replace(']', ']]') + ']'
+
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _quote_sql_string(value, dialect):
+    value = value.replace("'", "''")
+
+    if dialect in [MYSQL, MARIADB]:
+        # backslashes are escape characters in MySQL string literals
+        value = value.replace('\\', '\\\\')
+    elif dialect == MSSQL:
+        return f"N'{value}'"
+
+    return f"'{value}'"
+
+
+def _cast_sql_string(expression, dialect):
+    if dialect in [MYSQL, MARIADB]:
+        return f'CAST({expression} AS CHAR)'
+    elif dialect == MSSQL:
+        return f'CAST({expression} AS NVARCHAR(MAX))'
+    elif dialect == ORACLE:
+        return f'CAST({expression} AS VARCHAR2(4000))'
+
+    return f'CAST({expression} AS TEXT)'
+
+
+def _concatenate_sql_strings(expressions, dialect):
+    if len(expressions) == 1:
+        return expressions[0]
+    elif dialect in [MYSQL, MARIADB, MSSQL]:
+        return f"CONCAT({', '.join(expressions)})"
+
+    return ' || '.join(expressions)
+
+
+def _get_sql_unreserved_condition(expression, dialect):
+    """
+    Condition checking that a value is only made of RFC 3986 unreserved characters, i.e., it is not changed by
+    percent-encoding. The comparisons are case-sensitive and by code point.
+    """
+
+    if dialect == POSTGRESQL:
+        return f"{expression} ~ '^[A-Za-z0-9._~-]*$'"
+    elif dialect in [MYSQL, MARIADB]:
+        return f"CAST({expression} AS CHAR CHARACTER SET utf8mb4) COLLATE utf8mb4_bin REGEXP '^[A-Za-z0-9._~-]*$'"
+    elif dialect == ORACLE:
+        return f"REGEXP_LIKE({expression}, '^[A-Za-z0-9._~-]*$', 'c')"
+    elif dialect == MSSQL:
+        return f"{expression} COLLATE Latin1_General_BIN NOT LIKE N'%[^A-Za-z0-9._~-]%'"
+
+    # SQLite
+    return f"{expression} NOT GLOB '*[^A-Za-z0-9._~-]*'"
+
+
+def _get_sql_not_equal_condition(expression, value, dialect):
+    # as in pandas, the comparisons are case-sensitive and trailing spaces are significant
+    if dialect in [MYSQL, MARIADB]:
+        return f'CAST({expression} AS BINARY) <> CAST({_quote_sql_string(value, dialect)} AS BINARY)'
+    elif dialect == MSSQL:
+        return f'NOT ({expression} COLLATE Latin1_General_BIN = {_quote_sql_string(value, dialect)} AND ' \
+               f'DATALENGTH({expression}) = DATALENGTH({_quote_sql_string(value, dialect)}))'
+
+    return f'{expression} <> {_quote_sql_string(value, dialect)}'
+
+
+def _normalize_sql_literal_datatype(expression, datatype, data_type):
+    """
+    Same normalization as in the materializer (Natural Mapping of SQL Values). None if it cannot be done in SQL.
+    """
+
+    if datatype == XSD_DATETIME:
+        return f"REPLACE({expression}, ' ', 'T')"
+    elif datatype == XSD_INTEGER or datatype == XSD_NONNEGATIVEINTEGER:
+        return expression if data_type in SQL_PUSHDOWN_INTEGER_TYPES else None
+    elif datatype == XSD_BOOLEAN:
+        # lowercasing of non-ASCII characters is not the same as in Python
+        return None
+
+    return expression
+
+
+def _escape_sql_literal(expression, dialect, config):
+    escaping_replacements = get_literal_escaping_replacements(config.get_literal_escaping_chars())
+    if escaping_replacements is None:
+        return None
+
+    for char, escaping_string in escaping_replacements:
+        expression = f'REPLACE({expression}, {_quote_sql_string(char, dialect)}, ' \
+                     f'{_quote_sql_string(escaping_string, dialect)})'
+
+    return expression
+
+
+def _get_sql_term_expression(template, expression_type, dialect, data_types, config, termtype='', datatype=''):
+    """
+    Builds the SQL expression generating the terms of a term map, equivalent to `_materialize_template` in the
+    materializer. Returns the expression and the conditions that the values of the references must satisfy so that
+    they are not percent-encoded, or None if the terms cannot be generated in SQL.
+    """
+
+    compiled_template = compile_template(template, expression_type)
+
+    if termtype.strip() == RML_IRI:
+        prefix, suffix = '<', '>'
+    elif termtype.strip() == RML_BLANK_NODE:
+        prefix, suffix = '_:', ''
+    elif termtype.strip() == RML_LITERAL:
+        prefix, suffix = '"', '"'
+    else:
+        prefix, suffix = '', ''
+
+    segments = list(compiled_template.segments)
+    segments[0] = prefix + segments[0]
+    segments[-1] = segments[-1] + suffix
+
+    expressions = [_quote_sql_string(segments[0], dialect)]
+    unreserved_conditions = []
+    for reference, segment in zip(compiled_template.references, segments[1:]):
+        reference_expression = _cast_sql_string(_quote_sql_identifier(reference, dialect), dialect)
+        if data_types[reference] in SQL_PUSHDOWN_INTEGER_TYPES:
+            # integers are neither percent-encoded, escaped nor normalized
+            pass
+        elif termtype.strip() == RML_IRI and expression_type == RML_TEMPLATE:
+            unreserved_conditions.append(_get_sql_unreserved_condition(reference_expression, dialect))
+        elif termtype.strip() == RML_LITERAL:
+            reference_expression = _normalize_sql_literal_datatype(reference_expression, datatype,
+                                                                   data_types[reference])
+            if reference_expression is None:
+                return None
+            reference_expression = _escape_sql_literal(reference_expression, dialect, config)
+            if reference_expression is None:
+                return None
+        expressions.extend([reference_expression, _quote_sql_string(segment, dialect)])
+
+    # empty strings are nulls in Oracle
+    expressions = [expression for expression in expressions if expression != _quote_sql_string('', dialect)]
+    if not expressions:
+        return None
+
+    return _concatenate_sql_strings(expressions, dialect), unreserved_conditions
+
+
+def _get_sql_data_type(schema_dict, reference):
+    data_type = schema_dict.get(reference)
+    if not data_type:
+        return None
+
+    # remove the length, precision, etc. (e.g., VARCHAR(50))
+    data_type = data_type.split('(')[0].strip().upper()
+    if data_type in SQL_PUSHDOWN_STRING_TYPES or data_type in SQL_PUSHDOWN_INTEGER_TYPES:
+        return data_type
+
+    return None
+
+
+def _build_sql_pushdown_query(rml_rule, config, dialect, schema_dict):
+    """
+    Builds the query generating the triples (or quads) of a mapping rule in the column `SQL_PUSHDOWN_TRIPLE_COLUMN`,
+    removing duplicates. If some values must be percent-encoded, the triple of the row is null and the referenced
+    columns are selected instead, for the rest of rows these columns are null. None is returned if the terms cannot be
+    generated in SQL.
+    """
+
+    references = set()
+    for position in get_term_map_positions(rml_rule, config):
+        references.update(get_references_in_term_map(rml_rule, position))
+    references = sorted(references)
+
+    data_types = {reference: _get_sql_data_type(schema_dict, reference) for reference in references}
+    if not references or None in data_types.values() or any('.' in reference for reference in references):
+        # the values of other data types could be converted to different strings than in pandas
+        return None
+
+    term_maps = [(rml_rule['subject_map_value'], rml_rule['subject_map_type'], rml_rule['subject_termtype'], ''),
+                 (rml_rule['predicate_map_value'], rml_rule['predicate_map_type'], RML_IRI, ''),
+                 (rml_rule['object_map_value'], rml_rule['object_map_type'], rml_rule['object_termtype'],
+                  rml_rule['lang_datatype_map_value'])]
+    if rml_rule['lang_datatype'] == RML_LANGUAGE_MAP:
+        term_maps.append((rml_rule['lang_datatype_map_value'], rml_rule['lang_datatype_map_type'], '', ''))
+    elif rml_rule['lang_datatype'] == RML_DATATYPE_MAP:
+        term_maps.append((rml_rule['lang_datatype_map_value'], rml_rule['lang_datatype_map_type'], RML_IRI, ''))
+    if config.get_output_format() == NQUADS and has_graph_map(rml_rule, config):
+        term_maps.append((rml_rule['graph_map_value'], rml_rule['graph_map_type'], RML_IRI, ''))
+
+    terms = []
+    unreserved_conditions = []
+    for template, expression_type, termtype, datatype in term_maps:
+        term_expression = _get_sql_term_expression(template, expression_type, dialect, data_types, config,
+                                                   termtype=termtype, datatype=datatype)
+        if term_expression is None:
+            return None
+        terms.append(term_expression[0])
+        unreserved_conditions.extend(term_expression[1])
+
+    space = _quote_sql_string(' ', dialect)
+    triple = [terms[0], space, terms[1], space, terms[2]]
+    if rml_rule['lang_datatype'] == RML_LANGUAGE_MAP:
+        triple.extend([_quote_sql_string('@', dialect), terms[3]])
+    elif rml_rule['lang_datatype'] == RML_DATATYPE_MAP:
+        triple.extend([_quote_sql_string('^^', dialect), terms[3]])
+    if config.get_output_format() == NQUADS:
+        # the graph is empty for the default graph
+        triple.extend([space, terms[-1]] if has_graph_map(rml_rule, config) else [space])
+    triple = _concatenate_sql_strings(triple, dialect)
+
+    select_columns = []
+    unreserved_conditions = list(dict.fromkeys(unreserved_conditions))
+    if unreserved_conditions:
+        unreserved_condition = ' AND '.join(unreserved_conditions)
+        select_columns.append(f'CASE WHEN {unreserved_condition} THEN {triple} END AS '
+                              f'{_quote_sql_identifier(SQL_PUSHDOWN_TRIPLE_COLUMN, dialect)}')
+        # the triples of the rows with values to percent-encode are generated by the client
+        select_columns.extend(f'CASE WHEN {unreserved_condition} THEN NULL ELSE '
+                              f'{_cast_sql_string(_quote_sql_identifier(reference, dialect), dialect)} END AS '
+                              f'{_quote_sql_identifier(reference, dialect)}' for reference in references)
+    else:
+        select_columns.append(f'{triple} AS {_quote_sql_identifier(SQL_PUSHDOWN_TRIPLE_COLUMN, dialect)}')
+
+    if rml_rule['logical_source_type'] == RML_TABLE_NAME:
+        from_clause = '.'.join(_quote_sql_identifier(name, dialect)
+                               for name in rml_rule['logical_source_value'].split('.'))
+    else:
+        query = rml_rule['logical_source_value'].strip().rstrip(';')
+        from_clause = f'({_replace_query_enclosing_characters(query, dialect)}) logical_source'
+
+    filters = []
+    na_values = sorted(na_value for na_value in config.get_na_values() if na_value or dialect != ORACLE)
+    for reference in references:
+        filters.append(f'{_quote_sql_identifier(reference, dialect)} IS NOT NULL')
+        reference_expression = _cast_sql_string(_quote_sql_identifier(reference, dialect), dialect)
+        filters.extend(_get_sql_not_equal_condition(reference_expression, na_value, dialect)
+                       for na_value in na_values)
+    if rml_rule['logical_source_type'] == RML_TABLE_NAME and pd.notna(rml_rule.get('sql_table_range')):
+        filters.append(_replace_query_enclosing_characters(rml_rule['sql_table_range'], dialect))
+
+    return f"SELECT DISTINCT {', '.join(select_columns)} FROM {from_clause} WHERE {' AND '.join(filters)}"
+
+
+def get_sql_pushdown_data(config, rml_rule, chunk_size=0):
+    """
+    Retrieves the triples of a mapping rule generated by its relational database, which also removes null values and
+    duplicates. The triples are in the column `SQL_PUSHDOWN_TRIPLE_COLUMN`. Percent-encoding cannot be done in SQL,
+    for the rows with values that must be percent-encoded the triple is null and the referenced columns are retrieved
+    (as strings) to generate the triples in the client. None is returned if the terms of the mapping rule cannot be
+    generated in the dialect of the database. If `chunk_size` is provided, an iterator of DataFrames with at most
+    `chunk_size` rows each is returned.
+    """
+
+    connection_database, dialect = _relational_db_connection(config, rml_rule['source_name'])
+    if dialect not in SQL_PUSHDOWN_DIALECTS:
+        return None
+
+    try:
+        schema_dict = _get_schema_dict(connection_database, dialect, rml_rule)
+    except (ValueError, AttributeError):
+        # the query of the logical source could not be parsed
+        return None
+
+    sql_query = _build_sql_pushdown_query(rml_rule, config, dialect, schema_dict)
+    if sql_query is None:
+        LOGGER.debug(f"The terms of mapping rule `{rml_rule['triples_map_id']}` cannot be generated in SQL.")
+        return None
+
+    LOGGER.debug(f"SQL pushdown query for mapping rule `{rml_rule['triples_map_id']}`: [{sql_query}]")
+
+    # all the columns are strings, schema types are not applied
+    return _read_sql_query(sql_query, connection_database, chunk_size, config.get_fetch_size(rml_rule['source_name']))
+
+
+def clear_relational_db_caches():
+    """
+    Closes the connections in the pools of the engines of this process and removes the cached table schemas and
+    primary keys.
+    """
+
+    for (process_id, _, _), db_engine in DB_ENGINES.items():
+        db_engine.dispose(close=process_id == os.getpid())
+    DB_ENGINES.clear()
+    TABLE_SCHEMAS.clear()
+    TABLE_PRIMARY_KEYS.clear()
@@ -0,0 +1,136 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import logging
+
+from collections import OrderedDict
+
+from ..constants import *
+
+
+LOGGER = logging.getLogger(LOGGING_NAMESPACE)
+
+# sources whose readers only project the referenced columns, the data read for a set of references is the projection
+# of the data read for any superset of it
+PROJECTABLE_SOURCE_TYPES = [CSV, TSV, PARQUET, ORC, STATA, SPSS] + EXCEL + ODS + FEATHER + SAS
+
+
+def get_source_key(rml_rule):
+    """
+    Identifies the logical source of a mapping rule. Each range of a range-partitioned table is a different source.
+    """
+
+    return (rml_rule['source_name'], rml_rule['source_type'], rml_rule['logical_source_type'],
+            rml_rule['logical_source_value'], str(rml_rule['iterator']), rml_rule.get('sql_table_range'))
+
+
+class SourceCache:
+    """
+    Per-process cache of the data read from the logical sources. For sources whose readers project the referenced
+    columns, the union of the references used with the source is read once and every mapping rule is served its
+    projection. For the rest of sources the data is cached per set of references (e.g., a parent triples map read for
+    several referencing object maps). Entries are evicted in LRU order to keep the memory usage under the budget.
+    """
+
+    def __init__(self, memory_budget=0):
+        self.memory_budget = memory_budget
+        self.entries = OrderedDict()
+        self.entries_memory = {}
+        self.memory_usage = 0
+        # references that are expected to be read from each source (keys of projectable sources)
+        self.planned_references = {}
+
+    def set_memory_budget(self, memory_budget):
+        self.memory_budget = memory_budget
+        self._evict()
+
+    @staticmethod
+    def _is_projectable(rml_rule):
+        # RML tabular views (rml:query without db_url) have CSV source type, all the columns of the view are read
+        return rml_rule['source_type'] in PROJECTABLE_SOURCE_TYPES
+
+    def _get_key(self, rml_rule, references):
+        if rml_rule['source_type'] in IN_MEMORY_TYPES or not references:
+            # in-memory data is not read, data read without references has all the columns
+            return None
+
+        key = get_source_key(rml_rule)
+        if not self._is_projectable(rml_rule):
+            key += (frozenset(references),)
+
+        return key
+
+    def plan(self, rml_rule, references):
+        """
+        Registers references that will be read from the logical source of a mapping rule, so that they are read at once.
+        """
+
+        key = self._get_key(rml_rule, references)
+        if key is not None and self._is_projectable(rml_rule):
+            self.planned_references.setdefault(key, set()).update(references)
+
+    def get_data(self, rml_rule, references, read_data):
+        """
+        Returns the data of the logical source of a mapping rule with (at least) the columns in `references`.
+        `read_data` is called with the references to read when the data is not cached. The returned DataFrame must
+        not be modified.
+        """
+
+        key = self._get_key(rml_rule, references)
+        if key is None or not self.memory_budget:
+            return read_data(references)
+
+        references = set(references)
+        is_projectable = self._is_projectable(rml_rule)
+        if key in self.entries and (not is_projectable or references.issubset(self.entries[key].columns)):
+            self.entries.move_to_end(key)
+            LOGGER.debug(f'Source cache hit for `{rml_rule["logical_source_value"]}`.')
+            return self.entries[key]
+
+        if is_projectable:
+            references.update(self.planned_references.get(key, set()))
+            if key in self.entries:
+                # some references were not planned, read also the columns already cached to replace the entry
+                references.update(self.entries[key].columns)
+        data = read_data(references)
+
+        self._put(key, data)
+
+        return data
+
+    def _put(self, key, data):
+        self._remove(key)
+
+        data_memory = int(data.memory_usage(index=True, deep=True).sum())
+        if data_memory > self.memory_budget:
+            return
+
+        self.entries[key] = data
+        self.entries_memory[key] = data_memory
+        self.memory_usage += data_memory
+        self._evict()
+
+    def _remove(self, key):
+        if key in self.entries:
+            del self.entries[key]
+            self.memory_usage -= self.entries_memory.pop(key)
+
+    def _evict(self):
+        while self.memory_usage > self.memory_budget and self.entries:
+            key = next(iter(self.entries))
+            LOGGER.debug(f'Evicting `{key[3]}` from the source cache.')
+            self._remove(key)
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.entries_memory = {}
+        self.memory_usage = 0
+        self.planned_references = {}
+
+
+SOURCE_CACHE = SourceCache()
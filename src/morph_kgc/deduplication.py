@@ -0,0 +1,279 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import sys
+import heapq
+import shutil
+import logging
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .constants import *
+from .utils import unique_strings
+
+
+LOGGER = logging.getLogger(LOGGING_NAMESPACE)
+
+# keys for the hash functions, the second one is used to extend the digests to 128 bits
+HASH_KEY_LOW = '0123456789123456'
+HASH_KEY_HIGH = 'morph-kgc-dedup1'
+
+# maximum number of sorted runs of digests before they are merged into one
+MAX_DIGEST_RUNS = 8
+
+
+def _to_object_array(triples):
+    if isinstance(triples, pd.Series):
+        return triples.to_numpy(dtype=object)
+    return np.asarray(list(triples) if not isinstance(triples, np.ndarray) else triples, dtype=object)
+
+
+class TripleDeduplicator:
+    """
+    Removes duplicated triples generated by the mapping rules of a mapping partition. Triples are added in batches
+    with `add`, which returns the triples of the batch that were not seen before. Some strategies cannot decide
+    whether a triple is new until all batches have been added, those triples are returned by `finalize`. Different
+    mapping partitions never generate the same triples, hence a deduplicator is used per mapping partition.
+    """
+
+    def __init__(self):
+        self.num_triples = 0
+
+    def add(self, triples):
+        raise NotImplementedError
+
+    def finalize(self):
+        return []
+
+    def memory_usage(self):
+        """
+        Returns the (approximate) number of bytes used to keep track of the triples already seen.
+        """
+
+        return 0
+
+    def close(self):
+        pass
+
+
+class ExactDeduplicator(TripleDeduplicator):
+    """
+    Keeps the full triples in a Python set.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.triples = set()
+
+    def add(self, triples):
+        new_triples = set(triples)
+        new_triples.difference_update(self.triples)
+        self.triples.update(new_triples)
+        self.num_triples += len(new_triples)
+
+        return list(new_triples)
+
+    def memory_usage(self):
+        # only computed when it is reported, it iterates over all the triples
+        return sys.getsizeof(self.triples) + sum(map(sys.getsizeof, self.triples))
+
+    def close(self):
+        self.triples = set()
+
+
+class HashDeduplicator(TripleDeduplicator):
+    """
+    Keeps 64 or 128-bit digests of the triples in sorted numpy arrays. The memory used is 8 or 16 bytes per triple,
+    independently of the length of the triples. Distinct triples with the same digest are considered duplicates, the
+    probability of this happening is negligible with 128-bit digests.
+    """
+
+    def __init__(self, digest_bits=64):
+        super().__init__()
+        self.digest_bits = digest_bits
+        # list of sorted runs, each run is a tuple with the arrays of the low (and high) 64 bits of the digests
+        self.runs = []
+
+    def _get_digests(self, triples):
+        digests = [pd.util.hash_array(triples, hash_key=HASH_KEY_LOW, categorize=False)]
+        if self.digest_bits == 128:
+            digests.append(pd.util.hash_array(triples, hash_key=HASH_KEY_HIGH, categorize=False))
+
+        return digests
+
+    def _is_in_run(self, digests, run):
+        low_digests = digests[0]
+        low_run = run[0]
+
+        left = np.searchsorted(low_run, low_digests, side='left')
+        right = np.searchsorted(low_run, low_digests, side='right')
+        found = right > left
+        if self.digest_bits == 128:
+            high_digests = digests[1]
+            high_run = run[1]
+            # a single match for the low bits, compare the high bits directly
+            single_match = found & (right - left == 1)
+            found = found & (right - left > 1)
+            found[single_match] = high_run[left[single_match]] == high_digests[single_match]
+            # several matches for the low bits, this only happens with collisions in the low 64 bits
+            for i in np.flatnonzero(right - left > 1):
+                found[i] = high_digests[i] in high_run[left[i]:right[i]]
+
+        return found
+
+    def _merge_runs(self):
+        run = tuple(np.concatenate([run[i] for run in self.runs]) for i in range(len(self.runs[0])))
+        order = np.lexsort(run[::-1])
+        self.runs = [tuple(digests[order] for digests in run)]
+
+    def add(self, triples):
+        triples = _to_object_array(triples)
+        if len(triples) == 0:
+            return triples
+
+        digests = self._get_digests(triples)
+
+        # sort the digests of the batch and remove duplicates within the batch
+        order = np.lexsort(digests[::-1])
+        digests = [d[order] for d in digests]
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = digests[0][1:] != digests[0][:-1]
+        for d in digests[1:]:
+            is_first[1:] |= d[1:] != d[:-1]
+
+        # remove the triples seen in previous batches
+        for run in self.runs:
+            is_first[is_first] = ~self._is_in_run([d[is_first] for d in digests], run)
+
+        self.runs.append(tuple(d[is_first] for d in digests))
+        if len(self.runs) > MAX_DIGEST_RUNS:
+            self._merge_runs()
+
+        # keep the order of the triples in the batch
+        new_triples = triples[np.sort(order[is_first])]
+        self.num_triples += len(new_triples)
+
+        return new_triples
+
+    def memory_usage(self):
+        return sum(digests.nbytes for run in self.runs for digests in run)
+
+    def close(self):
+        self.runs = []
+
+
+class ExternalSortDeduplicator(TripleDeduplicator):
+    """
+    Keeps at most `buffer_size` triples in memory. When the buffer is full, its unique triples are sorted and spilled
+    to a temporary file. Triples are deduplicated at the end by merging the sorted files, hence `add` returns no
+    triples and all of them are returned by `finalize`.
+    """
+
+    def __init__(self, buffer_size):
+        super().__init__()
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffer_length = 0
+        self.buffer_bytes = 0
+        self.max_buffer_bytes = 0
+        self.spill_dir = None
+        self.spill_files = []
+
+    def _spill_buffer(self):
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix='morph_kgc_dedup_')
+
+        spill_file_path = os.path.join(self.spill_dir, f'run_{len(self.spill_files)}.nt')
+        with open(spill_file_path, 'w', encoding='utf-8') as spill_file:
+            for triple in self._sorted_buffer():
+                spill_file.write(f'{triple}\n')
+        self.spill_files.append(spill_file_path)
+
+        LOGGER.debug(f'Spilled {self.buffer_length} triples to `{spill_file_path}` for deduplication.')
+        self.buffer = []
+        self.buffer_length = 0
+        self.buffer_bytes = 0
+
+    def _sorted_buffer(self):
+        if not self.buffer:
+            return []
+        return sorted(set(np.concatenate(self.buffer)))
+
+    def add(self, triples):
+        triples = unique_strings(_to_object_array(triples))
+        self.buffer.append(triples)
+        self.buffer_length += len(triples)
+        # approximate size of the strings, each one has an overhead of the size of an empty string
+        self.buffer_bytes += sum(map(len, triples)) + len(triples) * sys.getsizeof('') + triples.nbytes
+        self.max_buffer_bytes = max(self.max_buffer_bytes, self.buffer_bytes)
+
+        if self.buffer_length >= self.buffer_size:
+            self._spill_buffer()
+
+        return []
+
+    def _merge_spill_files(self):
+        spill_files = [open(spill_file_path, 'r', encoding='utf-8') for spill_file_path in self.spill_files]
+        try:
+            previous_triple = None
+            # remove the line breaks before merging, the runs are sorted without them
+            sorted_runs = [(line[:-1] for line in spill_file) for spill_file in spill_files]
+            for triple in heapq.merge(*sorted_runs):
+                if triple != previous_triple:
+                    self.num_triples += 1
+                    yield triple
+                    previous_triple = triple
+        finally:
+            for spill_file in spill_files:
+                spill_file.close()
+            self.close()
+
+    def finalize(self):
+        if not self.spill_files:
+            # everything fits in memory
+            triples = self._sorted_buffer()
+            self.num_triples += len(triples)
+            self.buffer = []
+            return triples
+
+        if self.buffer:
+            self._spill_buffer()
+
+        return self._merge_spill_files()
+
+    def memory_usage(self):
+        # the buffer is emptied every time it is spilled, report its maximum size
+        return self.max_buffer_bytes
+
+    def close(self):
+        self.buffer = []
+        self.buffer_bytes = 0
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+            self.spill_files = []
+
+
+def get_deduplicator(config):
+    """
+    Creates the triple deduplicator for the strategy selected in the config.
+    """
+
+    deduplication = config.get_deduplication()
+
+    if deduplication == HASH64_DEDUPLICATION:
+        return HashDeduplicator(digest_bits=64)
+    elif deduplication == HASH128_DEDUPLICATION:
+        return HashDeduplicator(digest_bits=128)
+    elif deduplication == SORT_DEDUPLICATION:
+        return ExternalSortDeduplicator(config.get_deduplication_buffer_size())
+    else:
+        return ExactDeduplicator()
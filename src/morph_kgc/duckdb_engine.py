@@ -0,0 +1,279 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import logging
+
+import duckdb
+
+from .constants import *
+from .utils import get_rml_rule, get_references_in_join_condition, get_references_in_term_map, has_graph_map, \
+    get_term_map_positions, is_template_rml_rule
+from .template import compile_template
+from .encoding import percent_encode, escape_literal
+from .data_source.data_file import _get_csv_delimiter
+
+
+LOGGER = logging.getLogger(LOGGING_NAMESPACE)
+
+DUCKDB_SOURCE_TYPES = [CSV, TSV, PARQUET]
+
+
+def _quote_identifier(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _quote_string(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _is_supported_source(rml_rule):
+    return rml_rule['source_type'] in DUCKDB_SOURCE_TYPES and rml_rule['logical_source_type'] == RML_SOURCE and \
+        os.path.isfile(str(rml_rule['logical_source_value']).strip())
+
+
+def _get_references(rml_rule, rml_df, config):
+    """
+    Returns the references of a mapping rule in its logical source, and the references in the logical source of the
+    parent triples map (empty if the object map is not a referencing object map).
+    """
+
+    references = set()
+    for position in get_term_map_positions(rml_rule, config):
+        references.update(get_references_in_term_map(rml_rule, position))
+
+    parent_references = set()
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+        parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+        child_join_references, parent_join_references = get_references_in_join_condition(rml_rule,
+                                                                                         'object_join_conditions')
+        references.update(child_join_references)
+        parent_references.update(get_references_in_term_map(parent_triples_map_rule, 'subject'))
+        parent_references.update(parent_join_references)
+
+    return sorted(references), sorted(parent_references)
+
+
+def _has_string_columns(rml_rule, references):
+    """
+    Checks whether the referenced columns of a Parquet file are strings. DuckDB converts the values of other types to
+    different strings than pandas (e.g., booleans are `true` instead of `True` and integers with nulls are not floats).
+    """
+
+    if rml_rule['source_type'] != PARQUET:
+        # CSV files are read as strings
+        return True
+
+    file_path = _quote_string(str(rml_rule['logical_source_value']).strip())
+    column_types = {column[0]: column[1] for column in
+                    duckdb.sql(f'DESCRIBE SELECT * FROM read_parquet({file_path})').fetchall()}
+
+    return all(column_types.get(reference) == 'VARCHAR' for reference in references)
+
+
+def is_supported_by_duckdb(rml_rule, rml_df, config):
+    """
+    Checks whether a mapping rule can be materialized with DuckDB. Only local CSV, TSV and Parquet files (with string
+    referenced columns), and term maps that are templates, constants or references are supported. The rest of mapping
+    rules (functions, RML-star, other data sources) are materialized with pandas.
+    """
+
+    if not is_template_rml_rule(rml_rule, rml_df, config, _is_supported_source):
+        return False
+
+    references, parent_references = _get_references(rml_rule, rml_df, config)
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP and \
+            not _has_string_columns(get_rml_rule(rml_df, rml_rule['object_map_value']), parent_references):
+        return False
+
+    return _has_string_columns(rml_rule, references)
+
+
+def _get_source_query(rml_rule, references, config):
+    """
+    Builds the query reading the `references` of the logical source of a mapping rule. Rows with null values in the
+    references are discarded and duplicated rows are removed.
+    """
+
+    file_path = str(rml_rule['logical_source_value']).strip()
+
+    columns = []
+    for reference in references:
+        if rml_rule['source_type'] in [CSV, TSV]:
+            # as with pandas, empty fields are read as empty strings
+            columns.append(f'COALESCE({_quote_identifier(reference)}, \'\') AS {_quote_identifier(reference)}')
+        else:
+            columns.append(f'CAST({_quote_identifier(reference)} AS VARCHAR) AS {_quote_identifier(reference)}')
+
+    if rml_rule['source_type'] in [CSV, TSV]:
+        # the delimiter is inferred as in the pandas engine (issue #81)
+        delimiter = _get_csv_delimiter(file_path, references, rml_rule['source_type'])
+        source = f"read_csv({_quote_string(file_path)}, header=true, all_varchar=true, " \
+                 f"delim={_quote_string(delimiter)}, quote='\"', escape='\"')"
+    else:
+        source = f'read_parquet({_quote_string(file_path)})'
+
+    na_values = ', '.join(_quote_string(na_value) for na_value in config.get_na_values())
+    filters = [f'{_quote_identifier(reference)} IS NOT NULL' for reference in references]
+    if na_values:
+        filters.extend(f'{_quote_identifier(reference)} NOT IN ({na_values})' for reference in references)
+
+    return f"SELECT DISTINCT * FROM (SELECT {', '.join(columns)} FROM {source}) WHERE {' AND '.join(filters)}"
+
+
+def _normalize_literal_datatype(reference_expression, datatype):
+    # same normalization as in the materializer, Natural Mapping of SQL Values
+    if datatype == XSD_BOOLEAN:
+        # lowercasing of non-ASCII characters in DuckDB is not the same as in Python
+        return f'lower_literal({reference_expression})'
+    elif datatype == XSD_DATETIME:
+        return f"replace({reference_expression}, ' ', 'T')"
+    elif datatype == XSD_INTEGER or datatype == XSD_NONNEGATIVEINTEGER:
+        return f'CAST(CAST(trunc(CAST({reference_expression} AS DOUBLE)) AS BIGINT) AS VARCHAR)'
+
+    return reference_expression
+
+
+def _get_term_expression(template, expression_type, table_alias, termtype='', datatype=''):
+    """
+    Builds the SQL expression generating the terms of a term map, equivalent to `_materialize_template` in the
+    materializer.
+    """
+
+    compiled_template = compile_template(template, expression_type)
+
+    if termtype.strip() == RML_IRI:
+        prefix, suffix = '<', '>'
+    elif termtype.strip() == RML_BLANK_NODE:
+        prefix, suffix = '_:', ''
+    elif termtype.strip() == RML_LITERAL:
+        prefix, suffix = '"', '"'
+    else:
+        prefix, suffix = '', ''
+
+    segments = list(compiled_template.segments)
+    segments[0] = prefix + segments[0]
+    segments[-1] = segments[-1] + suffix
+
+    expression = [_quote_string(segments[0])]
+    for reference, segment in zip(compiled_template.references, segments[1:]):
+        reference_expression = f'{table_alias}.{_quote_identifier(reference)}'
+        if termtype.strip() == RML_IRI and expression_type == RML_TEMPLATE:
+            reference_expression = f'percent_encode({reference_expression})'
+        elif termtype.strip() == RML_LITERAL:
+            reference_expression = f'escape_literal({_normalize_literal_datatype(reference_expression, datatype)})'
+        expression.extend([reference_expression, _quote_string(segment)])
+
+    return ' || '.join(expression)
+
+
+def _get_triple_query(rml_rule, rml_df, config):
+    """
+    Compiles a mapping rule into a query that generates its triples (or quads) in a single column `triple`.
+    """
+
+    references, parent_references = _get_references(rml_rule, rml_df, config)
+
+    subject_term = _get_term_expression(rml_rule['subject_map_value'], rml_rule['subject_map_type'], 'child',
+                                        termtype=rml_rule['subject_termtype'])
+    predicate_term = _get_term_expression(rml_rule['predicate_map_value'], rml_rule['predicate_map_type'], 'child',
+                                          termtype=RML_IRI)
+
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+        parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+        child_join_references, parent_join_references = get_references_in_join_condition(rml_rule,
+                                                                                         'object_join_conditions')
+
+        object_term = _get_term_expression(parent_triples_map_rule['subject_map_value'],
+                                           parent_triples_map_rule['subject_map_type'], 'parent',
+                                           termtype=rml_rule['object_termtype'])
+        join_conditions = [f'child.{_quote_identifier(reference)} = parent.{_quote_identifier(parent_reference)}'
+                           for reference, parent_reference in zip(child_join_references, parent_join_references)]
+        from_clause = f'({_get_source_query(rml_rule, references, config)}) AS child JOIN ' \
+                      f'({_get_source_query(parent_triples_map_rule, parent_references, config)}) AS parent ' \
+                      f"ON {' AND '.join(join_conditions)}"
+    else:
+        object_term = _get_term_expression(rml_rule['object_map_value'], rml_rule['object_map_type'], 'child',
+                                           termtype=rml_rule['object_termtype'],
+                                           datatype=rml_rule['lang_datatype_map_value'])
+        from_clause = f'({_get_source_query(rml_rule, references, config)}) AS child'
+
+    if rml_rule['lang_datatype'] == RML_LANGUAGE_MAP:
+        language_term = _get_term_expression(rml_rule['lang_datatype_map_value'], rml_rule['lang_datatype_map_type'],
+                                             'child')
+        object_term = f"{object_term} || '@' || {language_term}"
+    elif rml_rule['lang_datatype'] == RML_DATATYPE_MAP:
+        datatype_term = _get_term_expression(rml_rule['lang_datatype_map_value'], rml_rule['lang_datatype_map_type'],
+                                             'child', termtype=RML_IRI)
+        object_term = f"{object_term} || '^^' || {datatype_term}"
+
+    triple = f"{subject_term} || ' ' || {predicate_term} || ' ' || {object_term}"
+    if config.get_output_format() == NQUADS:
+        if has_graph_map(rml_rule, config):
+            graph = _get_term_expression(rml_rule['graph_map_value'], rml_rule['graph_map_type'], 'child',
+                                         termtype=RML_IRI)
+        else:
+            graph = "''"
+        triple = f"{triple} || ' ' || {graph}"
+
+    return f'SELECT DISTINCT {triple} AS triple FROM {from_clause}'
+
+
+def _get_connection(config):
+    import pyarrow as pa
+
+    connection = duckdb.connect()
+
+    # the processes of the pool share the cores
+    threads = max(1, (os.cpu_count() or 1) // max(1, config.get_number_of_processes()))
+    connection.execute(f'SET threads TO {threads}')
+
+    # percent-encoding, escaping and lowercasing are evaluated in batches with the functions used by the pandas engine
+    safe = config.get_safe_percent_encoding() if config.get_safe_percent_encoding() else None
+    literal_escaping_chars = config.get_literal_escaping_chars()
+
+    def encode(values):
+        return pa.array(percent_encode(values.to_pandas().astype(object), safe=safe), type=pa.string())
+
+    def escape(values):
+        return pa.array(escape_literal(values.to_pandas().astype(object), literal_escaping_chars), type=pa.string())
+
+    connection.create_function('percent_encode', encode, [duckdb.string_type()], duckdb.string_type(), type='arrow')
+    connection.create_function('escape_literal', escape, [duckdb.string_type()], duckdb.string_type(), type='arrow')
+
+    def lower(values):
+        return pa.array(values.to_pandas().astype(object).str.lower(), type=pa.string())
+
+    connection.create_function('lower_literal', lower, [duckdb.string_type()], duckdb.string_type(), type='arrow')
+
+    return connection
+
+
+def materialize_rml_rule_with_duckdb(rml_rule, rml_df, config):
+    """
+    Generator of DataFrames with the triples of a mapping rule, in a column `triple`. The mapping rule is compiled into
+    a single SQL query (reading, null filtering, join with the parent triples map and term generation) that is
+    evaluated by DuckDB. If `chunk_size` is enabled in the config, the triples are fetched in Arrow batches of at most
+    `chunk_size` rows.
+    """
+
+    sql_query = _get_triple_query(rml_rule, rml_df, config)
+    LOGGER.debug(f"DuckDB query for mapping rule `{rml_rule['triples_map_id']}`: [{sql_query}]")
+
+    connection = _get_connection(config)
+    try:
+        relation = connection.sql(sql_query)
+        if config.get_chunk_size():
+            # `fetch_record_batch` and `fetch_arrow_reader` are deprecated in recent versions of DuckDB
+            to_arrow_reader = getattr(relation, 'to_arrow_reader', None) or relation.fetch_arrow_reader
+            for record_batch in to_arrow_reader(config.get_chunk_size()):
+                yield record_batch.to_pandas()
+        else:
+            yield relation.df()
+    finally:
+        connection.close()
@@ -0,0 +1,223 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import re
+import types
+
+import numpy as np
+import pandas as pd
+
+from functools import lru_cache
+from falcon.uri import encode_value
+
+from .utils import factorize_strings
+
+
+# RFC 3986 unreserved characters, these are never percent-encoded (neither by falcon nor by urllib.parse.quote)
+UNRESERVED_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~'
+
+# the compiled (Cython) version of falcon already checks whether a value needs to be encoded in C, in that case a
+# bulk check does not pay off
+FALCON_IS_COMPILED = not isinstance(encode_value, types.FunctionType)
+
+
+@lru_cache(maxsize=None)
+def _get_quote_encoder(safe):
+    """
+    Returns a function equivalent to `urllib.parse.quote(x, safe=safe)` for strings.
+    """
+
+    # as in urllib.parse.quote, non-ASCII safe characters are ignored
+    safe_bytes = (UNRESERVED_CHARS + safe).encode('ascii', 'ignore')
+    lookup = [chr(byte) if byte in safe_bytes else f'%{byte:02X}' for byte in range(256)]
+
+    def quote_value(value):
+        value = value.encode('utf-8', 'strict')
+        if not value.rstrip(safe_bytes):
+            return value.decode()
+        return ''.join(map(lookup.__getitem__, value))
+
+    return quote_value
+
+
+def _get_safe_pattern(allowed_chars):
+    allowed_chars_pattern = ''.join(re.escape(char) for char in sorted(set(allowed_chars)))
+    return f'^[{allowed_chars_pattern}]*$'
+
+
+def _is_safe(values, allowed_chars):
+    """
+    Returns a boolean array indicating the values that are only made of `allowed_chars`. None if pyarrow is not
+    available.
+    """
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ModuleNotFoundError:
+        return None
+
+    return pc.match_substring_regex(pa.array(values, type=pa.string()), _get_safe_pattern(allowed_chars)).to_numpy(
+        zero_copy_only=False)
+
+
+def _get_encoder(safe):
+    if safe is None:
+        return UNRESERVED_CHARS, encode_value
+
+    return UNRESERVED_CHARS + ''.join(char for char in safe if char.isascii()), _get_quote_encoder(safe)
+
+
+def _replace_values(values, mask, function):
+    """
+    Replaces the values of a pyarrow array of strings where `mask` is true with the result of `function`, which is
+    called once per distinct value.
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    masked_values = pc.filter(values, mask)
+    unique_values = pc.unique(masked_values)
+    replaced_values = pa.array([function(value) for value in unique_values.to_pylist()], type=pa.string())
+
+    return pc.replace_with_mask(values, mask, pc.take(replaced_values, pc.index_in(masked_values, unique_values)))
+
+
+def percent_encode(data_column, safe=None):
+    """
+    Percent-encodes the values of a column of strings. If `safe` is None the values are encoded with falcon's
+    `encode_value`, otherwise with `urllib.parse.quote` using the `safe` characters. The values that do not need to be
+    encoded are detected in bulk and only the rest are encoded, each distinct value once.
+    """
+
+    allowed_chars, encoder = _get_encoder(safe)
+
+    values = data_column.to_numpy(dtype=object)
+    is_safe = None
+    if len(values) and not (encoder is encode_value and FALCON_IS_COMPILED):
+        is_safe = _is_safe(values, allowed_chars)
+    if is_safe is None:
+        return pd.Series([encoder(value) for value in values], index=data_column.index, dtype=object)
+
+    if is_safe.all():
+        return data_column
+
+    encoded_values = values.copy()
+    codes, unique_values = factorize_strings(values[~is_safe])
+    encoded_values[~is_safe] = np.array([encoder(value) for value in unique_values], dtype=object)[codes]
+
+    return pd.Series(encoded_values, index=data_column.index, dtype=object)
+
+
+def percent_encode_arrow(values, safe=None):
+    """
+    Same as `percent_encode` for a pyarrow array of strings.
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+
+    allowed_chars, encoder = _get_encoder(safe)
+
+    is_unsafe = pc.invert(pc.match_substring_regex(values, _get_safe_pattern(allowed_chars)))
+    if not pc.any(is_unsafe).as_py():
+        return values
+
+    return _replace_values(values, is_unsafe, encoder)
+
+
+# see #321, ",\,\n,\r are always escaped
+ALWAYS_ESCAPED_CHARS = {'\\': '\\\\', '\n': '\\n', '\r': '\\r', '"': '\\"'}
+
+
+@lru_cache(maxsize=None)
+def _get_literal_escaping_table(literal_escaping_chars):
+    escaping_table = dict(ALWAYS_ESCAPED_CHARS)
+    for char in literal_escaping_chars:
+        if char and char not in escaping_table:
+            if char in ['\t', '\b', '\f']:
+                escaping_table[char] = f'\\{char}'
+            else:
+                escaping_table[char] = f'\\\\{char}'
+
+    # longest first, so that the longest escaping strings are matched
+    escaping_pattern = re.compile('|'.join(re.escape(char) for char in sorted(escaping_table, key=len, reverse=True)))
+
+    return escaping_pattern, escaping_table
+
+
+def escape_literal(data_column, literal_escaping_chars):
+    """
+    Escapes the values of a column of strings that are used as lexical forms of literals. All the characters are
+    replaced in a single pass with a compiled regex, and only for the values that contain some character to escape.
+    """
+
+    escaping_pattern, escaping_table = _get_literal_escaping_table(tuple(literal_escaping_chars))
+
+    needs_escaping = data_column.str.contains(escaping_pattern, regex=True).to_numpy(dtype=bool)
+    if not needs_escaping.any():
+        return data_column
+
+    def replace_match(match):
+        return escaping_table[match.group()]
+
+    escaped_values = data_column.to_numpy(dtype=object).copy()
+    escaped_values[needs_escaping] = [escaping_pattern.sub(replace_match, value)
+                                      for value in escaped_values[needs_escaping]]
+
+    return pd.Series(escaped_values, index=data_column.index, dtype=object)
+
+
+def escape_literal_arrow(values, literal_escaping_chars):
+    """
+    Same as `escape_literal` for a pyarrow array of strings.
+    """
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(values, pa.ChunkedArray):
+        values = values.combine_chunks()
+
+    escaping_pattern, escaping_table = _get_literal_escaping_table(tuple(literal_escaping_chars))
+
+    # the characters are written as hexadecimal escapes in the (RE2) pattern
+    arrow_escaping_pattern = '|'.join(''.join(f'\\x{{{ord(char):x}}}' for char in string)
+                                      for string in sorted(escaping_table, key=len, reverse=True))
+    needs_escaping = pc.match_substring_regex(values, arrow_escaping_pattern)
+    if not pc.any(needs_escaping).as_py():
+        return values
+
+    def replace_match(match):
+        return escaping_table[match.group()]
+
+    return _replace_values(values, needs_escaping, lambda value: escaping_pattern.sub(replace_match, value))
+
+
+def get_literal_escaping_replacements(literal_escaping_chars):
+    """
+    Returns the (character, escaping string) pairs of literal escaping in an order in which replacing them one after
+    the other (e.g., with SQL `REPLACE`) is equivalent to `escape_literal`. None if there is no such order.
+    """
+
+    _, escaping_table = _get_literal_escaping_table(tuple(literal_escaping_chars))
+
+    # the backslash goes first, a character must not appear in the escaping strings of the previous ones
+    chars = sorted(escaping_table, key=lambda char: char != '\\')
+    for i, char in enumerate(chars):
+        # letters are excluded as replacements can be case-insensitive in some databases
+        if len(char) != 1 or char.isalnum():
+            return None
+        if any(char in escaping_table[previous_char] for previous_char in chars[:i]):
+            return None
+
+    return [(char, escaping_table[char]) for char in chars]
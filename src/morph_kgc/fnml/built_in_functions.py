@@ -19,6 +19,9 @@ from ast import literal_eval
 from uuid import uuid4
 from falcon.uri import encode_value
 
+import numpy as np
+import pandas as pd
+
 
 bif_dict = {}
 
@@ -28,19 +31,85 @@ bif_dict = {}
 ##############################################################################
 
 
-def bif(fun_id, **params):
+def bif(fun_id, deterministic=True, **params):
     """
     We borrow the idea of using decorators from pyRML by Andrea Giovanni Nuzzolese.
+    Functions that can return different results for the same parameters (e.g., random numbers) must set
+    `deterministic=False`, so that they are executed for each row and their results are not cached.
     """
 
     def wrapper(funct):
-        bif_dict[fun_id] = {}
+        bif_dict.setdefault(fun_id, {})
         bif_dict[fun_id]['function'] = funct
         bif_dict[fun_id]['parameters'] = params
+        bif_dict[fun_id]['deterministic'] = deterministic
+        return funct
+    return wrapper
+
+
+def vectorized_bif(*fun_ids, constant_parameters=()):
+    """
+    Registers the vectorized implementation of built-in functions. It is called once for all the rows, with the same
+    parameters as the scalar function but as Series of strings (scalars for constants), and returns a Series with the
+    results. The parameters in `constant_parameters` must be constants. If it returns None the scalar function is
+    called for each row instead (e.g., for values that are not handled equally).
+    """
+
+    def wrapper(funct):
+        for fun_id in fun_ids:
+            bif_dict[fun_id]['vectorized_function'] = funct
+            bif_dict[fun_id]['constant_parameters'] = constant_parameters
         return funct
     return wrapper
 
 
+##############################################################################
+########################   VECTORIZED HELPERS   ##############################
+##############################################################################
+
+
+# number literals parsed equally by `literal_eval` and the conversions of pandas
+INTEGER_LITERAL_REGEX = r"[+-]?(0+|[1-9][0-9]{0,17})"
+FLOAT_LITERAL_REGEX = r"[+-]?([0-9]+\.[0-9]*|\.[0-9]+|([0-9]+(\.[0-9]*)?|\.[0-9]+)[eE][+-]?[0-9]+)"
+
+
+def _to_numbers(values):
+    """
+    Parses number literals as `literal_eval`, integers if all the values are integer literals and floats if all of
+    them are float literals. Returns None otherwise, e.g., mixed integers and floats (the scalar functions return
+    values of different types) or values raising errors.
+    """
+
+    if not isinstance(values, pd.Series):
+        values = pd.Series([values], dtype=object)
+
+    if values.str.fullmatch(INTEGER_LITERAL_REGEX).all():
+        return values.astype("int64")
+    elif values.str.fullmatch(FLOAT_LITERAL_REGEX).all():
+        return values.astype("float64")
+
+    return None
+
+
+def _to_integers(values):
+    # as `math.floor` and `math.ceil`, only for values that can be represented as 64-bit integers
+    if values.dtype == "int64":
+        return values
+    elif (values.abs() < 2 ** 63).all():
+        return values.astype("int64")
+
+    return None
+
+
+def _to_python_objects(values, index):
+    # the results of the scalar functions are Python objects (e.g., `int` instead of `numpy.int64`)
+    return pd.Series(np.asarray(values).tolist(), index=index, dtype=object)
+
+
+def _to_boolean_strings(values):
+    return values.map({True: "true", False: "false"}).astype(object)
+
+
 ##############################################################################
 ########################   ARRAY   ###########################################
 ##############################################################################
@@ -163,8 +232,8 @@ def array_uniques(array: list):
 def array_sort(array: list):
     if type(array) != list:
         return None
-    array.sort()
-    return array
+    # the list is not sorted in place, it can be shared by several rows
+    return sorted(array)
 
 
 ##############################################################################
@@ -263,6 +332,48 @@ def boolean_true(bool_input:list|str, bool_check:list|str=None):
 ##############################################################################
 
 
+# Map GREL format to Python format
+GREL_TO_PYTHON_FORMAT = {
+    "yyyy": "%Y",
+    "yy": "%y",
+    "MMMM": "%B",
+    "MMM": "%b",
+    "MM": "%m",
+    "dd": "%d",
+    "EEEE": "%A",
+    "EEE": "%a",
+    "HH": "%H",
+    "hh": "%I",
+    "mm": "%M",
+    "ss": "%S",
+    "a": "%p",
+    "Z": "%z",
+    "X": "%Z",
+    "SSS": "%f",
+}
+
+
+def _strptime_isoformat(string, format_code):
+    """
+    Vectorized `datetime.strptime(string, format_code).isoformat()`. Returns None for time zones, years before 1000
+    and fractions of seconds with more than 6 digits, which are not handled equally by pandas.
+    """
+
+    if "%z" in format_code or "%Z" in format_code:
+        return None
+
+    try:
+        dates = pd.to_datetime(string, format=format_code)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if (dates.dt.year < 1000).any() or (dates.dt.nanosecond != 0).any():
+        return None
+
+    # microseconds are only included if they are not zero, as in `isoformat`
+    iso_dates = dates.dt.strftime("%Y-%m-%dT%H:%M:%S")
+    return iso_dates.where(dates.dt.microsecond == 0, iso_dates + "." + dates.dt.strftime("%f"))
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#unicodestring-s",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -279,30 +390,18 @@ def string_unicode(string):
 def date_to_date(string, format_code):
     from datetime import datetime
 
-    # Map GREL format to Python format
-    grel_to_python_format = {
-        "yyyy": "%Y",
-        "yy": "%y",
-        "MMMM": "%B",
-        "MMM": "%b",
-        "MM": "%m",
-        "dd": "%d",
-        "EEEE": "%A",
-        "EEE": "%a",
-        "HH": "%H",
-        "hh": "%I",
-        "mm": "%M",
-        "ss": "%S",
-        "a": "%p",
-        "Z": "%z",
-        "X": "%Z",
-        "SSS": "%f",
-    }
-    for grel, py in grel_to_python_format.items():
+    for grel, py in GREL_TO_PYTHON_FORMAT.items():
         format_code = format_code.replace(grel, py)
     return datetime.strptime(string, format_code).isoformat()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#date_toDate", constant_parameters=("format_code",))
+def date_to_date_vectorized(string, format_code):
+    for grel, py in GREL_TO_PYTHON_FORMAT.items():
+        format_code = format_code.replace(grel, py)
+    return _strptime_isoformat(string, format_code)
+
+
 @bif(
     fun_id="https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#date_toDate",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -314,7 +413,13 @@ def date_to_python_date(string, format_code):
     return datetime.strptime(string, format_code).isoformat()
 
 
-@bif(fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#date_now")
+@vectorized_bif("https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#date_toDate",
+                constant_parameters=("format_code",))
+def date_to_python_date_vectorized(string, format_code):
+    return _strptime_isoformat(string, format_code)
+
+
+@bif(fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#date_now", deterministic=False)
 def date_now():
     return datetime.now().isoformat()
 
@@ -386,6 +491,39 @@ def date_diff(date, unit):
     return datetime.now().isoformat()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#date_datePart", constant_parameters=("unit",))
+def date_part_vectorized(date, unit):
+    date_parts = {
+        ("years", "year"): lambda dates: dates.dt.year,
+        ("months", "month"): lambda dates: dates.dt.month,
+        ("weeks", "week", "w"): lambda dates: (dates.dt.day - 1) // 7 + 1,
+        ("days", "day", "d"): lambda dates: dates.dt.day,
+        ("weekday",): lambda dates: dates.dt.strftime("%A"),
+        ("hours", "hour", "h"): lambda dates: dates.dt.hour,
+        ("minutes", "minute", "min"): lambda dates: dates.dt.minute,
+        ("seconds", "sec", "s"): lambda dates: dates.dt.second,
+        ("milliseconds", "ms", "S"): lambda dates: dates.dt.microsecond // 1000,
+        ("nanos", "nano", "n"): lambda dates: dates.dt.microsecond * 1000,
+    }
+    date_part = next((date_part for units, date_part in date_parts.items() if unit in units), None)
+    # only full dates, pandas and `datetime.fromisoformat` parse other ISO 8601 formats differently
+    if date_part is None or not date.str.match(r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?:$|[T ])").all():
+        return None
+
+    try:
+        dates = pd.to_datetime(date, format="ISO8601")
+    except (ValueError, TypeError, OverflowError):
+        # e.g., mixed time zones
+        return None
+    if not pd.api.types.is_datetime64_any_dtype(dates) or (dates.dt.nanosecond != 0).any():
+        return None
+    if dates.dt.tz is not None:
+        # as `date.replace(tzinfo=None)`, the local time is kept
+        dates = dates.dt.tz_localize(None)
+
+    return _to_python_objects(date_part(dates), dates.index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#date_inc",
     date="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_date_d",
@@ -441,6 +579,15 @@ def math_abs(value):
     return value
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_abs")
+def math_abs_vectorized(value):
+    numbers = _to_numbers(value)
+    if numbers is None:
+        return None
+    # -0.0 is returned as is
+    return _to_python_objects(np.where(numbers < 0, -numbers, numbers), numbers.index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_acos",
     value="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -569,6 +716,15 @@ def math_ceil(value):
     return math.ceil(value)
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_ceil")
+def math_ceil_vectorized(value):
+    numbers = _to_numbers(value)
+    if numbers is None:
+        return None
+    numbers = _to_integers(np.ceil(numbers) if numbers.dtype == "float64" else numbers)
+    return None if numbers is None else _to_python_objects(numbers, numbers.index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_combin",
     value="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_int_i",
@@ -605,6 +761,15 @@ def math_even(value):
     return math.floor(value) % 2 == 0
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_even")
+def math_even_vectorized(value):
+    numbers = _to_numbers(value)
+    if numbers is None:
+        return None
+    numbers = _to_integers(np.floor(numbers) if numbers.dtype == "float64" else numbers)
+    return None if numbers is None else _to_python_objects(numbers % 2 == 0, numbers.index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_odd",
     value="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -616,6 +781,15 @@ def math_odd(value):
     return math.floor(value) % 2 == 1
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_odd")
+def math_odd_vectorized(value):
+    numbers = _to_numbers(value)
+    if numbers is None:
+        return None
+    numbers = _to_integers(np.floor(numbers) if numbers.dtype == "float64" else numbers)
+    return None if numbers is None else _to_python_objects(numbers % 2 == 1, numbers.index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_exp",
     value="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -761,6 +935,17 @@ def math_mod(value, value2):
     return value % value2
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_mod")
+def math_mod_vectorized(value, value2):
+    numbers, numbers2 = _to_numbers(value), _to_numbers(value2)
+    if numbers is None or numbers2 is None or numbers.dtype != "int64" or numbers2.dtype != "int64" or \
+            (numbers2 == 0).any():
+        return None
+    index = value.index if isinstance(value, pd.Series) else value2.index
+    # the sign of the result is the one of the divisor in both numpy and Python
+    return _to_python_objects(np.mod(numbers.to_numpy(), numbers2.to_numpy()), index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_pow",
     value="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -812,6 +997,16 @@ def number_max(number, number2):
     return number2 if number2 > number else number
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_max")
+def number_max_vectorized(number, number2):
+    numbers, numbers2 = _to_numbers(number), _to_numbers(number2)
+    if numbers is None or numbers2 is None or numbers.dtype != numbers2.dtype:
+        return None
+    index = number.index if isinstance(number, pd.Series) else number2.index
+    numbers, numbers2 = numbers.to_numpy(), numbers2.to_numpy()
+    return _to_python_objects(np.where(numbers2 > numbers, numbers2, numbers), index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_min",
     number="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -830,6 +1025,16 @@ def number_min(number, number2):
     return number2 if number2 < number else number
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_min")
+def number_min_vectorized(number, number2):
+    numbers, numbers2 = _to_numbers(number), _to_numbers(number2)
+    if numbers is None or numbers2 is None or numbers.dtype != numbers2.dtype:
+        return None
+    index = number.index if isinstance(number, pd.Series) else number2.index
+    numbers, numbers2 = numbers.to_numpy(), numbers2.to_numpy()
+    return _to_python_objects(np.where(numbers2 < numbers, numbers2, numbers), index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_floor",
     number="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -841,6 +1046,15 @@ def number_floor(number):
     return math.floor(number)
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_floor")
+def number_floor_vectorized(number):
+    numbers = _to_numbers(number)
+    if numbers is None:
+        return None
+    numbers = _to_integers(np.floor(numbers) if numbers.dtype == "float64" else numbers)
+    return None if numbers is None else _to_python_objects(numbers, numbers.index)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_radians",
     number="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_dec_n",
@@ -856,6 +1070,7 @@ def number_radians(number):
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#math_randomNumber",
     start="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_int_i",
     end="http://users.ugent.be/~bjdmeest/function/grel.ttl#p_int_i2",
+    deterministic=False,
 )
 def number_radians(start="0", end="1"):
     try:
@@ -878,6 +1093,24 @@ def number_round(number):
     return str(round(float(number)))
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#math_round")
+def number_round_vectorized(number):
+    has_comma, has_dot = number.str.contains(",", regex=False), number.str.contains(".", regex=False)
+    number = number.where(~(has_comma & has_dot), number.str.replace(",", "", regex=False))
+    number = number.where(~(has_comma & ~has_dot), number.str.replace(",", ".", regex=False))
+    try:
+        # the strings are converted with `float`
+        numbers = number.astype("float64")
+    except ValueError:
+        return None
+    if not np.isfinite(numbers).all():
+        return None
+
+    # `round` and `numpy.rint` round half to even
+    numbers = _to_integers(np.rint(numbers))
+    return None if numbers is None else numbers.astype(str).astype(object)
+
+
 ##############################################################################
 ########################   STRING   ##########################################
 ##############################################################################
@@ -1007,6 +1240,11 @@ def string_length(string):
     return str(len(string))
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_length")
+def string_length_vectorized(string):
+    return string.str.len().astype(str).astype(object)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_splitByLengths",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1042,6 +1280,13 @@ def string_split(string, separator=None):
     return string.split(separator)
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_split", "http://users.ugent.be/~bjdmeest/function/grel.ttl#string_smartSplit", constant_parameters=("separator",))
+def string_split_vectorized(string, separator=None):
+    if not separator:
+        return None
+    return string.str.split(separator, regex=False)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_substring",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1057,6 +1302,13 @@ def string_sub_string(string, param_int_i_from, param_int_i_opt_to=None):
     return string[param_int_i_from:param_int_i_opt_to]
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_substring", constant_parameters=("param_int_i_from", "param_int_i_opt_to"))
+def string_sub_string_vectorized(string, param_int_i_from, param_int_i_opt_to=None):
+    param_int_i_from = int(param_int_i_from)
+    param_int_i_opt_to = int(param_int_i_opt_to) if param_int_i_opt_to else None
+    return string.str.slice(param_int_i_from, param_int_i_opt_to)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_splitByCharType",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1106,6 +1358,11 @@ def string_contains(string, substring):
     return str(substring in string).lower()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_contains", constant_parameters=("substring",))
+def string_contains_vectorized(string, substring):
+    return _to_boolean_strings(string.str.contains(substring, regex=False))
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_chomp",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1119,6 +1376,13 @@ def string_contains(string: str, separator: str):
     )
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_chomp", constant_parameters=("separator",))
+def string_chomp_vectorized(string, separator):
+    if not separator:
+        return string
+    return string.where(~string.str.endswith(separator), string.str[:-len(separator)])
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#reverse",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1127,6 +1391,11 @@ def reverse(string):
     return string[::-1]
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#reverse")
+def reverse_vectorized(string):
+    return string.str[::-1]
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_replace",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1143,6 +1412,12 @@ def string_replace(string, old_substring, new_substring):
     return string.replace(old_substring, new_substring)
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_replace", "http://users.ugent.be/~bjdmeest/function/grel.ttl#string_replaceChars",
+                constant_parameters=("old_substring", "new_substring"))
+def string_replace_vectorized(string, old_substring, new_substring):
+    return string.str.replace(old_substring, new_substring, regex=False)
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_match",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1167,6 +1442,12 @@ def string_concat(string1, string2, separator=""):
     return f"{string1}{separator}{string2}"
 
 
+@vectorized_bif("https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#concat",
+                constant_parameters=("separator",))
+def string_concat_vectorized(string1, string2, separator=""):
+    return string1 + separator + string2
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_trim",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1184,6 +1465,11 @@ def string_starts_with(string: str, substring: str):
     return str(string.startswith(substring)).lower()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_startsWith", constant_parameters=("substring",))
+def string_starts_with_vectorized(string, substring):
+    return _to_boolean_strings(string.str.startswith(substring))
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_endsWith",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1193,6 +1479,11 @@ def string_ends_with(string: str, substring: str):
     return str(string.endswith(substring)).lower()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_endsWith", constant_parameters=("substring",))
+def string_ends_with_vectorized(string, substring):
+    return _to_boolean_strings(string.str.endswith(substring))
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_trim",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1201,6 +1492,11 @@ def string_trim(string: str):
     return string.strip()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_trim")
+def string_trim_vectorized(string):
+    return string.str.strip()
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#toLowerCase",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1209,6 +1505,11 @@ def to_lower_case(string):
     return string.lower()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#toLowerCase")
+def to_lower_case_vectorized(string):
+    return string.str.lower()
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#toUpperCase",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1217,6 +1518,11 @@ def to_upper_case(string):
     return string.upper()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#toUpperCase")
+def to_upper_case_vectorized(string):
+    return string.str.upper()
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_toTitlecase",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1225,6 +1531,11 @@ def to_title_case(string: str):
     return string.title()
 
 
+@vectorized_bif("http://users.ugent.be/~bjdmeest/function/grel.ttl#string_toTitlecase")
+def to_title_case_vectorized(string):
+    return string.str.title()
+
+
 @bif(
     fun_id="http://users.ugent.be/~bjdmeest/function/grel.ttl#string_md5",
     string="http://users.ugent.be/~bjdmeest/function/grel.ttl#valueParameter",
@@ -1324,7 +1635,8 @@ def to_upper_case_url(url):
 
 
 @bif(
-    fun_id="https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#uuid"
+    fun_id="https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#uuid",
+    deterministic=False,
 )
 def uuid():
     return str(uuid4())
@@ -1346,3 +1658,11 @@ def coalesce(p_any_rep_element):
 )
 def string_split_explode(string, separator):
     return string.split(separator)
+
+
+@vectorized_bif("https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#string_split_explode",
+                constant_parameters=("separator",))
+def string_split_explode_vectorized(string, separator):
+    if not separator:
+        return None
+    return string.str.split(separator, regex=False)
@@ -6,20 +6,28 @@ __maintainer__ = "Julián Arenas-Guerrero"
 __email__ = "arenas.guerrero.julian@outlook.com"
 
 
+import numpy as np
 import pandas as pd
 
 from .built_in_functions import bif_dict
-from ..utils import get_fnml_execution, remove_null_values_from_dataframe, get_references_in_template
+from .function_cache import FUNCTION_CACHE
+from ..utils import get_fnml_execution, remove_null_values_from_dataframe, factorize_strings
+from ..template import compile_template
 from ..constants import RML_EXECUTION, RML_TEMPLATE, RML_CONSTANT
 
 
+# results not cached in the function cache
+_MISSING_RESULT = object()
+
+# user-defined functions can be stateful or non-deterministic, they are only memoized with `deterministic=True`
 UDF_DICT_DECORATOR_CODE = """
 udf_dict = {}
-def udf(fun_id, **params):
+def udf(fun_id, deterministic=False, **params):
     def wrapper(funct):
         udf_dict[fun_id] = {}
         udf_dict[fun_id]['function'] = funct
         udf_dict[fun_id]['parameters'] = params
+        udf_dict[fun_id]['deterministic'] = deterministic
         return funct
     return wrapper
 """
@@ -60,28 +68,162 @@ def load_udfs(config):
 
 
 def _materialize_fnml_template(data, template):
-    # TODO: this function is very similar to _materialize_template in materializer
-    references = get_references_in_template(template)
+    return compile_template(template, RML_TEMPLATE).materialize(data)
+
+
+def _get_fnml_parameter_values(data, value_type, value):
+    """
+    Returns the values of a parameter of a function execution, a scalar for constants and a Series otherwise.
+    """
+
+    if value_type == RML_CONSTANT:
+        return value
+    elif value_type == RML_TEMPLATE:
+        return _materialize_fnml_template(data, value)
+
+    # RML_REFERENCE or RML_EXECUTION
+    return data[value]
+
+
+def _is_vectorized_execution(function_dict, function_params):
+    """
+    Checks whether a function can be executed with its vectorized implementation: every parameter takes a single
+    value, some of them is not constant, the constant parameters of the implementation are constants and the rest of
+    values are strings.
+    """
+
+    if 'vectorized_function' not in function_dict or \
+            not any(isinstance(values[0], pd.Series) for values in function_params.values()):
+        # functions with constant parameters only are evaluated once per row (e.g., uuid)
+        return False
+
+    for function_parameter_name, values in function_params.items():
+        if len(values) != 1:
+            return False
+        elif isinstance(values[0], pd.Series):
+            if function_parameter_name in function_dict['constant_parameters'] or \
+                    pd.api.types.infer_dtype(values[0], skipna=False) not in ['string', 'empty']:
+                # e.g., lists returned by nested functions
+                return False
+
+    return True
+
+
+def _execute_function_by_row(function, function_params, number_of_rows):
+    """
+    Calls the function for each row. Constant parameters are repeated for every row, parameters that take several
+    values are passed as the list of values in the row.
+    """
+
+    if not function_params:
+        return [function() for _ in range(number_of_rows)]
+
+    param_columns = []
+    for values in function_params.values():
+        columns = [value.to_numpy(dtype=object) if isinstance(value, pd.Series) else [value] * number_of_rows
+                   for value in values]
+        param_columns.append(columns[0] if len(columns) == 1 else list(map(list, zip(*columns))))
+
+    function_parameter_names = list(function_params)
+    return [function(**dict(zip(function_parameter_names, row_params))) for row_params in zip(*param_columns)]
+
+
+def _execute_function(function_dict, function_params, number_of_rows):
+    """
+    Executes a function for `number_of_rows` rows, with its vectorized implementation if possible and for each row
+    otherwise.
+    """
+
+    if _is_vectorized_execution(function_dict, function_params):
+        exec_res = function_dict['vectorized_function'](
+            **{function_parameter_name: values[0] for function_parameter_name, values in function_params.items()})
+        if isinstance(exec_res, pd.Series):
+            # results are assigned by position, the index of the data can have duplicated labels
+            return exec_res.to_numpy(dtype=object)
+        elif exec_res is not None:
+            # constant result
+            return [exec_res] * number_of_rows
+
+    return _execute_function_by_row(function_dict['function'], function_params, number_of_rows)
+
+
+def _is_memoizable_execution(function_params):
+    # the values of the parameters must be hashable, e.g., not lists returned by nested functions
+    return all(pd.api.types.infer_dtype(value, skipna=False) in ['string', 'empty']
+               for values in function_params.values() for value in values if isinstance(value, pd.Series))
 
-    # Curly braces that do not enclose column names MUST be escaped by a backslash character (“\”).
-    # This also applies to curly braces within column names.
-    template = template.replace('\\{', '{').replace('\\}', '}')
 
-    # use auxiliary column to store the data of the template
-    data['aux_fnml_template_data'] = ''
+def _factorize_function_params(function_params, number_of_rows):
+    """
+    Assigns a code to each distinct combination of values of the parameters. Returns the code of each row and the
+    position of the first row with each code.
+    """
+
+    row_codes = np.zeros(number_of_rows, dtype=np.int64)
+    for values in function_params.values():
+        for value in values:
+            if isinstance(value, pd.Series):
+                value_codes, value_uniques = factorize_strings(value.to_numpy(dtype=object))
+                # codes are compacted after each parameter to avoid overflows
+                row_codes, _ = pd.factorize(row_codes * len(value_uniques) + value_codes)
 
-    for reference in references:
-        data['reference_results'] = data[reference]
+    # codes are assigned in order of appearance
+    _, first_positions = np.unique(row_codes, return_index=True)
 
-        splitted_template = template.split('{' + reference + '}')
-        data['aux_fnml_template_data'] = data['aux_fnml_template_data'] + splitted_template[0] + data[
-            'reference_results']
-        template = str('{' + reference + '}').join(splitted_template[1:])
-    if template:
-        # add what remains in the template after the last reference
-        data['aux_fnml_template_data'] = data['aux_fnml_template_data'] + template
+    return row_codes, first_positions
 
-    return data['aux_fnml_template_data']
+
+def _execute_memoized_function(function_id, function_dict, function_params, number_of_rows, config):
+    """
+    Executes a deterministic function once for each distinct combination of values of the parameters and broadcasts
+    the results to the rows. Results are looked up in and added to the function cache of the process.
+    """
+
+    if number_of_rows == 0:
+        return []
+
+    row_codes, first_positions = _factorize_function_params(function_params, number_of_rows)
+    number_of_unique_rows = len(first_positions)
+    unique_function_params = {
+        function_parameter_name: [value.iloc[first_positions].reset_index(drop=True) if isinstance(value, pd.Series)
+                                  else value for value in values]
+        for function_parameter_name, values in function_params.items()}
+
+    unique_results = np.empty(number_of_unique_rows, dtype=object)
+    FUNCTION_CACHE.set_max_size(config.get_fnml_cache_size())
+    if FUNCTION_CACHE.max_size:
+        # the number of values of each parameter is part of the key, parameters can take several values
+        key_columns = [value.to_numpy(dtype=object) if isinstance(value, pd.Series) else
+                       [value] * number_of_unique_rows for values in unique_function_params.values() for value in values]
+        function_key = (function_id, tuple((function_parameter_name, len(values)) for function_parameter_name, values
+                                           in unique_function_params.items()))
+        keys = [(function_key, row_values) for row_values in zip(*key_columns)] if key_columns else \
+            [(function_key, ())]
+
+        missing_positions = []
+        for position, key in enumerate(keys):
+            result = FUNCTION_CACHE.get(key, _MISSING_RESULT)
+            if result is _MISSING_RESULT:
+                missing_positions.append(position)
+            else:
+                unique_results[position] = result
+
+        if missing_positions:
+            missing_function_params = {
+                function_parameter_name: [value.iloc[missing_positions].reset_index(drop=True)
+                                          if isinstance(value, pd.Series) else value for value in values]
+                for function_parameter_name, values in unique_function_params.items()}
+            missing_results = _execute_function(function_dict, missing_function_params, len(missing_positions))
+            for position, result in zip(missing_positions, missing_results):
+                unique_results[position] = result
+                FUNCTION_CACHE.put(keys[position], result)
+    else:
+        for position, result in enumerate(_execute_function(function_dict, unique_function_params,
+                                                             number_of_unique_rows)):
+            unique_results[position] = result
+
+    # Python objects are assigned as with the execution for each row
+    return unique_results[row_codes].tolist()
 
 
 def execute_fnml(data:pd.DataFrame, fnml_df: pd.DataFrame, fnml_execution:dict, config, in_recursion=False):
@@ -100,7 +242,10 @@ def execute_fnml(data:pd.DataFrame, fnml_df: pd.DataFrame, fnml_execution:dict,
         - Supports functions with multiple parameters that need to be aggregated into arrays.
         - Dynamically loads user-defined functions (UDFs) if the function ID is not a built-in function.
         - Prepares function parameters based on their mapping type (e.g., constant, template, reference, or execution).
-        - Executes the specified function for each row of the input data.
+        - Executes the specified function for each row of the input data, or once for all the rows with the
+          vectorized implementation of built-in functions that have one.
+        - Deterministic functions are executed once per distinct combination of parameter values, and their
+          results can be reused from the function cache of the process.
         - Removes null values from the resulting DataFrame and optionally explodes list values for outer functions.
     Raises:
         KeyError: If a required function or parameter is not found in the mappings or configuration.
@@ -126,50 +271,26 @@ def execute_fnml(data:pd.DataFrame, fnml_df: pd.DataFrame, fnml_execution:dict,
             parameter_to_value_type_dict[param] = fnml_df[(fnml_df.function_execution == fnml_execution) & (fnml_df.parameter_map_value == param)].value_map_type.to_list()
     # prepare function and execute
     if function_id in bif_dict:
-        function = bif_dict[function_id]['function']
-        function_decorator_parameters = bif_dict[function_id]['parameters']
+        function_dict = bif_dict[function_id]
     else:
         user_defined_functions = load_udfs(config)
-        function = user_defined_functions[function_id]['function']
-        function_decorator_parameters = user_defined_functions[function_id]['parameters']
-    function_param_array = []
-    for function_parameter_name, function_parameter_value in function_decorator_parameters.items():       
-        if function_parameter_value in parameter_to_value_type_dict:
-            for i in range(len(parameter_to_value_value_dict[function_parameter_value])):
-                tmp_functionparameter_dict = {}
-                if parameter_to_value_type_dict[function_parameter_value][i] == RML_CONSTANT:
-                    tmp_functionparameter_dict.update({function_parameter_name : [parameter_to_value_value_dict[function_parameter_value][i]] * len(data)})
-                elif parameter_to_value_type_dict[function_parameter_value][i] == RML_TEMPLATE:
-                    fnml_template_data = _materialize_fnml_template(data, parameter_to_value_value_dict[function_parameter_value][i])
-                    tmp_functionparameter_dict.update({function_parameter_name : list(fnml_template_data)})
-                else:
-                    # RML_REFERENCE or RML_EXECUTION
-                    tmp_functionparameter_dict.update({function_parameter_name: list(data[parameter_to_value_value_dict[function_parameter_value][i]])})
-                if i in range(len(function_param_array)):
-                    function_param_array[i].update(tmp_functionparameter_dict)
-                else:
-                    function_param_array.append(tmp_functionparameter_dict)
-
-                
-    # Previously, we worked with arrays to enable an input of various heterogenous array values in the input.
-    # Now, we restructure it to the previous array structure to enable the use of the function in the same way as before.
+        function_dict = user_defined_functions[function_id]
+    function_decorator_parameters = function_dict['parameters']
+
+    # values of the parameters of the function, a parameter can take several values (e.g., array parameters)
     function_params = {}
-    if len(function_param_array)> 0:
-        for key in function_param_array[0]:
-            restructured_innerarray = []
-            for j in range(len(function_param_array[0][key])):
-                restructured_inner2array = []
-                for i in range(len(function_param_array)):
-                    restructured_inner2array.append(function_param_array[i][key][j])
-                restructured_innerarray.append(restructured_inner2array if len(restructured_inner2array) > 1 else restructured_inner2array[0])
-            function_params[key] = restructured_innerarray
-    exec_res = []
-    for i in range(len(data)):
-        exec_params = {}
-        for function_parameter_name, function_parameter_value in function_params.items():
-            exec_params[function_parameter_name] = function_parameter_value[i]
-        exec_res.append(function(**exec_params))
+    for function_parameter_name, function_parameter_value in function_decorator_parameters.items():
+        if function_parameter_value in parameter_to_value_type_dict:
+            function_params[function_parameter_name] = [
+                _get_fnml_parameter_values(data, value_type, value) for value_type, value in
+                zip(parameter_to_value_type_dict[function_parameter_value],
+                    parameter_to_value_value_dict[function_parameter_value])]
 
+    if config.fnml_memoization() and function_dict.get('deterministic', False) and \
+            _is_memoizable_execution(function_params):
+        exec_res = _execute_memoized_function(function_id, function_dict, function_params, len(data), config)
+    else:
+        exec_res = _execute_function(function_dict, function_params, len(data))
     data[fnml_execution] = exec_res
 
     # TODO: this can be avoided for many built-in functions and also UDFs with a special parameter
@@ -0,0 +1,50 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+from collections import OrderedDict
+
+
+class FunctionCache:
+    """
+    Per-process cache of the results of deterministic functions, shared by the function executions of all the mapping
+    rules. Keys identify the function and the values of its parameters. Entries are evicted in LRU order to keep at
+    most `max_size` results.
+    """
+
+    def __init__(self, max_size=0):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def set_max_size(self, max_size):
+        self.max_size = max_size
+        self._evict()
+
+    def get(self, key, default=None):
+        if key not in self.entries:
+            return default
+
+        self.entries.move_to_end(key)
+        return self.entries[key]
+
+    def put(self, key, result):
+        if not self.max_size:
+            return
+
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries = OrderedDict()
+
+
+FUNCTION_CACHE = FunctionCache()
@@ -0,0 +1,203 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pickle
+import shutil
+import logging
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .constants import *
+from .utils import get_references_in_join_condition
+
+
+LOGGER = logging.getLogger(LOGGING_NAMESPACE)
+
+
+def _get_join_keys(data, join_references):
+    """
+    Returns an index with the values of the join references of the rows in `data`.
+    """
+
+    if len(join_references) == 1:
+        return pd.Index(data[join_references[0]].to_numpy(dtype=object), dtype=object)
+
+    return pd.MultiIndex.from_arrays([data[reference].to_numpy(dtype=object) for reference in join_references])
+
+
+def _take_joined_rows(data, parent_data, positions, parent_positions):
+    data = data.iloc[positions].reset_index(drop=True)
+    parent_data = parent_data.iloc[parent_positions].reset_index(drop=True)
+
+    return pd.concat([data, parent_data], axis=1)
+
+
+def _hash_join(probe_keys, build_keys):
+    """
+    Joins two sides whose build side has unique keys. The build side is indexed once and probed with the keys of the
+    other side. Returns the positions of the matching rows in the probe side and in the build side.
+    """
+
+    build_positions = build_keys.get_indexer(probe_keys)
+    probe_positions = np.flatnonzero(build_positions >= 0)
+
+    return probe_positions, build_positions[probe_positions]
+
+
+def join_data(data, parent_data, rml_rule, join_condition):
+    """
+    Inner join of the data of a mapping rule with the data of the parent triples map of a referencing (or quoted) term
+    map. The columns of the parent are prefixed with `parent_`. The strategy depends on the cardinality of the join:
+    if the keys of one of the sides are unique (e.g., the parent is joined on its primary key) that side is the build
+    side of a hash join, otherwise (many-to-many joins) both sides are reduced to the keys in the other side before
+    merging them.
+    """
+
+    parent_data = parent_data.add_prefix('parent_')
+    child_join_references, parent_join_references = get_references_in_join_condition(rml_rule, join_condition)
+    parent_join_references = ['parent_' + reference for reference in parent_join_references]
+
+    child_keys = _get_join_keys(data, child_join_references)
+    parent_keys = _get_join_keys(parent_data, parent_join_references)
+
+    if parent_keys.is_unique:
+        LOGGER.debug(f'Hash join of mapping rule `{rml_rule["triples_map_id"]}` with the parent as build side.')
+        positions, parent_positions = _hash_join(child_keys, parent_keys)
+        return _take_joined_rows(data, parent_data, positions, parent_positions)
+    elif child_keys.is_unique:
+        LOGGER.debug(f'Hash join of mapping rule `{rml_rule["triples_map_id"]}` with the child as build side.')
+        parent_positions, positions = _hash_join(parent_keys, child_keys)
+        return _take_joined_rows(data, parent_data, positions, parent_positions)
+
+    # semi-join reduction, the rows without matches in the other side are discarded before the many-to-many join
+    parent_matches = parent_keys.isin(child_keys.unique())
+    if not parent_matches.all():
+        parent_data, parent_keys = parent_data[parent_matches], parent_keys[parent_matches]
+    child_matches = child_keys.isin(parent_keys.unique())
+    if not child_matches.all():
+        data = data[child_matches]
+
+    LOGGER.debug(f'Many-to-many join of mapping rule `{rml_rule["triples_map_id"]}` with {len(data)} child rows and '
+                 f'{len(parent_data)} parent rows after semi-join reduction.')
+
+    return data.merge(parent_data, how='inner', left_on=child_join_references, right_on=parent_join_references)
+
+
+class PartitionSpill:
+    """
+    Rows of one side of a partitioned join, hash-partitioned by the join keys into temporary files. The files are
+    written in Arrow IPC stream format if pyarrow is available, otherwise DataFrames are pickled one after the other.
+    """
+
+    def __init__(self, spill_dir, name, number_of_partitions):
+        self.partition_paths = [os.path.join(spill_dir, f'{name}_{partition}') for partition in range(number_of_partitions)]
+        self.writers = {}
+        self.schema = None
+        self.number_of_rows = 0
+
+    def _write(self, partition, data):
+        try:
+            import pyarrow as pa
+        except ModuleNotFoundError:
+            with open(self.partition_paths[partition], 'ab') as partition_file:
+                pickle.dump(data, partition_file, protocol=pickle.HIGHEST_PROTOCOL)
+            return
+
+        if self.schema is None:
+            # all the columns are strings after preprocessing the data
+            self.schema = pa.schema([(column, pa.string()) for column in data.columns])
+        if partition not in self.writers:
+            self.writers[partition] = pa.ipc.new_stream(self.partition_paths[partition], self.schema)
+        self.writers[partition].write_table(pa.Table.from_pandas(data, schema=self.schema, preserve_index=False))
+
+    def add(self, data, join_references):
+        """
+        Distributes the rows of `data` over the partitions by hashing the values of the `join_references`. Rows with
+        equal join values are written to the same partition regardless of the side of the join.
+        """
+
+        self.number_of_rows += len(data)
+        if data.empty:
+            return
+
+        join_keys = pd.DataFrame({i: data[reference].to_numpy(dtype=object)
+                                  for i, reference in enumerate(join_references)})
+        partitions = pd.util.hash_pandas_object(join_keys, index=False).to_numpy() % len(self.partition_paths)
+
+        for partition in np.unique(partitions):
+            self._write(partition, data[partitions == partition])
+
+    def finish_writing(self):
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+    def read(self, partition):
+        """
+        Returns the rows in a partition, or None if the partition is empty.
+        """
+
+        partition_path = self.partition_paths[partition]
+        if not os.path.exists(partition_path):
+            return None
+
+        try:
+            import pyarrow as pa
+        except ModuleNotFoundError:
+            partition_data = []
+            with open(partition_path, 'rb') as partition_file:
+                while True:
+                    try:
+                        partition_data.append(pickle.load(partition_file))
+                    except EOFError:
+                        break
+            return pd.concat(partition_data, ignore_index=True)
+
+        with pa.ipc.open_stream(partition_path) as reader:
+            return reader.read_all().to_pandas()
+
+
+def partitioned_join_data(data_chunks, parent_data_chunks, rml_rule, join_condition, number_of_partitions):
+    """
+    Grace hash join, for referencing object maps whose child and parent do not fit in memory. Both sides are read in
+    chunks and hash-partitioned by the join keys into temporary files. Then, the partitions are joined one by one with
+    `join_data`. Generator of DataFrames with the joined partitions.
+    """
+
+    child_join_references, parent_join_references = get_references_in_join_condition(rml_rule, join_condition)
+
+    spill_dir = tempfile.mkdtemp(prefix='morph_kgc_join_')
+    try:
+        child_spill = PartitionSpill(spill_dir, 'child', number_of_partitions)
+        for data in data_chunks:
+            child_spill.add(data, child_join_references)
+        child_spill.finish_writing()
+
+        parent_spill = PartitionSpill(spill_dir, 'parent', number_of_partitions)
+        for parent_data in parent_data_chunks:
+            parent_spill.add(parent_data, parent_join_references)
+        parent_spill.finish_writing()
+
+        LOGGER.debug(f'Partitioned join of mapping rule `{rml_rule["triples_map_id"]}` with '
+                     f'{child_spill.number_of_rows} child rows and {parent_spill.number_of_rows} parent rows in '
+                     f'{number_of_partitions} partitions.')
+
+        for partition in range(number_of_partitions):
+            data = child_spill.read(partition)
+            if data is None:
+                continue
+            parent_data = parent_spill.read(partition)
+            if parent_data is None:
+                continue
+
+            yield join_data(data, parent_data, rml_rule, join_condition)
+    finally:
+        shutil.rmtree(spill_dir, ignore_errors=True)
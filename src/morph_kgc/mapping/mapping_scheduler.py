@@ -0,0 +1,203 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import math
+import logging
+
+from ..constants import *
+from ..utils import get_rml_rule, get_references_in_term_map
+from ..data_source.source_cache import get_source_key
+from ..data_source.relational_db import estimate_sql_table_rows, get_sql_table_primary_key, get_sql_table_ranges
+
+
+LOGGER = logging.getLogger(LOGGING_NAMESPACE)
+
+# approximate size in bytes of a row of a relational table, it is used to compare the cost of tables and data files
+ESTIMATED_RDB_ROW_SIZE = 100
+
+
+def _get_sources_in_mapping_group(mapping_group_df, rml_df):
+    """
+    Retrieves the logical sources read by the mapping rules in a mapping group, including the ones of the parent
+    triples maps of referencing object maps and quoted triples maps.
+    """
+
+    sources = {}
+    for i, rml_rule in mapping_group_df.iterrows():
+        sources[get_source_key(rml_rule)] = rml_rule
+
+        for position in ['subject', 'object']:
+            if rml_rule[f'{position}_map_type'] in [RML_PARENT_TRIPLES_MAP, RML_QUOTED_TRIPLES_MAP]:
+                parent_triples_map_rule = get_rml_rule(rml_df, rml_rule[f'{position}_map_value'])
+                sources[get_source_key(parent_triples_map_rule)] = parent_triples_map_rule
+
+    return sources
+
+
+def estimate_source_size(rml_rule, config):
+    """
+    Estimates the size in bytes of the logical source of a mapping rule. For local data files it is the size of the
+    file, for relational tables it is estimated from the number of rows in the statistics of the DBMS (tables are not
+    scanned). 0 is returned for the rest of sources, their cost is estimated with the number of mapping rules.
+    """
+
+    if rml_rule['source_type'] in FILE_SOURCE_TYPES and rml_rule['logical_source_type'] == RML_SOURCE:
+        try:
+            return os.path.getsize(str(rml_rule['logical_source_value']).strip())
+        except OSError:
+            # e.g., remote files
+            pass
+    elif rml_rule['source_type'] == RDB:
+        number_of_rows = estimate_sql_table_rows(config, rml_rule)
+        if number_of_rows:
+            return number_of_rows * ESTIMATED_RDB_ROW_SIZE
+
+    return 0
+
+
+def _group_mapping_groups_by_source(mapping_groups_sources):
+    """
+    Groups the mapping groups that (transitively) share some logical source. Returns lists of indexes of mapping
+    groups.
+    """
+
+    # union-find over the mapping groups
+    parents = list(range(len(mapping_groups_sources)))
+
+    def find(i):
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    source_to_mapping_group = {}
+    for i, sources in enumerate(mapping_groups_sources):
+        for source in sources:
+            if source in source_to_mapping_group:
+                parents[find(i)] = find(source_to_mapping_group[source])
+            else:
+                source_to_mapping_group[source] = i
+
+    components = {}
+    for i in range(len(mapping_groups_sources)):
+        components.setdefault(find(i), []).append(i)
+
+    return list(components.values())
+
+
+def _shard_mapping_group(mapping_group_df, number_of_shards):
+    """
+    Splits a mapping group into shards. Each shard generates the triples whose subject hashes to it (see
+    `_filter_mapping_shard` in the materializer), hence the triples of different shards are disjoint.
+    Every shard reads the whole logical source and generates its subjects, only the rest of the terms are split. This
+    multiplies the reading of the source by the number of shards, hence it is only done if `shard_mapping_groups` is
+    enabled and the mapping group cannot be split into table ranges.
+    """
+
+    return [mapping_group_df.assign(mapping_shard=shard, number_of_mapping_shards=number_of_shards)
+            for shard in range(number_of_shards)]
+
+
+def _get_table_ranges(mapping_group_df, config):
+    """
+    Splits the relational table read by a mapping group into `table_partitions` ranges (see `get_sql_table_ranges`).
+    The ranges are materialized in different processes, hence their triples must be disjoint to be deduplicated
+    independently: all the mapping rules must read the table and have the same subject map, which must only reference
+    the primary key of the table (a single column). None is returned if the mapping group cannot be split.
+    """
+
+    rml_rule = mapping_group_df.iloc[0]
+    if rml_rule['source_type'] != RDB or rml_rule['logical_source_type'] != RML_TABLE_NAME or \
+            rml_rule['subject_map_type'] not in [RML_TEMPLATE, RML_REFERENCE]:
+        return None
+
+    if len({get_source_key(rml_rule) for i, rml_rule in mapping_group_df.iterrows()}) > 1 or \
+            len(mapping_group_df[['subject_map_type', 'subject_map_value', 'subject_termtype']].drop_duplicates()) > 1:
+        return None
+
+    primary_key = get_sql_table_primary_key(config, rml_rule)
+    if len(primary_key) != 1 or set(get_references_in_term_map(rml_rule, 'subject')) != set(primary_key):
+        return None
+
+    return get_sql_table_ranges(config, rml_rule, config.get_table_partitions())
+
+
+def _split_mapping_group_by_table_ranges(mapping_group_df, table_ranges):
+    """
+    Splits a mapping group into one mapping group for each range of its table. The mapping rules of each of them only
+    read the rows in the range (see `_build_sql_query`).
+    """
+
+    return [mapping_group_df.assign(sql_table_range=table_range) for table_range in table_ranges]
+
+
+def schedule_mapping_groups(mapping_groups, rml_df, config):
+    """
+    Splits the mapping groups into tasks, each task is a list of mapping groups that is materialized in the same
+    process. Mapping groups that read the same logical sources are assigned to the same task so that the sources are
+    read once (see the source cache). The cost of the tasks is estimated with the size of the sources they read and
+    their number of mapping rules. Mapping groups sharing sources are split over several tasks if they are too costly
+    for one process. If `table_partitions` is enabled, costly mapping groups reading a relational table are split into
+    ranges of the table, otherwise if `shard_mapping_groups` is enabled, costly mapping groups reading a single source
+    are split into shards. Tasks are returned sorted by estimated cost, so that the most costly ones are dispatched first.
+    """
+
+    if not mapping_groups:
+        return []
+
+    number_of_processes = config.get_number_of_processes()
+
+    mapping_groups_sources = [_get_sources_in_mapping_group(mapping_group, rml_df) for mapping_group in mapping_groups]
+    # with a single process there is nothing to balance, avoid querying the databases
+    source_sizes = {source: estimate_source_size(rml_rule, config) if number_of_processes > 1 else 0
+                    for sources in mapping_groups_sources for source, rml_rule in sources.items()}
+
+    def estimate_cost(mapping_group_indexes):
+        # each source is read once, every mapping rule adds a minimum cost to balance sources with unknown size
+        sources = set().union(*[mapping_groups_sources[i] for i in mapping_group_indexes])
+        number_of_rules = sum(len(mapping_groups[i]) for i in mapping_group_indexes)
+        return sum(source_sizes[source] for source in sources) + number_of_rules
+
+    target_cost = sum(estimate_cost([i]) for i in range(len(mapping_groups))) / number_of_processes
+
+    tasks = []
+    for component in _group_mapping_groups_by_source(mapping_groups_sources):
+        if len(component) > 1 and estimate_cost(component) > target_cost:
+            # too costly to be materialized in a single process
+            work_units = [[i] for i in component]
+        else:
+            work_units = [component]
+
+        for work_unit in work_units:
+            task = [mapping_groups[i].assign(estimated_cost=estimate_cost([i])) for i in work_unit]
+            task_cost = estimate_cost(work_unit)
+
+            number_of_shards = min(math.ceil(task_cost / target_cost), number_of_processes)
+            table_ranges = None
+            if config.get_table_partitions() and len(work_unit) == 1 and number_of_shards > 1:
+                table_ranges = _get_table_ranges(task[0], config)
+
+            if table_ranges:
+                for mapping_range in _split_mapping_group_by_table_ranges(task[0], table_ranges):
+                    tasks.append((task_cost / len(table_ranges),
+                                  [mapping_range.assign(estimated_cost=task_cost / len(table_ranges))]))
+            elif config.shard_mapping_groups() and len(work_unit) == 1 and \
+                    len(mapping_groups_sources[work_unit[0]]) == 1 and number_of_shards > 1:
+                for mapping_shard in _shard_mapping_group(task[0], number_of_shards):
+                    tasks.append((task_cost / number_of_shards,
+                                  [mapping_shard.assign(estimated_cost=task_cost / number_of_shards)]))
+            else:
+                tasks.append((task_cost, task))
+
+    tasks = sorted(tasks, key=lambda task: task[0], reverse=True)
+    for task_cost, task in tasks:
+        mapping_partitions = [mapping_group.iloc[0]['mapping_partition'] for mapping_group in task]
+        LOGGER.debug(f'Scheduled task with mapping groups {mapping_partitions} and estimated cost {task_cost}.')
+
+    return [task for _, task in tasks]
@@ -6,27 +6,32 @@ __maintainer__ = "Julián Arenas-Guerrero"
 __email__ = "arenas.guerrero.julian@outlook.com"
 
 
-from falcon.uri import encode_value
-from urllib.parse import quote
-
 from .utils import *
 from .constants import *
-from .data_source.relational_db import get_sql_data
+from .data_source.relational_db import get_sql_data, get_sql_join_data, is_supported_by_sql_pushdown, \
+    get_sql_pushdown_data, SQL_PUSHDOWN_TRIPLE_COLUMN
 from .data_source.property_graph_db import get_pg_data
 from .data_source.data_file import get_file_data
 from .data_source.python_data import get_ram_data
 from .data_source.http_api import get_http_api_data
+from .data_source.source_cache import SOURCE_CACHE
 from .fnml.fnml_executer import execute_fnml
+from .deduplication import get_deduplicator
+from .template import compile_template
+from .encoding import percent_encode, escape_literal
+from .join import join_data, partitioned_join_data
+from .duckdb_engine import is_supported_by_duckdb, materialize_rml_rule_with_duckdb
+from .arrow_engine import is_supported_by_arrow, materialize_rml_rule_with_arrow
 
 LOGGER = logging.getLogger(LOGGING_NAMESPACE)
 
-def _add_references_in_join_condition(rml_rule, references, parent_references):
-    references_join, parent_references_join = get_references_in_join_condition(rml_rule, 'object_join_conditions')
 
-    references.update(set(references_join))
-    parent_references.update(set(parent_references_join))
+def _to_str_column(data_column):
+    if data_column.dtype == object and pd.api.types.infer_dtype(data_column, skipna=False) in ['string', 'empty']:
+        # already made of Python strings (e.g., CSV files read as str)
+        return data_column
 
-    return references, parent_references
+    return data_column.map(str).astype(object, copy=False)
 
 
 def _preprocess_data(data, rml_rule, references, config):
@@ -35,14 +40,18 @@ def _preprocess_data(data, rml_rule, references, config):
         if config.get_db_url(rml_rule['source_name']).lower().startswith(ORACLE.lower()):
             data = normalize_oracle_identifier_casing(data, references)
 
-    # TODO: can this be removed?
-    data = data.map(str)
+    if references:
+        # only the referenced columns are needed to generate the triples
+        data = data[[reference for reference in dict.fromkeys(references) if reference in data.columns]]
+
+    # data to str, only the columns that are not already strings are converted
+    data = pd.DataFrame({column: _to_str_column(data[column]) for column in data.columns}, index=data.index, copy=False)
 
     data = remove_null_values_from_dataframe(data, config, references)
-    data = data.convert_dtypes(convert_boolean=False)
 
-    # data to str
-    data = data.astype(str)
+    if not references:
+        # null values are kept in the columns that are not referenced
+        data = data.convert_dtypes(convert_boolean=False).astype(str)
 
     # remove duplicates
     data = data.drop_duplicates()
@@ -50,23 +59,67 @@ def _preprocess_data(data, rml_rule, references, config):
     return data
 
 
-def _get_data(config, rml_rule, references, python_source=None):
+def _split_dataframe_into_chunks(data, chunk_size):
+    for i in range(0, max(len(data), 1), chunk_size):
+        yield data.iloc[i:i + chunk_size]
+
+
+def _read_data(config, rml_rule, references, python_source=None, chunk_size=0, filter_nulls=False):
     if rml_rule['source_type'] == RDB:
-        data = get_sql_data(config, rml_rule, references)
+        data = get_sql_data(config, rml_rule, references, chunk_size)
     elif rml_rule['source_type'] == 'HTTPAPI':
         data = get_http_api_data(config, rml_rule, references)
     elif rml_rule['source_type'] == PGDB:
         data = get_pg_data(config, rml_rule, references)
     elif rml_rule['source_type'] in FILE_SOURCE_TYPES:
-        data = get_file_data(rml_rule, references)
+        data = get_file_data(rml_rule, references, chunk_size, config.get_csv_reader(),
+                             config.get_na_values() if filter_nulls else ())
     elif rml_rule['source_type'] in IN_MEMORY_TYPES:
         data = get_ram_data(rml_rule, references, python_source)
 
+    if chunk_size and isinstance(data, pd.DataFrame):
+        # the reader does not support chunking, split the data so that the rest of the pipeline works in batches
+        data = _split_dataframe_into_chunks(data, chunk_size)
+
+    return data
+
+
+def _get_data(config, rml_rule, references, python_source=None):
+    # the data is read through the source cache, it is shared with other mapping rules and must not be modified (nulls
+    # in the references can only be discarded by the readers if the source cache is disabled)
+    data = SOURCE_CACHE.get_data(rml_rule, references, lambda references_to_read: _read_data(
+        config, rml_rule, references_to_read, python_source, filter_nulls=not config.get_source_cache_size()))
     data = _preprocess_data(data, rml_rule, references, config)
 
     return data
 
 
+def _get_chunk_size(rml_rule, config):
+    """
+    Number of rows of the batches in which the data of a mapping rule is processed. If `chunk_size` is not enabled,
+    relational sources with a `fetch_size` are streamed in batches of `fetch_size` rows.
+    """
+
+    if not config.get_chunk_size() and rml_rule['source_type'] == RDB:
+        return config.get_fetch_size(rml_rule['source_name'])
+
+    return config.get_chunk_size()
+
+
+def _get_data_chunks(config, rml_rule, references, python_source=None):
+    """
+    Generator of preprocessed DataFrames with at most `chunk_size` rows each (see `_get_chunk_size`).
+    """
+
+    chunk_size = _get_chunk_size(rml_rule, config)
+    if not chunk_size:
+        yield _get_data(config, rml_rule, references, python_source)
+        return
+
+    for data in _read_data(config, rml_rule, references, python_source, chunk_size, filter_nulls=True):
+        yield _preprocess_data(data, rml_rule, references, config)
+
+
 def _get_references_in_rml_rule(rml_rule, rml_df, fnml_df, only_subject_map=False):
     references = []
 
@@ -92,67 +145,62 @@ def _get_references_in_rml_rule(rml_rule, rml_df, fnml_df, only_subject_map=Fals
     return references
 
 
-def _materialize_template(results_df, template, expression_type, config, position, columns_alias='', termtype='', datatype=''):
-    if expression_type == RML_REFERENCE:
-        # convert RML reference to template
-        template = f'{{{template}}}'
+def _remove_non_printable_characters(data_column):
+    return data_column.apply(lambda x: remove_non_printable_characters(x))
 
-    references = get_references_in_template(template)
 
-    # Curly braces that do not enclose column names MUST be escaped by a backslash character (“\”).
-    # This also applies to curly braces within column names.
-    template = template.replace('\\{', '{').replace('\\}', '}')
-    # formatting according to the termtype is done at the end
-    results_df[position] = ''
+def _normalize_literal_datatype(data_column, datatype):
+    # Natural Mapping of SQL Values (https://www.w3.org/TR/r2rml/#natural-mapping)
+    if datatype == XSD_BOOLEAN:
+        return data_column.str.lower()
+    elif datatype == XSD_DATETIME:
+        return data_column.str.replace(' ', 'T', regex=False)
+    elif datatype == XSD_INTEGER or datatype == XSD_NONNEGATIVEINTEGER:
+        # Make integers not end with .0
+        return data_column.astype(float).astype(int).astype(str)
 
-    for reference in references:
-        results_df['reference_results'] = results_df[columns_alias + reference]
+    return data_column
 
-        if config.only_write_printable_characters():
-            results_df['reference_results'] = results_df['reference_results'].apply(
-                lambda x: remove_non_printable_characters(x))
 
-        if termtype.strip() == RML_IRI and expression_type == RML_TEMPLATE:
-            if config.get_safe_percent_encoding():
-                results_df['reference_results'] = results_df['reference_results'].apply(
-                    lambda x: quote(x, safe=config.get_safe_percent_encoding()))
-            else:
-                results_df['reference_results'] = results_df['reference_results'].apply(lambda x: encode_value(x))
-        elif termtype.strip() == RML_LITERAL:
-            if datatype == XSD_BOOLEAN:
-                results_df['reference_results'] = results_df['reference_results'].str.lower()
-            elif datatype == XSD_DATETIME:
-                results_df['reference_results'] = results_df['reference_results'].str.replace(' ', 'T', regex=False)
-            elif datatype == XSD_INTEGER or datatype == XSD_NONNEGATIVEINTEGER:
-                # Make integers not end with .0
-                results_df['reference_results'] = results_df['reference_results'].astype(float).astype(int).astype(str)
-
-            # TODO: this can be avoided for most cases (if '\\' in data_value) | contains pandas method
-            # see #321, ",\,\n,\r are always escaped
-            results_df['reference_results'] = results_df['reference_results'].str.replace('\\', '\\\\', regex=False).str.replace('\n', '\\n', regex=False).str.replace('\r', '\\r', regex=False).str.replace('"', '\\"', regex=False)
-            for char in config.get_literal_escaping_chars():
-                if char not in ['"', '\n', '\\', '\r']:
-                    if char in ['\n', '\r', '\t', '\b', '\f']:
-                        results_df['reference_results'] = results_df['reference_results'].str.replace(char, f'\\{char}', regex=False)
-                    else:
-                        results_df['reference_results'] = results_df['reference_results'].str.replace(char, f'\\\\{char}', regex=False)
-
-        splitted_template = template.split('{' + reference + '}')
-        results_df[position] = results_df[position] + splitted_template[0] + results_df['reference_results']
-        template = str('{' + reference + '}').join(splitted_template[1:])
-    if template:
-        # add what remains in the template after the last reference
-        results_df[position] = results_df[position] + template
+def _get_reference_encoders(config, expression_type, termtype, datatype):
+    """
+    Retrieves the functions that are applied to the values of the references of a term map before building the terms.
+    """
+
+    encoders = []
+
+    if config.only_write_printable_characters():
+        encoders.append(_remove_non_printable_characters)
+
+    if termtype.strip() == RML_IRI and expression_type == RML_TEMPLATE:
+        if config.get_safe_percent_encoding():
+            safe_percent_encoding = config.get_safe_percent_encoding()
+            encoders.append(lambda data_column: percent_encode(data_column, safe=safe_percent_encoding))
+        else:
+            encoders.append(percent_encode)
+    elif termtype.strip() == RML_LITERAL:
+        encoders.append(lambda data_column: _normalize_literal_datatype(data_column, datatype))
+        encoders.append(lambda data_column: escape_literal(data_column, config.get_literal_escaping_chars()))
+
+    return encoders
+
 
+def _materialize_template(results_df, template, expression_type, config, position, columns_alias='', termtype='', datatype=''):
+    compiled_template = compile_template(template, expression_type)
+    encoders = _get_reference_encoders(config, expression_type, termtype, datatype)
+
+    # formatting according to the termtype is done while building the terms
     if termtype.strip() == RML_IRI:
-        results_df[position] = '<' + results_df[position] + '>'
+        prefix, suffix = '<', '>'
     elif termtype.strip() == RML_BLANK_NODE:
-        results_df[position] = '_:' + results_df[position]
+        prefix, suffix = '_:', ''
     elif termtype.strip() == RML_LITERAL:
-        results_df[position] = '"' + results_df[position] + '"'
+        prefix, suffix = '"', '"'
     else:
         # this case is for language and datatype maps, do nothing
-        pass
+        prefix, suffix = '', ''
+
+    results_df[position] = compiled_template.materialize(results_df, encoders, columns_alias, prefix, suffix)
 
     return results_df
 
@@ -166,22 +214,8 @@ def _materialize_fnml_execution(results_df, fnml_execution, fnml_df, config, pos
         results_df[fnml_execution] = results_df[fnml_execution].apply(lambda x: remove_non_printable_characters(x))
 
     if termtype.strip() == RML_LITERAL:
-        # Natural Mapping of SQL Values (https://www.w3.org/TR/r2rml/#natural-mapping)
-        if datatype == XSD_BOOLEAN:
-            results_df[fnml_execution] = results_df[fnml_execution].str.lower()
-        elif datatype == XSD_DATETIME:
-            results_df[fnml_execution] = results_df[fnml_execution].str.replace(' ', 'T', regex=False)
-        # Make integers not end with .0
-        elif datatype == XSD_INTEGER or datatype == XSD_NONNEGATIVEINTEGER:
-            results_df[fnml_execution] = results_df[fnml_execution].astype(float).astype(int).astype(str)
-
-        results_df['reference_results'] = results_df['reference_results'].str.replace('\\', '\\\\', regex=False).str.replace('\n', '\\n', regex=False).str.replace('\r', '\\r', regex=False).str.replace('"', '\\"', regex=False)
-        for char in config.get_literal_escaping_chars():
-            if char not in ['"', '\n', '\\', '\r']:
-                if char in ['\n', '\r', '\t', '\b', '\f']:
-                    results_df['reference_results'] = results_df['reference_results'].str.replace(char, f'\\{char}', regex=False)
-                else:
-                    results_df['reference_results'] = results_df['reference_results'].str.replace(char, f'\\\\{char}', regex=False)
+        results_df[fnml_execution] = _normalize_literal_datatype(results_df[fnml_execution], datatype)
+        results_df[fnml_execution] = escape_literal(results_df[fnml_execution], config.get_literal_escaping_chars())
 
         results_df[position] = '"' + results_df[fnml_execution] + '"'
     elif termtype.strip() == RML_IRI:
@@ -194,13 +228,37 @@ def _materialize_fnml_execution(results_df, fnml_execution, fnml_df, config, pos
     return results_df
 
 
-def _materialize_rml_rule_terms(results_df, rml_rule, fnml_df, config, columns_alias=''):
+def _filter_mapping_shard(results_df, mapping_shard):
+    """
+    Keeps the rows whose subject hashes to the mapping shard. Equal triples have equal subjects, hence the triples
+    generated by the different shards of a mapping group are disjoint.
+    """
+
+    shard, number_of_shards = mapping_shard
+    subject_hashes = pd.util.hash_array(results_df['subject'].to_numpy(dtype=object), categorize=False)
+
+    return results_df[subject_hashes % number_of_shards == shard]
+
+
+def _get_mapping_shard(mapping_group_df):
+    if 'mapping_shard' in mapping_group_df.columns:
+        return mapping_group_df.iloc[0]['mapping_shard'], mapping_group_df.iloc[0]['number_of_mapping_shards']
+
+    return None
+
+
+def _materialize_rml_rule_terms(results_df, rml_rule, fnml_df, config, columns_alias='', mapping_shard=None):
     if rml_rule['subject_map_type'] in [RML_TEMPLATE, RML_CONSTANT, RML_REFERENCE]:
         results_df = _materialize_template(results_df, rml_rule['subject_map_value'], rml_rule['subject_map_type'], config, 'subject',
                                            termtype=rml_rule['subject_termtype'])
     elif rml_rule['subject_map_type'] == RML_EXECUTION:
         results_df = _materialize_fnml_execution(results_df, rml_rule['subject_map_value'], fnml_df, config, 'subject',
                                                  termtype=rml_rule['subject_termtype'])
+
+    if mapping_shard is not None:
+        # the rest of terms are only generated for the rows of the shard
+        results_df = _filter_mapping_shard(results_df, mapping_shard)
+
     if rml_rule['predicate_map_type'] in [RML_TEMPLATE, RML_CONSTANT, RML_REFERENCE]:
         results_df = _materialize_template(results_df, rml_rule['predicate_map_value'], rml_rule['predicate_map_type'], config, 'predicate', termtype=RML_IRI)
     elif rml_rule['predicate_map_type'] == RML_EXECUTION:
@@ -233,22 +291,82 @@ def _materialize_rml_rule_terms(results_df, rml_rule, fnml_df, config, columns_a
     return results_df
 
 
-def _merge_data(data, parent_data, rml_rule, join_condition):
-    parent_data = parent_data.add_prefix('parent_')
-    child_join_references, parent_join_references = get_references_in_join_condition(rml_rule, join_condition)
-    parent_join_references = ['parent_' + reference for reference in parent_join_references]
+def _get_parent_references(rml_rule, rml_df, fnml_df):
+    parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+    parent_references = set(
+        _get_references_in_rml_rule(parent_triples_map_rule, rml_df, fnml_df, only_subject_map=True))
 
-    # if there is only one join condition use join, otherwise use merge
-    if len(child_join_references) == 1:
-        data = data.set_index(child_join_references, drop=False)
-        parent_data = parent_data.set_index(parent_join_references, drop=False)
-        return data.join(parent_data, how='inner')
-    else:
-        return data.merge(parent_data, how='inner', left_on=child_join_references, right_on=parent_join_references)
+    # add references used in the join condition
+    _, parent_references_join = get_references_in_join_condition(rml_rule, 'object_join_conditions')
+    parent_references.update(parent_references_join)
+
+    return parent_references
+
+
+def _get_parent_data(rml_rule, rml_df, fnml_df, config, python_source=None):
+    parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+    parent_references = _get_parent_references(rml_rule, rml_df, fnml_df)
+
+    return _get_data(config, parent_triples_map_rule, parent_references, python_source)
+
+
+def _is_join_pushed_down(rml_rule, rml_df, fnml_df, config):
+    """
+    Referencing object maps whose logical source and the one of the parent triples map are in the same relational
+    database are joined by the database.
+    """
+
+    parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+    if rml_rule['source_type'] != RDB or parent_triples_map_rule['source_type'] != RDB or \
+            rml_rule['source_name'] != parent_triples_map_rule['source_name']:
+        return False
+    if rml_rule['logical_source_type'] not in [RML_TABLE_NAME, RML_QUERY] or \
+            parent_triples_map_rule['logical_source_type'] not in [RML_TABLE_NAME, RML_QUERY]:
+        return False
+    if not get_references_in_join_condition(rml_rule, 'object_join_conditions')[0]:
+        return False
+    if config.get_db_url(rml_rule['source_name']).lower().startswith(ORACLE.lower()):
+        # the casing of Oracle identifiers is normalized after reading the data
+        return False
+
+    # schema-qualified column names cannot be selected from the subqueries of the joint query
+    references = set(_get_references_in_rml_rule(rml_rule, rml_df, fnml_df))
+    references.update(_get_parent_references(rml_rule, rml_df, fnml_df))
+    return not any('.' in reference for reference in references)
+
+
+def _get_joined_data(config, rml_rule, references, rml_df, fnml_df, chunk_size=0):
+    """
+    Retrieves the data of a referencing object map joined with the data of its parent triples map by the relational
+    database. If `chunk_size` is provided, a generator of preprocessed DataFrames is returned.
+    """
+
+    parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+    parent_references = _get_parent_references(rml_rule, rml_df, fnml_df)
+    join_references = list(zip(*get_references_in_join_condition(rml_rule, 'object_join_conditions')))
+
+    data = get_sql_join_data(config, rml_rule, references, parent_triples_map_rule, parent_references,
+                             join_references, chunk_size)
+
+    joined_references = list(references) + ['parent_' + reference for reference in parent_references]
+    if chunk_size:
+        return (_preprocess_data(chunk, rml_rule, joined_references, config) for chunk in data)
+
+    return _preprocess_data(data, rml_rule, joined_references, config)
+
+
+def _is_constant_rml_rule(rml_rule):
+    return rml_rule['subject_map_type'] == RML_CONSTANT and rml_rule['predicate_map_type'] == RML_CONSTANT and \
+        rml_rule['object_map_type'] == RML_CONSTANT and rml_rule['graph_map_type'] == RML_CONSTANT
+
+
+def _is_quoted_rml_rule(rml_rule):
+    return rml_rule['subject_map_type'] == RML_QUOTED_TRIPLES_MAP or \
+        rml_rule['object_map_type'] == RML_QUOTED_TRIPLES_MAP
 
 
 def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_join_references=set(), nest_level=0,
-                          python_source=None):
+                          python_source=None, parent_data=None, joined_data=None, mapping_shard=None):
     references = set(_get_references_in_rml_rule(rml_rule, rml_df, fnml_df))
 
     references_subject_join, parent_references_subject_join = get_references_in_join_condition(rml_rule, 'subject_join_conditions')
@@ -256,12 +374,12 @@ def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_j
     references.update(parent_join_references)
 
     # handle the case in which all term maps are constant-valued
-    if rml_rule['subject_map_type'] == RML_CONSTANT and rml_rule['predicate_map_type'] == RML_CONSTANT and rml_rule['object_map_type'] == RML_CONSTANT and rml_rule['graph_map_type'] == RML_CONSTANT:
+    if _is_constant_rml_rule(rml_rule):
         # create a dataframe with 1 row
         data = pd.DataFrame({'placeholder': ['placeholder']})
-        data = _materialize_rml_rule_terms(data, rml_rule, fnml_df, config)
+        data = _materialize_rml_rule_terms(data, rml_rule, fnml_df, config, mapping_shard=mapping_shard)
 
-    elif rml_rule['subject_map_type'] == RML_QUOTED_TRIPLES_MAP or rml_rule['object_map_type'] == RML_QUOTED_TRIPLES_MAP:
+    elif _is_quoted_rml_rule(rml_rule):
         if data is None:
             data = _get_data(config, rml_rule, references, python_source)
 
@@ -272,7 +390,7 @@ def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_j
                 parent_data = _materialize_rml_rule(parent_triples_map_rule, rml_df, fnml_df, config,
                                                     parent_join_references=parent_references_subject_join,
                                                     nest_level=nest_level + 1)
-                data = _merge_data(data, parent_data, rml_rule, 'subject_join_conditions')
+                data = join_data(data, parent_data, rml_rule, 'subject_join_conditions')
                 data['subject'] = '<< ' + data['parent_triple'] + ' >>'
                 data = data.drop(columns=['parent_triple'])
             else:
@@ -288,7 +406,7 @@ def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_j
                 parent_data = _materialize_rml_rule(parent_triples_map_rule, rml_df, fnml_df, config,
                                                     parent_join_references=parent_references_object_join,
                                                     nest_level=nest_level + 1)
-                data = _merge_data(data, parent_data, rml_rule, 'object_join_conditions')
+                data = join_data(data, parent_data, rml_rule, 'object_join_conditions')
                 data['object'] = '<< ' + data['parent_triple'] + ' >>'
                 data = data.drop(columns=['parent_triple'])
             else:
@@ -299,7 +417,7 @@ def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_j
             if rml_rule['subject_map_type'] == RML_QUOTED_TRIPLES_MAP:
                 data['subject'] = data['keep_subject' + str(nest_level)]
 
-        data = _materialize_rml_rule_terms(data, rml_rule, fnml_df, config)
+        data = _materialize_rml_rule_terms(data, rml_rule, fnml_df, config, mapping_shard=mapping_shard)
 
     # elif pd.notna(rml_rule['object_parent_triples_map']):
     elif rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
@@ -307,28 +425,30 @@ def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_j
         references.update(references_object_join)
         # parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_parent_triples_map'])
         parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
-        parent_references = set(
-            _get_references_in_rml_rule(parent_triples_map_rule, rml_df, fnml_df, only_subject_map=True))
-
-        # add references used in the join condition
-        references, parent_references = _add_references_in_join_condition(rml_rule, references, parent_references)
 
-        if data is None:
-            data = _get_data(config, rml_rule, references, python_source)
+        if joined_data is not None:
+            merged_data = joined_data
+        elif data is None and parent_data is None and _is_join_pushed_down(rml_rule, rml_df, fnml_df, config):
+            merged_data = _get_joined_data(config, rml_rule, references, rml_df, fnml_df)
+        else:
+            if data is None:
+                data = _get_data(config, rml_rule, references, python_source)
 
-        parent_data = _get_data(config, parent_triples_map_rule, parent_references, python_source)
-        merged_data = _merge_data(data, parent_data, rml_rule, 'object_join_conditions')
+            if parent_data is None:
+                parent_data = _get_parent_data(rml_rule, rml_df, fnml_df, config, python_source)
+            merged_data = join_data(data, parent_data, rml_rule, 'object_join_conditions')
 
         rml_rule['object_map_type'] = parent_triples_map_rule['subject_map_type']
         rml_rule['object_map_value'] = parent_triples_map_rule['subject_map_value']
 
-        data = _materialize_rml_rule_terms(merged_data, rml_rule, fnml_df, config, columns_alias='parent_')
+        data = _materialize_rml_rule_terms(merged_data, rml_rule, fnml_df, config, columns_alias='parent_',
+                                           mapping_shard=mapping_shard)
     else:
 
         if data is None:
             data = _get_data(config, rml_rule, references, python_source)
 
-        data = _materialize_rml_rule_terms(data, rml_rule, fnml_df, config)
+        data = _materialize_rml_rule_terms(data, rml_rule, fnml_df, config, mapping_shard=mapping_shard)
 
     # TODO: this is slow reduce the number of vectorized operations
     data['triple'] = data['subject'] + ' ' + data['predicate'] + ' ' + data['object']
@@ -347,40 +467,236 @@ def _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, data=None, parent_j
     return data
 
 
+def _materialize_rml_rule_with_sql_pushdown(rml_rule, rml_df, fnml_df, config, pushed_down_data, python_source=None):
+    """
+    Generator of DataFrames with the triples of a mapping rule generated by its relational database (see
+    `get_sql_pushdown_data`). The triples of the rows with values to percent-encode are generated as usual.
+    """
+
+    if isinstance(pushed_down_data, pd.DataFrame):
+        pushed_down_data = [pushed_down_data]
+
+    references = set(_get_references_in_rml_rule(rml_rule, rml_df, fnml_df))
+    for data in pushed_down_data:
+        is_pushed_down = data[SQL_PUSHDOWN_TRIPLE_COLUMN].notna()
+        yield pd.DataFrame({'triple': data.loc[is_pushed_down, SQL_PUSHDOWN_TRIPLE_COLUMN]})
+
+        if not is_pushed_down.all():
+            data = _preprocess_data(data.loc[~is_pushed_down], rml_rule, references, config)
+            yield _materialize_rml_rule(rml_rule.copy(), rml_df, fnml_df, config, data=data,
+                                        python_source=python_source)
+
+
+def _materialize_rml_rule_in_chunks(rml_rule, rml_df, fnml_df, config, python_source=None, mapping_shard=None):
+    """
+    Generator of DataFrames with the triples of a mapping rule. If `chunk_size` is enabled in the config (or the
+    `fetch_size` of a relational source), the data of the logical source is processed in batches of at most
+    `chunk_size` rows, otherwise a single DataFrame is generated.
+    Constant-valued and quoted (RML-star) mapping rules are not chunked. For referencing object maps, the join is
+    pushed down to the database when possible, otherwise it is partitioned on disk if `join_partitions` is enabled
+    (also when `chunk_size` is not).
+    With the DuckDB and Arrow engines, the supported mapping rules are materialized by DuckDB or pyarrow instead. If
+    `sql_pushdown` is enabled, the terms of the mapping rules with relational sources are generated by the databases.
+    """
+
+    if config.get_engine() == DUCKDB_ENGINE and mapping_shard is None and \
+            is_supported_by_duckdb(rml_rule, rml_df, config):
+        yield from materialize_rml_rule_with_duckdb(rml_rule, rml_df, config)
+        return
+    elif config.get_engine() == ARROW_ENGINE and mapping_shard is None and \
+            is_supported_by_arrow(rml_rule, rml_df, config):
+        yield from materialize_rml_rule_with_arrow(rml_rule, rml_df, config)
+        return
+
+    if config.sql_pushdown() and mapping_shard is None and is_supported_by_sql_pushdown(rml_rule, rml_df, config):
+        pushed_down_data = get_sql_pushdown_data(config, rml_rule, _get_chunk_size(rml_rule, config))
+        if pushed_down_data is not None:
+            yield from _materialize_rml_rule_with_sql_pushdown(rml_rule, rml_df, fnml_df, config, pushed_down_data,
+                                                               python_source)
+            return
+
+    # partitioned joins are also used without chunks, the joined data is generated partition by partition
+    is_partitioned_join = rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP and config.get_join_partitions() and \
+        not _is_join_pushed_down(rml_rule, rml_df, fnml_df, config)
+    if (not _get_chunk_size(rml_rule, config) and not is_partitioned_join) or _is_constant_rml_rule(rml_rule) or \
+            _is_quoted_rml_rule(rml_rule):
+        yield _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, python_source=python_source,
+                                    mapping_shard=mapping_shard)
+        return
+
+    references = set(_get_references_in_rml_rule(rml_rule, rml_df, fnml_df))
+
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP and _is_join_pushed_down(rml_rule, rml_df, fnml_df, config):
+        for joined_data in _get_joined_data(config, rml_rule, references, rml_df, fnml_df,
+                                            _get_chunk_size(rml_rule, config)):
+            yield _materialize_rml_rule(rml_rule.copy(), rml_df, fnml_df, config, python_source=python_source,
+                                        joined_data=joined_data, mapping_shard=mapping_shard)
+        return
+
+    if is_partitioned_join:
+        # neither the child nor the parent are kept in memory, both are partitioned by the join keys on disk
+        parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+        parent_references = _get_parent_references(rml_rule, rml_df, fnml_df)
+        for joined_data in partitioned_join_data(
+                _get_data_chunks(config, rml_rule, references, python_source),
+                _get_data_chunks(config, parent_triples_map_rule, parent_references, python_source),
+                rml_rule, 'object_join_conditions', config.get_join_partitions()):
+            yield _materialize_rml_rule(rml_rule.copy(), rml_df, fnml_df, config, python_source=python_source,
+                                        joined_data=joined_data, mapping_shard=mapping_shard)
+        return
+
+    # the parent of a referencing object map is read only once, the child logical source is read in chunks
+    parent_data = None
+    if rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+        parent_data = _get_parent_data(rml_rule, rml_df, fnml_df, config, python_source)
+
+    for data in _get_data_chunks(config, rml_rule, references, python_source):
+        # _materialize_rml_rule modifies the mapping rule for referencing object maps, use a copy for each chunk
+        yield _materialize_rml_rule(rml_rule.copy(), rml_df, fnml_df, config, data=data, python_source=python_source,
+                                    parent_data=parent_data, mapping_shard=mapping_shard)
+
+
+def _prepare_source_cache(mapping_group_df, rml_df, fnml_df, config):
+    """
+    Registers in the source cache the references that the mapping rules in the mapping group (and their parent
+    triples maps) read from each logical source, so that each source is read once for all of them.
+    """
+
+    SOURCE_CACHE.set_memory_budget(config.get_source_cache_size() * 1024 ** 2)
+
+    for i, rml_rule in mapping_group_df.iterrows():
+        SOURCE_CACHE.plan(rml_rule, _get_references_in_rml_rule(rml_rule, rml_df, fnml_df))
+
+        for position in ['subject', 'object']:
+            if rml_rule[f'{position}_map_type'] in [RML_PARENT_TRIPLES_MAP, RML_QUOTED_TRIPLES_MAP]:
+                parent_triples_map_rule = get_rml_rule(rml_df, rml_rule[f'{position}_map_value'])
+                _, parent_references_join = get_references_in_join_condition(rml_rule, f'{position}_join_conditions')
+                SOURCE_CACHE.plan(parent_triples_map_rule,
+                                  _get_references_in_rml_rule(parent_triples_map_rule, rml_df, fnml_df) +
+                                  parent_references_join)
+
+
+def _log_deduplication_memory_usage(deduplicator, mapping_partition):
+    if not LOGGER.isEnabledFor(logging.DEBUG):
+        # computing the memory usage can be expensive (e.g., for exact deduplication)
+        return
+
+    LOGGER.debug(f'Deduplication of mapping partition `{mapping_partition}` used '
+                 f'{deduplicator.memory_usage() / 1024 ** 2:.3f} MB for {deduplicator.num_triples} triples.')
+
+
 def _materialize_mapping_group_to_set(mapping_group_df, rml_df, fnml_df, config, python_source=None):
-    triples = set()
+    _prepare_source_cache(mapping_group_df, rml_df, fnml_df, config)
+
+    mapping_shard = _get_mapping_shard(mapping_group_df)
+    deduplicator = get_deduplicator(config)
+
+    triples = []
     for i, rml_rule in mapping_group_df.iterrows():
-        data = _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, python_source=python_source)
-        triples.update(set(data['triple']))
+        for data in _materialize_rml_rule_in_chunks(rml_rule, rml_df, fnml_df, config, python_source=python_source,
+                                                    mapping_shard=mapping_shard):
+            triples.extend(deduplicator.add(data['triple']))
+    triples.extend(deduplicator.finalize())
 
-    return triples
+    _log_deduplication_memory_usage(deduplicator, mapping_group_df.iloc[0]['mapping_partition'])
+    deduplicator.close()
+
+    return set(triples)
 
 
 def _materialize_mapping_group_to_file(mapping_group_df, rml_df, fnml_df, config):
-    triples = set()
-    for i, rml_rule in mapping_group_df.iterrows():
-        start_time = time.time()
-        data = _materialize_rml_rule(rml_rule, rml_df, fnml_df, config)
-        triples.update(set(data['triple']))
+    _prepare_source_cache(mapping_group_df, rml_df, fnml_df, config)
 
-        LOGGER.debug(f"{len(triples)} triples generated for mapping rule `{rml_rule['triples_map_id']}` "
-                      f"in {get_delta_time(start_time)} seconds.")
+    mapping_partition = mapping_group_df.iloc[0]['mapping_partition']
+    mapping_shard = _get_mapping_shard(mapping_group_df)
+    deduplicator = get_deduplicator(config)
 
-    triples_to_file(triples, config, mapping_group_df.iloc[0]['mapping_partition'])
+    # the output file is kept open while the mapping group is materialized
+    with TriplesWriter(config, mapping_partition) as triples_writer:
+        for i, rml_rule in mapping_group_df.iterrows():
+            start_time = time.time()
+            num_triples_before_rule = deduplicator.num_triples
+            for data in _materialize_rml_rule_in_chunks(rml_rule, rml_df, fnml_df, config, mapping_shard=mapping_shard):
+                # new triples are written as soon as they are generated
+                triples_writer.write(deduplicator.add(data['triple']))
 
-    return len(triples)
+            LOGGER.debug(f"{deduplicator.num_triples - num_triples_before_rule} triples generated for mapping rule "
+                         f"`{rml_rule['triples_map_id']}` in {get_delta_time(start_time)} seconds.")
+
+        triples_writer.write(deduplicator.finalize())
+        _log_deduplication_memory_usage(deduplicator, mapping_partition)
+        deduplicator.close()
+
+    return deduplicator.num_triples
 
 
 def _materialize_mapping_group_to_kafka(mapping_group_df, rml_df, fnml_df, config, python_source=None):
-    triples = set()
+    _prepare_source_cache(mapping_group_df, rml_df, fnml_df, config)
+
+    mapping_shard = _get_mapping_shard(mapping_group_df)
+    deduplicator = get_deduplicator(config)
+
+    triples = []
     for i, rml_rule in mapping_group_df.iterrows():
         start_time = time.time()
-        data = _materialize_rml_rule(rml_rule, rml_df, fnml_df, config, python_source=python_source)
-        triples.update(set(data['triple']))
+        num_triples_before_rule = deduplicator.num_triples
+        for data in _materialize_rml_rule_in_chunks(rml_rule, rml_df, fnml_df, config, python_source=python_source,
+                                                    mapping_shard=mapping_shard):
+            triples.extend(deduplicator.add(data['triple']))
 
-        LOGGER.debug(f"{len(triples)} triples generated for mapping rule `{rml_rule['triples_map_id']}` "
-                      f"in {get_delta_time(start_time)} seconds.")
+        LOGGER.debug(f"{deduplicator.num_triples - num_triples_before_rule} triples generated for mapping rule "
+                     f"`{rml_rule['triples_map_id']}` in {get_delta_time(start_time)} seconds.")
+    triples.extend(deduplicator.finalize())
+
+    _log_deduplication_memory_usage(deduplicator, mapping_group_df.iloc[0]['mapping_partition'])
+    deduplicator.close()
 
     triples_to_kafka(triples, config)
 
     return len(triples)
+
+
+def _log_mapping_group_cost(mapping_group_df, start_time):
+    mapping_partition = mapping_group_df.iloc[0]['mapping_partition']
+    if 'mapping_shard' in mapping_group_df.columns:
+        mapping_partition = f"{mapping_partition} (shard {mapping_group_df.iloc[0]['mapping_shard']})"
+    elif 'sql_table_range' in mapping_group_df.columns:
+        mapping_partition = f"{mapping_partition} (range {mapping_group_df.iloc[0]['sql_table_range']})"
+
+    estimated_cost = mapping_group_df.iloc[0].get('estimated_cost')
+    LOGGER.debug(f'Mapping group `{mapping_partition}` with estimated cost {estimated_cost} materialized in '
+                 f'{get_delta_time(start_time)} seconds.')
+
+
+def _materialize_mapping_groups_to_set(mapping_groups, rml_df, fnml_df, config, python_source=None):
+    """
+    Materializes the mapping groups of a task (see `schedule_mapping_groups`) in the same process.
+    """
+
+    triples = set()
+    for mapping_group_df in mapping_groups:
+        start_time = time.time()
+        triples.update(_materialize_mapping_group_to_set(mapping_group_df, rml_df, fnml_df, config, python_source))
+        _log_mapping_group_cost(mapping_group_df, start_time)
+
+    return triples
+
+
+def _materialize_mapping_groups_to_file(mapping_groups, rml_df, fnml_df, config):
+    num_triples = 0
+    for mapping_group_df in mapping_groups:
+        start_time = time.time()
+        num_triples += _materialize_mapping_group_to_file(mapping_group_df, rml_df, fnml_df, config)
+        _log_mapping_group_cost(mapping_group_df, start_time)
+
+    return num_triples
+
+
+def _materialize_mapping_groups_to_kafka(mapping_groups, rml_df, fnml_df, config, python_source=None):
+    num_triples = 0
+    for mapping_group_df in mapping_groups:
+        start_time = time.time()
+        num_triples += _materialize_mapping_group_to_kafka(mapping_group_df, rml_df, fnml_df, config, python_source)
+        _log_mapping_group_cost(mapping_group_df, start_time)
+
+    return num_triples
@@ -0,0 +1,79 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+from functools import lru_cache
+
+import pandas as pd
+
+from .constants import RML_REFERENCE
+from .utils import get_references_in_template
+
+
+class CompiledTemplate:
+    """
+    Template-valued (or reference-valued) term map parsed into its constant segments and references. Terms are built
+    in a single pass over the rows with a format string, instead of concatenating the whole columns once per
+    reference.
+    """
+
+    def __init__(self, template, expression_type):
+        if expression_type == RML_REFERENCE:
+            # convert RML reference to template
+            template = f'{{{template}}}'
+
+        self.references = get_references_in_template(template)
+
+        # Curly braces that do not enclose column names MUST be escaped by a backslash character (“\”).
+        # This also applies to curly braces within column names.
+        template = template.replace('\\{', '{').replace('\\}', '}')
+
+        # there is one more segment than references, segments can be empty
+        self.segments = []
+        for reference in self.references:
+            splitted_template = template.split('{' + reference + '}')
+            self.segments.append(splitted_template[0])
+            template = str('{' + reference + '}').join(splitted_template[1:])
+        # what remains in the template after the last reference
+        self.segments.append(template)
+
+    def get_format_string(self, prefix='', suffix=''):
+        segments = [segment.replace('{', '{{').replace('}', '}}') for segment in self.segments]
+        segments[0] = prefix.replace('{', '{{').replace('}', '}}') + segments[0]
+        segments[-1] = segments[-1] + suffix.replace('{', '{{').replace('}', '}}')
+
+        return '{}'.join(segments)
+
+    def materialize(self, data, encoders=(), columns_alias='', prefix='', suffix=''):
+        """
+        Returns a Series with the terms generated for the rows in `data`. Each reference column is transformed with
+        the `encoders` (functions from Series to Series) before building the terms. `prefix` and `suffix` are
+        added to every term (e.g., `<` and `>` for IRIs).
+        """
+
+        if not self.references:
+            return pd.Series(prefix + self.segments[0] + suffix, index=data.index, dtype=object)
+
+        reference_columns = []
+        for reference in self.references:
+            reference_column = data[columns_alias + reference]
+            for encoder in encoders:
+                reference_column = encoder(reference_column)
+            reference_columns.append(reference_column.to_numpy(dtype=object))
+
+        format_string = self.get_format_string(prefix, suffix)
+
+        return pd.Series(list(map(format_string.format, *reference_columns)), index=data.index, dtype=object)
+
+
+@lru_cache(maxsize=None)
+def compile_template(template, expression_type=None):
+    """
+    Parses a template once, compiled templates are cached per process.
+    """
+
+    return CompiledTemplate(template, expression_type)
@@ -12,11 +12,13 @@ import logging
 import sys
 import rdflib
 import time
+import numpy as np
 import pandas as pd
 import multiprocessing as mp
 
-from itertools import product
-from .constants import AUXILIAR_UNIQUE_REPLACING_STRING, LOGGING_NAMESPACE, RML_EXECUTION, RML_TEMPLATE, RML_REFERENCE
+from itertools import product, islice
+from .constants import AUXILIAR_UNIQUE_REPLACING_STRING, LOGGING_NAMESPACE, RML_EXECUTION, RML_TEMPLATE, RML_REFERENCE, \
+    RML_CONSTANT, RML_PARENT_TRIPLES_MAP, RML_LANGUAGE_MAP, RML_DATATYPE_MAP, RML_DEFAULT_GRAPH, NQUADS
 
 LOGGER = logging.getLogger(LOGGING_NAMESPACE)
 
@@ -219,6 +221,62 @@ def get_references_in_join_condition(rml_rule, join_conditions):
     return references, parent_references
 
 
+def get_references_in_term_map(rml_rule, position):
+    if rml_rule[f'{position}_map_type'] == RML_TEMPLATE:
+        return get_references_in_template(rml_rule[f'{position}_map_value'])
+    elif rml_rule[f'{position}_map_type'] == RML_REFERENCE:
+        return [rml_rule[f'{position}_map_value']]
+
+    return []
+
+
+def has_graph_map(rml_rule, config):
+    # graphs are only generated for N-Quads
+    return config.get_output_format() == NQUADS and rml_rule['graph_map_value'] != RML_DEFAULT_GRAPH and \
+        rml_rule['graph_map_type'] in [RML_TEMPLATE, RML_CONSTANT, RML_REFERENCE, RML_EXECUTION]
+
+
+def get_term_map_positions(rml_rule, config):
+    """
+    Retrieves the positions of the term maps of a mapping rule that are used to generate its triples (or quads).
+    """
+
+    positions = ['subject', 'predicate', 'object']
+    if rml_rule['lang_datatype'] in [RML_LANGUAGE_MAP, RML_DATATYPE_MAP]:
+        positions.append('lang_datatype')
+    if has_graph_map(rml_rule, config):
+        positions.append('graph')
+
+    return positions
+
+
+def is_template_rml_rule(rml_rule, rml_df, config, is_supported_source):
+    """
+    Checks whether all the term maps of a mapping rule are templates, constants or references (or a referencing object
+    map with join conditions whose parent subject map is so) and its logical sources are supported according to
+    `is_supported_source`. Mapping rules with all term maps constant are not considered.
+    """
+
+    if config.only_write_printable_characters() or not is_supported_source(rml_rule):
+        return False
+
+    references = []
+    for position in get_term_map_positions(rml_rule, config):
+        if position == 'object' and rml_rule['object_map_type'] == RML_PARENT_TRIPLES_MAP:
+            parent_triples_map_rule = get_rml_rule(rml_df, rml_rule['object_map_value'])
+            child_join_references, _ = get_references_in_join_condition(rml_rule, 'object_join_conditions')
+            if not child_join_references or not is_supported_source(parent_triples_map_rule) or \
+                    parent_triples_map_rule['subject_map_type'] not in [RML_TEMPLATE, RML_CONSTANT, RML_REFERENCE]:
+                return False
+            references.extend(child_join_references)
+        elif rml_rule[f'{position}_map_type'] not in [RML_TEMPLATE, RML_CONSTANT, RML_REFERENCE]:
+            return False
+        else:
+            references.extend(get_references_in_term_map(rml_rule, position))
+
+    return len(references) > 0
+
+
 def normalize_oracle_identifier_casing(dataframe, references):
     """
     This renames the columns of a DataFrame generated when querying Oracle. This is necessary as Oracle identifier
@@ -247,6 +305,28 @@ def remove_null_values_from_dataframe(data, config, references, column=None):
     return data
 
 
+def unique_strings(values):
+    """
+    Returns the distinct values of an array of strings in order of appearance. The string hash tables of pandas
+    (`pd.unique`, `pd.factorize`) compare strings up to the first NUL character, hence they are not used.
+    """
+
+    return np.array(list(dict.fromkeys(values)), dtype=object)
+
+
+def factorize_strings(values):
+    """
+    NUL-safe version of `pd.factorize` for arrays of strings (see `unique_strings`). Returns the code of each value and
+    the distinct values in order of appearance.
+    """
+
+    value_codes = {}
+    codes = np.fromiter((value_codes.setdefault(value, len(value_codes)) for value in values), dtype=np.intp,
+                        count=len(values))
+
+    return codes, np.array(list(value_codes), dtype=object)
+
+
 def normalize_hierarchical_data(data):
     """
     This is taken from
@@ -264,25 +344,86 @@ def normalize_hierarchical_data(data):
         yield data
 
 
+class TriplesWriter:
+    """
+    Buffered writer of triples to the output file of a mapping partition. It is kept open while the mapping partition
+    is materialized, triples are written in batches (DataFrame columns, arrays, lists or iterators) that are joined in
+    bulk and appended to the file in blocks of at least `block_size` bytes. Each block is appended with a single write
+    call and only contains full lines, so that processes writing to the same file do not split lines of each other.
+    The file is fsynced once, when the writer is closed.
+    """
+
+    def __init__(self, config, mapping_group=None, block_size=4 * 1024 ** 2):
+        from .constants import JELLY
+        if config.get_output_format() == JELLY:
+            raise RuntimeError(
+                "TriplesWriter must not be used with output_format=JELLY. Use RDFLib/pyjelly serializer instead."
+            )
+
+        self.block_size = block_size
+        self.blocks = []
+        self.buffered_bytes = 0
+        self.file_descriptor = os.open(config.get_output_file_path(mapping_group),
+                                       os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, triples):
+        if isinstance(triples, pd.Series):
+            triples = triples.to_numpy(dtype=object)
+        elif not isinstance(triples, (np.ndarray, list)):
+            # iterators (e.g., from the external sort deduplication) are consumed in bounded batches
+            triples = iter(triples)
+            for triples_batch in iter(lambda: list(islice(triples, 100000)), []):
+                self.write(triples_batch)
+            return
+
+        if len(triples) == 0:
+            return
+
+        if isinstance(triples, np.ndarray):
+            triples = triples.tolist()
+        block = (' .\n'.join(triples) + ' .\n').encode('utf-8')
+        self.blocks.append(block)
+        self.buffered_bytes += len(block)
+
+        if self.buffered_bytes >= self.block_size:
+            self.flush()
+
+    def flush(self):
+        if not self.blocks:
+            return
+
+        data = memoryview(b''.join(self.blocks))
+        self.blocks = []
+        self.buffered_bytes = 0
+        while data:
+            # os.write can write less bytes than requested
+            data = data[os.write(self.file_descriptor, data):]
+
+    def close(self):
+        if self.file_descriptor is None:
+            return
+
+        self.flush()
+        os.fsync(self.file_descriptor)
+        os.close(self.file_descriptor)
+        self.file_descriptor = None
+
+
 def triples_to_file(triples, config, mapping_group=None):
     """
     Writes triples to file.
     """
 
-    from .constants import JELLY
-    if config.get_output_format() == JELLY:
-        raise RuntimeError(
-            "triples_to_file() must not be used with output_format=JELLY. Use RDFLib/pyjelly serializer instead."
-        )
-
     lock = mp.Lock()    # necessary for issue #65
     with lock:
-        f = open(config.get_output_file_path(mapping_group), 'a', encoding='utf-8')
-        for triple in triples:
-            f.write(f'{triple} .\n')
-        f.flush()
-        os.fsync(f.fileno())
-        f.close()
+        with TriplesWriter(config, mapping_group) as triples_writer:
+            triples_writer.write(triples)
 
 
 def triples_to_kafka(triples, config):
@@ -0,0 +1,36 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+
+
+RML_CORE_TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'rml-core')
+
+
+def _materialize_set(test_case, configuration):
+    # the mappings use paths relative to the root of the repository
+    mapping_path = os.path.join(RML_CORE_TEST_DIR, test_case, 'mapping.ttl')
+    config = f'[CONFIGURATION]\nnumber_of_processes=1\noutput_format=N-QUADS\n{configuration}' \
+             f'[DataSource]\nmappings={mapping_path}'
+
+    return morph_kgc.materialize_set(config)
+
+
+@pytest.mark.parametrize('test_case', ['csv/RMLTC0002a', 'csv/RMLTC0007b', 'csv/RMLTC0009b', 'csv/RMLTC0010c',
+                                       'csv/RMLTC0015a', 'csv/RMLTC0020a', 'csv/null_filter',
+                                       'tabular/RMLTC0002a_TSV', 'tabular/RMLTC0002a_PARQUET',
+                                       'tabular/RMLTC0002a_FEATHER'])
+@pytest.mark.parametrize('chunk_size', [0, 1])
+def test_arrow_engine(test_case, chunk_size):
+    expected_triples = _materialize_set(test_case, 'engine=pandas\n')
+
+    triples = _materialize_set(test_case, f'engine=arrow\nchunk_size={chunk_size}\n')
+
+    assert triples == expected_triples
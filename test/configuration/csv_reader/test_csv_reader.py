@@ -0,0 +1,131 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+import pandas as pd
+
+from morph_kgc.data_source.data_file import get_file_data, get_file_arrow_data, _sniff_csv_delimiter
+
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..')
+
+CSV_DOCUMENT = 'ID,Name,Comment,Empty\n' + ''.join(
+    f'{i},Student é {i % 7},"line 1\nline 2, ""quoted""",\n' for i in range(50)) + '\n50,Last,,\n'
+
+
+def _materialize_set(test_case, configuration):
+    # the mappings use paths relative to the root of the repository
+    mapping_path = os.path.join(TEST_DIR, test_case, 'mapping.ttl')
+    config = f'[CONFIGURATION]\nnumber_of_processes=1\noutput_format=N-QUADS\n{configuration}' \
+             f'[DataSource]\nmappings={mapping_path}'
+
+    return morph_kgc.materialize_set(config)
+
+
+@pytest.mark.parametrize('test_case', ['rml-core/csv/RMLTC0002a', 'rml-core/csv/RMLTC0007b',
+                                       'rml-core/csv/RMLTC0009b', 'rml-core/csv/RMLTC0010c',
+                                       'rml-core/csv/RMLTC0015a', 'rml-core/csv/RMLTC0020a',
+                                       'rml-core/csv/null_filter', 'rml-core/tabular/RMLTC0002a_TSV',
+                                       'issues/issue_81'])
+@pytest.mark.parametrize('chunk_size', [0, 1])
+def test_csv_reader(test_case, chunk_size):
+    expected_triples = _materialize_set(test_case, 'csv_reader=pandas\n')
+
+    triples = _materialize_set(test_case, f'csv_reader=arrow\nchunk_size={chunk_size}\n')
+
+    assert triples == expected_triples
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    csv_path = os.path.join(tmp_path, 'student.csv')
+    with open(csv_path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write(CSV_DOCUMENT)
+
+    return csv_path
+
+
+def _get_rml_rule(file_path):
+    return pd.Series({'source_type': 'CSV', 'logical_source_type': 'http://w3id.org/rml/source',
+                      'logical_source_value': file_path})
+
+
+@pytest.mark.parametrize('references', [['ID', 'Name'], ['Comment', 'Empty', 'ID']])
+def test_read_arrow_csv(csv_path, references):
+    expected_csv_df = get_file_data(_get_rml_rule(csv_path), references)
+
+    csv_df = get_file_data(_get_rml_rule(csv_path), references, csv_reader='ARROW')
+    assert csv_df[references].values.tolist() == expected_csv_df[references].values.tolist()
+
+    csv_chunks = list(get_file_data(_get_rml_rule(csv_path), references, 7, 'ARROW'))
+    assert [len(csv_chunk) for csv_chunk in csv_chunks] == [7] * 7 + [2]
+    assert pd.concat(csv_chunks)[references].values.tolist() == expected_csv_df[references].values.tolist()
+
+
+@pytest.mark.parametrize('chunk_size', [0, 1, 3])
+def test_read_arrow_csv_ragged_rows(tmp_path, chunk_size):
+    csv_path = os.path.join(tmp_path, 'student.csv')
+    with open(csv_path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write('ID,Name\n1,A\n2,B,extra\n3\n4,D\n')
+
+    # pandas ignores the extra fields and the missing fields are empty
+    expected_rows = [['1', 'A'], ['2', 'B'], ['3', ''], ['4', 'D']]
+    assert get_file_data(_get_rml_rule(csv_path), ['ID', 'Name']).values.tolist() == expected_rows
+
+    if chunk_size:
+        csv_df = pd.concat(get_file_data(_get_rml_rule(csv_path), ['ID', 'Name'], chunk_size, 'ARROW'))
+        csv_table_rows = [row for table in get_file_arrow_data(_get_rml_rule(csv_path), ['ID', 'Name'], chunk_size)
+                          for row in table.to_pandas().values.tolist()]
+    else:
+        csv_df = get_file_data(_get_rml_rule(csv_path), ['ID', 'Name'], csv_reader='ARROW')
+        csv_table_rows = get_file_arrow_data(_get_rml_rule(csv_path), ['ID', 'Name']).to_pandas().values.tolist()
+
+    assert csv_df[['ID', 'Name']].values.tolist() == expected_rows
+    assert csv_table_rows == expected_rows
+
+
+@pytest.mark.parametrize('file_name, header, expected_sampled', [
+    ('student.csv', 'ID,Name', False),
+    ('student.tsv', 'ID\tName', False),
+    ('student.csv', 'ID;Name', True),
+])
+def test_read_csv_sampling(monkeypatch, tmp_path, file_name, header, expected_sampled):
+    import morph_kgc.data_source.data_file as data_file
+
+    # the file is only sampled to sniff the delimiter if it is not the default one
+    sampled_files = []
+    open_csv_sample = data_file._open_csv_sample
+    monkeypatch.setattr(data_file, '_open_csv_sample', lambda path: sampled_files.append(path) or open_csv_sample(path))
+
+    csv_path = os.path.join(tmp_path, file_name)
+    with open(csv_path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write(f"{header}\n{header.replace('ID', '1').replace('Name', 'Venus')}\n")
+    rml_rule = _get_rml_rule(csv_path)
+    rml_rule['source_type'] = file_name.split('.')[-1].upper()
+
+    assert get_file_data(rml_rule, ['ID', 'Name']).values.tolist() == [['1', 'Venus']]
+    assert bool(sampled_files) == expected_sampled
+
+
+@pytest.mark.parametrize('header, delimiter, references, expected_delimiter', [
+    ('ID,Name', ',', ['ID', 'Name'], ','),
+    ('ID;Name;Surname', ',', ['ID', 'Surname'], ';'),
+    ('ID;Name,Surname', ',', ['ID;Name', 'Surname'], ','),
+    ('ID\tName', '\t', ['ID', 'Name'], '\t'),
+    ('ID|Name', ',', ['ID', 'Name'], '|'),
+    ('ID', ',', ['ID'], ','),
+    ('', ',', ['ID'], ','),
+])
+def test_sniff_csv_delimiter(tmp_path, header, delimiter, references, expected_delimiter):
+    csv_path = os.path.join(tmp_path, 'student.csv')
+    with open(csv_path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write(f'{header}\n1{delimiter}Venus\n')
+
+    assert _sniff_csv_delimiter(csv_path, references, delimiter) == expected_delimiter
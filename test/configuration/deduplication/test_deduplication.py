@@ -0,0 +1,69 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import sys
+import subprocess
+import pytest
+
+from pathlib import Path
+
+
+HERE = Path(__file__).parent
+ROOT = HERE.parent.parent.parent
+
+
+def _materialize_to_file(tmp_path, configuration):
+    config_path = tmp_path / 'config.ini'
+    output_path = tmp_path / 'output.nt'
+    config_path.write_text(
+        '[CONFIGURATION]\n'
+        f'output_file={output_path.as_posix()}\n'
+        'number_of_processes=1\n'
+        f'{configuration}'
+        '[DataSource]\n'
+        f"mappings={(HERE / 'mapping.ttl').as_posix()}\n",
+        encoding='utf-8')
+
+    # the mapping uses paths relative to the root of the repository
+    subprocess.check_call([sys.executable, '-m', 'morph_kgc', config_path.as_posix()], cwd=ROOT)
+
+    return output_path.read_text(encoding='utf-8').splitlines()
+
+
+@pytest.mark.parametrize('deduplication', ['exact', 'hash64', 'hash128', 'sort'])
+def test_deduplication(tmp_path, deduplication):
+    expected_triples = (HERE / 'output.nt').read_text(encoding='utf-8').splitlines()
+
+    triples = _materialize_to_file(tmp_path, f'deduplication={deduplication}\ndeduplication_buffer_size=2\n'
+                                             f'mapping_partitioning=no\n')
+
+    assert len(triples) == len(expected_triples)
+    assert set(triples) == set(expected_triples)
+
+
+def test_invalid_deduplication():
+    from morph_kgc.args_parser import load_config_from_argument
+
+    with pytest.raises(ValueError):
+        load_config_from_argument('[CONFIGURATION]\ndeduplication=no')
+
+
+@pytest.mark.parametrize('deduplication', ['exact', 'hash64', 'hash128', 'sort'])
+def test_deduplication_nul_characters(deduplication):
+    from morph_kgc.args_parser import load_config_from_argument
+    from morph_kgc.deduplication import get_deduplicator
+
+    deduplicator = get_deduplicator(load_config_from_argument(f'[CONFIGURATION]\ndeduplication={deduplication}'))
+
+    # distinct triples that only differ after a NUL character
+    triples = ['<s> <p> "\x00a" .', '<s> <p> "\x00b" .', '<s> <p> "\x00a" .']
+    new_triples = list(deduplicator.add(triples)) + list(deduplicator.add(['<s> <p> "\x00c" .']))
+    new_triples += list(deduplicator.finalize())
+
+    assert sorted(new_triples) == ['<s> <p> "\x00a" .', '<s> <p> "\x00b" .', '<s> <p> "\x00c" .']
@@ -0,0 +1,117 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+
+
+RML_CORE_TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'rml-core')
+
+
+def _materialize_set(test_case, configuration):
+    # the mappings use paths relative to the root of the repository
+    mapping_path = os.path.join(RML_CORE_TEST_DIR, test_case, 'mapping.ttl')
+    config = f'[CONFIGURATION]\nnumber_of_processes=1\noutput_format=N-QUADS\n{configuration}' \
+             f'[DataSource]\nmappings={mapping_path}'
+
+    return morph_kgc.materialize_set(config)
+
+
+@pytest.mark.parametrize('test_case', ['csv/RMLTC0002a', 'csv/RMLTC0007b', 'csv/RMLTC0009b', 'csv/RMLTC0010c',
+                                       'csv/RMLTC0015a', 'csv/RMLTC0020a', 'csv/null_filter',
+                                       'tabular/RMLTC0002a_TSV', 'tabular/RMLTC0002a_PARQUET',
+                                       os.path.join('..', 'issues', 'issue_81')])
+@pytest.mark.parametrize('chunk_size', [0, 1])
+def test_duckdb_engine(test_case, chunk_size):
+    expected_triples = _materialize_set(test_case, 'engine=pandas\n')
+
+    triples = _materialize_set(test_case, f'engine=duckdb\nchunk_size={chunk_size}\n')
+
+    assert triples == expected_triples
+
+
+MAPPING = """
+@prefix rml: <http://w3id.org/rml/> .
+@prefix ex: <http://example.com/> .
+
+<#TM> a rml:TriplesMap;
+    rml:logicalSource [ rml:source "{parquet_path}"; rml:referenceFormulation rml:Parquet ];
+    rml:subjectMap [ rml:template "http://example.com/student/{{ID}}" ];
+    rml:predicateObjectMap [
+        rml:predicate ex:{reference};
+        rml:objectMap [ rml:reference "{reference}" ]
+    ].
+"""
+
+
+@pytest.mark.parametrize('reference', ['Name', 'Active', 'Age'])
+def test_duckdb_engine_parquet_types(tmp_path, reference):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+
+    # booleans and integers with nulls are converted to strings differently by DuckDB and pandas
+    parquet_path = os.path.join(tmp_path, 'student.parquet')
+    pq.write_table(pa.table({'ID': ['1', '2', '3'], 'Name': ['Venus', 'Serena', 'Carlos'],
+                             'Active': [True, False, True], 'Age': [18, None, 20]}), parquet_path)
+    mapping_path = os.path.join(tmp_path, 'mapping.ttl')
+    with open(mapping_path, 'w') as mapping_file:
+        mapping_file.write(MAPPING.format(parquet_path=parquet_path, reference=reference))
+
+    config = f'[CONFIGURATION]\nnumber_of_processes=1\n[DataSource]\nmappings={mapping_path}'
+    expected_triples = morph_kgc.materialize_set(config)
+
+    triples = morph_kgc.materialize_set(config.replace('[DataSource]', 'engine=duckdb\n[DataSource]'))
+
+    assert triples == expected_triples
+
+
+BOOLEAN_MAPPING = """
+@prefix rml: <http://w3id.org/rml/> .
+@prefix ex: <http://example.com/> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+<#TM> a rml:TriplesMap;
+    rml:logicalSource [ rml:source "{csv_path}"; rml:referenceFormulation rml:CSV ];
+    rml:subjectMap [ rml:template "http://example.com/student/{{ID}}" ];
+    rml:predicateObjectMap [
+        rml:predicate ex:active;
+        rml:objectMap [ rml:reference "Active"; rml:datatype xsd:boolean ]
+    ].
+"""
+
+
+def test_duckdb_engine_boolean_literals(tmp_path):
+    # DuckDB and Python lowercase some non-ASCII characters differently (e.g., `İ`)
+    csv_path = os.path.join(tmp_path, 'student.csv')
+    with open(csv_path, 'w', encoding='utf-8') as csv_file:
+        csv_file.write('ID,Active\n1,TRUE\n2,False\n3,İ\n')
+    mapping_path = os.path.join(tmp_path, 'mapping.ttl')
+    with open(mapping_path, 'w', encoding='utf-8') as mapping_file:
+        mapping_file.write(BOOLEAN_MAPPING.format(csv_path=csv_path))
+
+    config = f'[CONFIGURATION]\nnumber_of_processes=1\n[DataSource]\nmappings={mapping_path}'
+    expected_triples = morph_kgc.materialize_set(config)
+
+    triples = morph_kgc.materialize_set(config.replace('[DataSource]', 'engine=duckdb\n[DataSource]'))
+
+    assert triples == expected_triples
+
+
+@pytest.mark.parametrize('configuration', ['engine=duckdb', 'engine=arrow', 'csv_reader=arrow'])
+def test_duckdb_engine_without_pyarrow(monkeypatch, configuration):
+    import importlib.util
+    from morph_kgc.args_parser import load_config_from_argument
+
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None if name == 'pyarrow' else find_spec(name))
+
+    # the missing optional dependency is reported when the config is validated, not during the materialization
+    with pytest.raises(ValueError, match='pyarrow'):
+        load_config_from_argument(f'[CONFIGURATION]\n{configuration}')
+    load_config_from_argument('[CONFIGURATION]\nengine=pandas')
@@ -0,0 +1,41 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+
+from rdflib.graph import Graph
+from rdflib import compare
+
+
+R2RML_TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'r2rml')
+
+
+def _get_config(test_case, configuration, fetch_size):
+    test_dir = os.path.join(R2RML_TEST_DIR, test_case)
+
+    return f"[CONFIGURATION]\noutput_format=N-QUADS\n{configuration}" \
+           f"[DataSource]\nmappings={os.path.join(test_dir, 'mapping.ttl')}\n" \
+           f"db_url=sqlite:///{os.path.join(test_dir, 'resource.db')}\nfetch_size={fetch_size}"
+
+
+@pytest.mark.parametrize('test_case', ['R2RMLTC0002a', 'R2RMLTC0009a', 'R2RMLTC0012b'])
+@pytest.mark.parametrize('configuration', ['', 'chunk_size=2\n', 'sql_pushdown=yes\n'])
+def test_fetch_size(test_case, configuration):
+    g = Graph()
+    g.parse(os.path.join(R2RML_TEST_DIR, test_case, 'output.nq'))
+
+    g_morph = morph_kgc.materialize(_get_config(test_case, configuration, 1))
+
+    assert compare.isomorphic(g, g_morph)
+
+
+def test_fetch_size_not_valid():
+    with pytest.raises(ValueError):
+        morph_kgc.materialize(_get_config('R2RMLTC0002a', '', -1))
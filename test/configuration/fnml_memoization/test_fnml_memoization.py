@@ -0,0 +1,158 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+import pandas as pd
+
+from morph_kgc.args_parser import load_config_from_argument
+from morph_kgc.fnml.fnml_executer import _execute_memoized_function, _execute_function, load_udfs
+from morph_kgc.fnml.function_cache import FUNCTION_CACHE
+
+
+@pytest.fixture
+def function_calls():
+    FUNCTION_CACHE.clear()
+    yield []
+    FUNCTION_CACHE.clear()
+
+
+def _get_function_dict(function_calls):
+    def concat(string1, string2, separator=''):
+        function_calls.append((string1, string2))
+        return f'{string1}{separator}{string2}' if type(string2) is str else [string1] + string2
+
+    return {'function': concat, 'parameters': {}}
+
+
+def _get_config(fnml_cache_size=0):
+    return load_config_from_argument(f'[CONFIGURATION]\nfnml_cache_size={fnml_cache_size}')
+
+
+@pytest.mark.parametrize('function_params', [
+    {'string1': [pd.Series(['a', 'b', 'a', 'c', 'b', 'a'] * 10, dtype=object)], 'string2': ['x'], 'separator': ['_']},
+    {'string1': [pd.Series(['a', 'b', 'a', 'c', 'b', 'a'] * 10, dtype=object)],
+     'string2': [pd.Series(['x', 'y', 'x', 'z', 'y', 'x'] * 10, dtype=object), 'w']},
+])
+def test_memoized_execution(function_calls, function_params):
+    expected_results = list(_execute_function(_get_function_dict([]), function_params, 60))
+
+    results = _execute_memoized_function('concat', _get_function_dict(function_calls), function_params, 60,
+                                         _get_config())
+
+    # the function is executed once per distinct combination of values of the parameters
+    assert results == expected_results
+    assert len(function_calls) == len(set(map(str, function_calls))) == 3
+
+
+def test_memoized_execution_nul_characters(function_calls):
+    # values that only differ after a NUL character are different inputs
+    function_params = {'string1': [pd.Series(['\x00a', '\x00b', '\x00a'], dtype=object)], 'string2': ['x']}
+
+    results = _execute_memoized_function('concat', _get_function_dict(function_calls), function_params, 3,
+                                         _get_config())
+
+    assert results == ['\x00ax', '\x00bx', '\x00ax']
+    assert function_calls == [('\x00a', 'x'), ('\x00b', 'x')]
+
+
+def test_function_cache(function_calls):
+    function_params = {'string1': [pd.Series(['a', 'b', 'a'], dtype=object)], 'string2': ['x']}
+    _execute_memoized_function('concat', _get_function_dict(function_calls), function_params, 3, _get_config(10))
+
+    function_params = {'string1': [pd.Series(['b', 'c', 'c'], dtype=object)], 'string2': ['x']}
+    results = _execute_memoized_function('concat', _get_function_dict(function_calls), function_params, 3,
+                                         _get_config(10))
+
+    # results are reused by other executions in the process
+    assert results == ['bx', 'cx', 'cx']
+    assert function_calls == [('a', 'x'), ('b', 'x'), ('c', 'x')]
+
+    # the number of values of the parameters is part of the key
+    function_params = {'string1': [pd.Series(['a'], dtype=object)], 'string2': ['x', 'y']}
+    results = _execute_memoized_function('concat', _get_function_dict(function_calls), function_params, 1,
+                                         _get_config(10))
+    assert results == [['a', 'x', 'y']]
+
+
+def test_function_cache_eviction(function_calls):
+    function_params = {'string1': [pd.Series(['a', 'b', 'c', 'd'], dtype=object)], 'string2': ['x']}
+    _execute_memoized_function('concat', _get_function_dict(function_calls), function_params, 4, _get_config(2))
+
+    assert len(FUNCTION_CACHE.entries) == 2
+
+
+def test_udfs_deterministic(tmp_path):
+    udfs_path = os.path.join(tmp_path, 'udfs.py')
+    with open(udfs_path, 'w') as udfs_file:
+        udfs_file.write('@udf(fun_id="http://example.com/counter", value="http://example.com/value")\n'
+                        'def counter(value):\n    return value\n\n'
+                        '@udf(fun_id="http://example.com/upper", deterministic=True, value="http://example.com/value")\n'
+                        'def upper(value):\n    return value.upper()\n')
+
+    udf_dict = load_udfs(load_config_from_argument(f'[CONFIGURATION]\nudfs={udfs_path}'))
+
+    # user-defined functions are only memoized if they are declared deterministic
+    assert not udf_dict['http://example.com/counter']['deterministic']
+    assert udf_dict['http://example.com/upper']['deterministic']
+
+
+MAPPING = """
+@prefix rml: <http://w3id.org/rml/> .
+@prefix ex: <http://example.com/> .
+@prefix grel: <http://users.ugent.be/~bjdmeest/function/grel.ttl#> .
+@prefix morph-kgc: <https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#> .
+
+<#TM> a rml:TriplesMap;
+    rml:logicalSource [ rml:source "{csv_path}"; rml:referenceFormulation rml:CSV ];
+    rml:subjectMap [ rml:template "http://example.com/{{ID}}" ];
+    rml:predicateObjectMap [
+        rml:predicate ex:name;
+        rml:objectMap [ rml:functionExecution <#UpperCase> ]
+    ];
+    rml:predicateObjectMap [
+        rml:predicate ex:uuid;
+        rml:objectMap [ rml:functionExecution <#UUID> ]
+    ].
+
+<#UpperCase>
+    rml:function grel:toUpperCase;
+    rml:input [
+        rml:parameter grel:valueParameter;
+        rml:inputValueMap [ rml:reference "Name" ]
+    ].
+
+<#UUID>
+    rml:function morph-kgc:uuid.
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    csv_path = os.path.join(tmp_path, 'student.csv')
+    pd.DataFrame({'ID': range(100), 'Name': [f'Student {i % 7}' for i in range(100)]}).to_csv(csv_path, index=False)
+
+    mapping_path = os.path.join(tmp_path, 'mapping.ttl')
+    with open(mapping_path, 'w') as mapping_file:
+        mapping_file.write(MAPPING.format(csv_path=csv_path))
+
+    return f'[CONFIGURATION]\nnumber_of_processes=1\nfnml_memoization=no\n[DataSource]\nmappings={mapping_path}'
+
+
+def test_fnml_memoization(config):
+    expected_triples = morph_kgc.materialize_set(config)
+
+    triples = morph_kgc.materialize_set(config.replace('fnml_memoization=no', 'fnml_memoization=yes\n'
+                                                                               'fnml_cache_size=100'))
+
+    # uuids are generated for each row even if the parameters are the same
+    assert len({triple.split(' ', 2)[2] for triple in triples if '/uuid>' in triple}) == 100
+    assert {triple for triple in triples if '/name>' in triple} == \
+           {triple for triple in expected_triples if '/name>' in triple}
+    assert len({triple.split(' ', 2)[2] for triple in triples if '/name>' in triple}) == 7
@@ -0,0 +1,121 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+import pandas as pd
+
+from rdflib.graph import Graph
+from rdflib import compare
+
+from morph_kgc.join import join_data, partitioned_join_data
+
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..')
+
+
+def _get_rml_rule(join_conditions):
+    join_conditions = {f'jc{i}': {'child_value': child_value, 'parent_value': parent_value}
+                       for i, (child_value, parent_value) in enumerate(join_conditions)}
+    return pd.Series({'triples_map_id': '#TM1', 'object_join_conditions': str(join_conditions)})
+
+
+def _get_joined_rows(data):
+    return sorted(map(tuple, data[sorted(data.columns)].to_numpy().tolist()))
+
+
+def _get_expected_rows(data, parent_data, join_conditions):
+    parent_data = parent_data.add_prefix('parent_')
+    expected_data = data.merge(parent_data, how='inner', left_on=[child for child, _ in join_conditions],
+                               right_on=['parent_' + parent for _, parent in join_conditions])
+    return _get_joined_rows(expected_data)
+
+
+@pytest.mark.parametrize('data, parent_data', [
+    # unique parent keys
+    (pd.DataFrame({'ID': ['1', '2', '3', '4'], 'Sport': ['100', '100', '200', '300']}),
+     pd.DataFrame({'ID': ['100', '200'], 'Name': ['Tennis', 'Football']})),
+    # unique child keys
+    (pd.DataFrame({'ID': ['1', '2'], 'Sport': ['100', '200']}),
+     pd.DataFrame({'ID': ['100', '100', '300'], 'Name': ['Tennis', 'Padel', 'Golf']})),
+    # many-to-many
+    (pd.DataFrame({'ID': ['1', '2', '3', '4'], 'Sport': ['100', '100', '200', '300']}),
+     pd.DataFrame({'ID': ['100', '100', '200', '400'], 'Name': ['Tennis', 'Padel', 'Football', 'Golf']})),
+])
+def test_join_data(data, parent_data):
+    join_conditions = [('Sport', 'ID')]
+
+    joined_data = join_data(data, parent_data, _get_rml_rule(join_conditions), 'object_join_conditions')
+
+    assert _get_joined_rows(joined_data) == _get_expected_rows(data, parent_data, join_conditions)
+
+
+def test_join_data_multiple_join_conditions():
+    data = pd.DataFrame({'ID': ['1', '2', '3'], 'FirstName': ['Venus', 'Serena', 'Venus'],
+                         'LastName': ['Williams', 'Williams', 'Smith']})
+    parent_data = pd.DataFrame({'First': ['Venus', 'Serena', 'Venus'], 'Last': ['Williams', 'Williams', 'Adams'],
+                                'Sport': ['Tennis', 'Tennis', 'Golf']})
+    join_conditions = [('FirstName', 'First'), ('LastName', 'Last')]
+
+    joined_data = join_data(data, parent_data, _get_rml_rule(join_conditions), 'object_join_conditions')
+
+    assert _get_joined_rows(joined_data) == _get_expected_rows(data, parent_data, join_conditions)
+
+
+@pytest.mark.parametrize('chunk_size', [0, 1])
+def test_join_pushdown(chunk_size):
+    # referencing object map with both logical sources in the same database, the join is evaluated by the database
+    test_dir = os.path.join(TEST_DIR, 'r2rml', 'R2RMLTC0009a')
+
+    g = Graph()
+    g.parse(os.path.join(test_dir, 'output.nq'))
+
+    config = f"[CONFIGURATION]\nchunk_size={chunk_size}\noutput_format=N-QUADS\n" \
+             f"[DataSource]\nmappings={os.path.join(test_dir, 'mapping.ttl')}\n" \
+             f"db_url=sqlite:///{os.path.join(test_dir, 'resource.db')}"
+    g_morph = morph_kgc.materialize(config)
+
+    assert compare.isomorphic(g, g_morph)
+
+
+@pytest.mark.parametrize('number_of_partitions', [1, 3])
+def test_partitioned_join_data(number_of_partitions):
+    data = pd.DataFrame({'ID': [str(i) for i in range(20)], 'Sport': [str(i % 7) for i in range(20)]})
+    parent_data = pd.DataFrame({'ID': [str(i % 5) for i in range(10)], 'Name': [f'Sport{i}' for i in range(10)]})
+    join_conditions = [('Sport', 'ID')]
+
+    data_chunks = (data.iloc[i:i + 6] for i in range(0, len(data), 6))
+    parent_data_chunks = (parent_data.iloc[i:i + 4] for i in range(0, len(parent_data), 4))
+    joined_partitions = list(partitioned_join_data(data_chunks, parent_data_chunks, _get_rml_rule(join_conditions),
+                                                   'object_join_conditions', number_of_partitions))
+
+    assert len(joined_partitions) <= number_of_partitions
+    assert _get_joined_rows(pd.concat(joined_partitions)) == _get_expected_rows(data, parent_data, join_conditions)
+
+
+@pytest.mark.parametrize('chunk_size', [0, 1])
+def test_partitioned_join(monkeypatch, chunk_size):
+    import morph_kgc.materializer
+
+    # the partitioned join is used with and without chunks
+    partitioned_joins = []
+    monkeypatch.setattr(morph_kgc.materializer, 'partitioned_join_data',
+                        lambda *args: partitioned_joins.append(args) or partitioned_join_data(*args))
+
+    test_dir = os.path.join(TEST_DIR, 'rml-core', 'csv', 'RMLTC0009b')
+
+    g = Graph()
+    g.parse(os.path.join(test_dir, 'output.nq'))
+
+    config = f"[CONFIGURATION]\nnumber_of_processes=1\nchunk_size={chunk_size}\njoin_partitions=3\n" \
+             f"output_format=N-QUADS\n[DataSource]\nmappings={os.path.join(test_dir, 'mapping.ttl')}"
+    g_morph = morph_kgc.materialize(config)
+
+    assert compare.isomorphic(g, g_morph)
+    assert partitioned_joins
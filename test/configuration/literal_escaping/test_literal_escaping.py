@@ -0,0 +1,39 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import pytest
+import pandas as pd
+
+from morph_kgc.encoding import escape_literal, escape_literal_arrow
+
+
+def test_escape_literal():
+    data_column = pd.Series(['plain', 'a "quoted" value', 'back\\slash', 'line\nbreak\r', 'tab\there', "it's"],
+                            index=range(5, 11))
+
+    escaped_column = escape_literal(data_column, ['"', '\n', '\r', '\t', "'", ''])
+
+    assert list(escaped_column.index) == list(data_column.index)
+    assert list(escaped_column) == ['plain', 'a \\"quoted\\" value', 'back\\\\slash', 'line\\nbreak\\r',
+                                    'tab\\\there', "it\\\\'s"]
+
+
+def test_escape_literal_nothing_to_escape():
+    data_column = pd.Series(['a', 'b', 'c'])
+
+    assert escape_literal(data_column, ['"', '\n', '\r']) is data_column
+
+
+def test_escape_literal_arrow():
+    pa = pytest.importorskip('pyarrow')
+    values = ['plain', 'a "quoted" value', 'back\\slash', 'line\nbreak\r', 'tab\there', "it's"]
+    literal_escaping_chars = ['"', '\n', '\r', '\t', "'", '']
+
+    escaped_values = escape_literal_arrow(pa.array(values, type=pa.string()), literal_escaping_chars)
+
+    assert escaped_values.to_pylist() == list(escape_literal(pd.Series(values), literal_escaping_chars))
@@ -0,0 +1,114 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import sys
+import subprocess
+import pandas as pd
+
+from pathlib import Path
+
+from morph_kgc.args_parser import load_config_from_argument
+from morph_kgc.constants import CSV, RML_SOURCE, RML_TEMPLATE, RML_REFERENCE, RML_PARENT_TRIPLES_MAP
+from morph_kgc.mapping.mapping_scheduler import schedule_mapping_groups
+
+
+HERE = Path(__file__).parent
+ROOT = HERE.parent.parent.parent
+
+
+def _get_config(configuration=''):
+    return load_config_from_argument(f'[CONFIGURATION]\n{configuration}[DataSource]\nmappings={HERE.as_posix()}\n')
+
+
+def _get_rml_df(rules, data_path=None):
+    rml_df = pd.DataFrame([{'triples_map_id': triples_map_id, 'mapping_partition': mapping_partition,
+                            'source_name': 'DataSource1', 'source_type': CSV, 'logical_source_type': RML_SOURCE,
+                            'logical_source_value': str(data_path / logical_source_value) if data_path else
+                            logical_source_value, 'iterator': None,
+                            'subject_map_type': RML_TEMPLATE, 'subject_map_value': 'http://example.com/{ID}',
+                            'object_map_type': RML_PARENT_TRIPLES_MAP if parent else RML_REFERENCE,
+                            'object_map_value': parent if parent else 'Name'}
+                           for triples_map_id, mapping_partition, logical_source_value, parent in rules])
+
+    return rml_df, [group for _, group in rml_df.groupby(by='mapping_partition')]
+
+
+def _get_scheduled_partitions(mapping_tasks):
+    return [sorted(set().union(*[set(group['mapping_partition']) for group in mapping_task]))
+            for mapping_task in mapping_tasks]
+
+
+def test_schedule_mapping_groups(tmp_path):
+    for file_name in ['student.csv', 'sport.csv', 'city.csv']:
+        (tmp_path / file_name).write_text('ID,Name\n' + '1,A\n' * 100)
+
+    rml_df, mapping_groups = _get_rml_df([('#TM1', '1', 'student.csv', None),
+                                          ('#TM2', '2', 'sport.csv', None),
+                                          ('#TM3', '3', 'student.csv', None),
+                                          ('#TM4', '4', 'city.csv', '#TM2')], tmp_path)
+
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, _get_config('number_of_processes=2\n'))
+
+    # mapping groups reading the same sources (also parent sources) are in the same task
+    assert sorted(_get_scheduled_partitions(mapping_tasks)) == [['1', '3'], ['2', '4']]
+
+
+def test_schedule_mapping_groups_single_process():
+    rml_df, mapping_groups = _get_rml_df([('#TM1', '1', 'student.csv', None),
+                                          ('#TM2', '2', 'sport.csv', None),
+                                          ('#TM3', '3', 'student.csv', None)])
+
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, _get_config('number_of_processes=1\n'))
+
+    # the most costly task is the first one
+    assert _get_scheduled_partitions(mapping_tasks) == [['1', '3'], ['2']]
+
+
+def test_schedule_mapping_groups_balance():
+    rml_df, mapping_groups = _get_rml_df([(f'#TM{i}', str(i), 'student.csv', None) for i in range(4)])
+
+    # a single source shared by all the mapping groups is split over the tasks to balance them
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, _get_config('number_of_processes=2\n'))
+
+    assert [len(mapping_task) for mapping_task in mapping_tasks] == [1, 1, 1, 1]
+
+
+def test_schedule_mapping_groups_shards():
+    rml_df, mapping_groups = _get_rml_df([('#TM1', '1', 'student.csv', None), ('#TM2', '2', 'sport.csv', None)])
+
+    config = _get_config('number_of_processes=4\nshard_mapping_groups=yes\n')
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, config)
+
+    # each mapping group reads a single source and is split into 2 shards
+    assert sorted(_get_scheduled_partitions(mapping_tasks)) == [['1'], ['1'], ['2'], ['2']]
+    assert sorted((task[0].iloc[0]['mapping_partition'], task[0].iloc[0]['mapping_shard']) for task in mapping_tasks) == \
+           [('1', 0), ('1', 1), ('2', 0), ('2', 1)]
+
+
+def _materialize_to_file(tmp_path, configuration):
+    config_path = tmp_path / 'config.ini'
+    output_path = tmp_path / 'output.nt'
+    config_path.write_text(f'[CONFIGURATION]\noutput_file={output_path.as_posix()}\n{configuration}'
+                           f"[DataSource]\nmappings={(HERE / 'mapping.ttl').as_posix()}\n", encoding='utf-8')
+
+    # the mapping uses paths relative to the root of the repository
+    subprocess.check_call([sys.executable, '-m', 'morph_kgc', config_path.as_posix()], cwd=ROOT)
+
+    return output_path.read_text(encoding='utf-8').splitlines()
+
+
+def test_mapping_group_shards(tmp_path):
+    (tmp_path / 'sharded').mkdir()
+
+    triples = _materialize_to_file(tmp_path, 'number_of_processes=1\nmapping_partitioning=no\n')
+    sharded_triples = _materialize_to_file(tmp_path / 'sharded', 'number_of_processes=3\nmapping_partitioning=no\n'
+                                                                  'shard_mapping_groups=yes\n')
+
+    # the shards generate disjoint sets of triples
+    assert len(sharded_triples) == len(set(sharded_triples))
+    assert set(sharded_triples) == set(triples)
@@ -0,0 +1,44 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import pytest
+import pandas as pd
+
+from falcon.uri import encode_value
+from urllib.parse import quote
+
+from morph_kgc.encoding import percent_encode, percent_encode_arrow
+
+
+VALUES = ['', 'abc-123_.~', 'a b', 'a/b:c', '50%', 'ñandú', '中文', '😀', 'a"b\\c', '{x}', 'a b', 'q?x=1&y=2#z',
+          'a\x00b', 'a\x00c', 'a\x00b']
+
+
+def test_percent_encode():
+    data_column = pd.Series(VALUES, index=range(10, 10 + len(VALUES)))
+
+    encoded_column = percent_encode(data_column)
+
+    assert list(encoded_column.index) == list(data_column.index)
+    assert list(encoded_column) == [encode_value(value) for value in VALUES]
+
+
+@pytest.mark.parametrize('safe', ['/:', '%', '/:ñ?&=', ''])
+def test_percent_encode_safe(safe):
+    data_column = pd.Series(VALUES)
+
+    assert list(percent_encode(data_column, safe=safe)) == [quote(value, safe=safe) for value in VALUES]
+
+
+@pytest.mark.parametrize('safe', [None, '/:', ''])
+def test_percent_encode_arrow(safe):
+    pa = pytest.importorskip('pyarrow')
+
+    encoded_values = percent_encode_arrow(pa.array(VALUES, type=pa.string()), safe=safe)
+
+    assert encoded_values.to_pylist() == list(percent_encode(pd.Series(VALUES), safe=safe))
@@ -0,0 +1,62 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import morph_kgc
+import pandas as pd
+
+from morph_kgc.args_parser import load_config_from_argument
+from morph_kgc.data_source import relational_db
+
+
+TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'r2rml', 'R2RMLTC0009a')
+
+
+def _get_config():
+    return f"[CONFIGURATION]\nnumber_of_processes=1\noutput_format=N-QUADS\n" \
+           f"[DataSource]\nmappings={os.path.join(TEST_DIR, 'mapping.ttl')}\n" \
+           f"db_url=sqlite:///{os.path.join(TEST_DIR, 'resource.db')}"
+
+
+def test_engine_registry():
+    config = load_config_from_argument(_get_config())
+
+    db_connection, db_dialect = relational_db._relational_db_connection(config, 'DataSource')
+    assert relational_db._relational_db_connection(config, 'DataSource')[0] is db_connection
+    assert db_dialect == 'SQLITE'
+
+    relational_db.clear_relational_db_caches()
+    assert relational_db._relational_db_connection(config, 'DataSource')[0] is not db_connection
+    relational_db.clear_relational_db_caches()
+
+
+def test_table_schema_cache(monkeypatch):
+    config = load_config_from_argument(_get_config())
+    db_connection, db_dialect = relational_db._relational_db_connection(config, 'DataSource')
+
+    schema_queries = []
+    pandas_read_sql_query = pd.read_sql_query
+
+    def read_sql_query(sql_query, *args, **kwargs):
+        schema_queries.append(sql_query)
+        return pandas_read_sql_query(sql_query, *args, **kwargs)
+
+    monkeypatch.setattr(relational_db.pd, 'read_sql_query', read_sql_query)
+    for _ in range(3):
+        schema_dict = relational_db._get_table_schema(db_connection, db_dialect, 'Student')
+
+    assert len(schema_queries) == 1
+    assert schema_dict == {'ID': 'INTEGER', 'Name': 'VARCHAR(50)', 'Sport': 'INTEGER'}
+    relational_db.clear_relational_db_caches()
+
+
+def test_caches_cleared_after_materialization():
+    morph_kgc.materialize_set(_get_config())
+
+    assert not relational_db.DB_ENGINES
+    assert not relational_db.TABLE_SCHEMAS
@@ -0,0 +1,80 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import pandas as pd
+
+from morph_kgc.constants import CSV, RML_SOURCE
+from morph_kgc.data_source.source_cache import SourceCache
+
+
+DATA = pd.DataFrame({'ID': ['1', '2', '3'], 'Name': ['Venus', 'Serena', 'Ana'], 'Sport': ['Tennis'] * 3})
+
+
+def _get_rml_rule(logical_source_value):
+    return pd.Series({'source_name': 'DataSource1', 'source_type': CSV, 'logical_source_type': RML_SOURCE,
+                      'logical_source_value': logical_source_value, 'iterator': None})
+
+
+class Reader:
+    def __init__(self):
+        self.reads = []
+
+    def __call__(self, references):
+        self.reads.append(set(references))
+        return DATA[sorted(references)]
+
+
+def test_source_cache():
+    source_cache = SourceCache(memory_budget=1024 ** 2)
+    rml_rule = _get_rml_rule('student.csv')
+    reader = Reader()
+
+    source_cache.plan(rml_rule, ['ID', 'Name'])
+    source_cache.plan(rml_rule, ['ID', 'Sport'])
+
+    # the union of the planned references is read only once
+    assert set(source_cache.get_data(rml_rule, ['ID', 'Name'], reader).columns) == {'ID', 'Name', 'Sport'}
+    assert set(source_cache.get_data(rml_rule, ['Sport'], reader).columns) == {'ID', 'Name', 'Sport'}
+    assert reader.reads == [{'ID', 'Name', 'Sport'}]
+
+
+def test_source_cache_unplanned_references():
+    source_cache = SourceCache(memory_budget=1024 ** 2)
+    rml_rule = _get_rml_rule('student.csv')
+    reader = Reader()
+
+    source_cache.get_data(rml_rule, ['ID'], reader)
+    source_cache.get_data(rml_rule, ['Name'], reader)
+    source_cache.get_data(rml_rule, ['ID', 'Name'], reader)
+
+    assert reader.reads == [{'ID'}, {'ID', 'Name'}]
+
+
+def test_source_cache_eviction():
+    memory_usage = int(DATA.memory_usage(index=True, deep=True).sum())
+    source_cache = SourceCache(memory_budget=memory_usage)
+    reader = Reader()
+
+    for logical_source_value in ['student.csv', 'sport.csv', 'student.csv']:
+        source_cache.get_data(_get_rml_rule(logical_source_value), ['ID', 'Name', 'Sport'], reader)
+
+    # only one source fits in memory, the least recently used is evicted
+    assert len(reader.reads) == 3
+    assert source_cache.memory_usage <= memory_usage
+    assert [key[3] for key in source_cache.entries] == ['student.csv']
+
+
+def test_source_cache_disabled():
+    source_cache = SourceCache(memory_budget=0)
+    rml_rule = _get_rml_rule('student.csv')
+    reader = Reader()
+
+    source_cache.get_data(rml_rule, ['ID'], reader)
+    source_cache.get_data(rml_rule, ['ID'], reader)
+
+    assert len(reader.reads) == 2
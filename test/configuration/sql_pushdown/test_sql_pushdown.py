@@ -0,0 +1,100 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import sqlite3
+import pytest
+import morph_kgc
+
+from morph_kgc.encoding import get_literal_escaping_replacements
+
+
+R2RML_TEST_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'r2rml')
+
+MAPPING = """
+@prefix rr: <http://www.w3.org/ns/r2rml#> .
+@prefix ex: <http://example.com/> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+<#TM1> a rr:TriplesMap;
+    rr:logicalTable [ rr:tableName "Student" ];
+    rr:subjectMap [ rr:template "http://example.com/student/{Name}"; rr:graph ex:Graph ];
+    rr:predicateObjectMap [
+        rr:predicate ex:id;
+        rr:objectMap [ rr:column "ID"; rr:datatype xsd:integer ]
+    ];
+    rr:predicateObjectMap [
+        rr:predicate ex:comment;
+        rr:objectMap [ rr:column "Comment"; rr:language "en" ]
+    ];
+    rr:predicateObjectMap [
+        rr:predicate ex:node;
+        rr:objectMap [ rr:template "student{ID}"; rr:termType rr:BlankNode ]
+    ].
+
+<#TM2> a rr:TriplesMap;
+    rr:logicalTable [ rr:sqlQuery "SELECT ID, Name FROM Student WHERE ID > 1" ];
+    rr:subjectMap [ rr:template "http://example.com/{ID}/{Name}" ];
+    rr:predicateObjectMap [
+        rr:predicate ex:name;
+        rr:objectMap [ rr:column "Name" ]
+    ].
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    db_path = os.path.join(tmp_path, 'resource.db')
+    connection = sqlite3.connect(db_path)
+    connection.execute('CREATE TABLE Student (ID INTEGER, Name VARCHAR(50), Comment TEXT)')
+    connection.executemany('INSERT INTO Student VALUES (?, ?, ?)', [
+        (1, 'Venus', 'says "hi"'),
+        (2, 'Serena Williams', 'line\nbreak'),
+        (2, 'Serena Williams', 'line\nbreak'),
+        (3, 'Rafael/Nadal', 'back\\slash'),
+        (4, 'Roger', None),
+        (5, '', 'empty name'),
+        (6, 'nan', 'nan name'),
+    ])
+    connection.commit()
+    connection.close()
+
+    mapping_path = os.path.join(tmp_path, 'mapping.ttl')
+    with open(mapping_path, 'w') as mapping_file:
+        mapping_file.write(MAPPING)
+
+    return f'[CONFIGURATION]\nnumber_of_processes=1\noutput_format=N-QUADS\n[DataSource]\nmappings={mapping_path}\n' \
+           f'db_url=sqlite:///{db_path}'
+
+
+@pytest.mark.parametrize('chunk_size', [0, 1])
+def test_sql_pushdown(config, chunk_size):
+    expected_triples = morph_kgc.materialize_set(config.replace('[DataSource]', 'sql_pushdown=no\n[DataSource]'))
+
+    triples = morph_kgc.materialize_set(
+        config.replace('[DataSource]', f'sql_pushdown=yes\nchunk_size={chunk_size}\n[DataSource]'))
+
+    assert triples == expected_triples
+
+
+@pytest.mark.parametrize('test_case', ['R2RMLTC0005a', 'R2RMLTC0012b', 'R2RMLTC0020a'])
+def test_sql_pushdown_r2rml(test_case):
+    test_dir = os.path.join(R2RML_TEST_DIR, test_case)
+    config = f"[CONFIGURATION]\nnumber_of_processes=1\noutput_format=N-QUADS\n{{}}\n" \
+             f"[DataSource]\nmappings={os.path.join(test_dir, 'mapping.ttl')}\n" \
+             f"db_url=sqlite:///{os.path.join(test_dir, 'resource.db')}"
+
+    assert morph_kgc.materialize_set(config.format('sql_pushdown=yes')) == \
+           morph_kgc.materialize_set(config.format('sql_pushdown=no'))
+
+
+def test_literal_escaping_replacements():
+    assert get_literal_escaping_replacements(['"', '\n', '\r']) == \
+           [('\\', '\\\\'), ('\n', '\\n'), ('\r', '\\r'), ('"', '\\"')]
+    # letters cannot be replaced in SQL, replacements can be case-insensitive
+    assert get_literal_escaping_replacements(['"', 'a']) is None
@@ -0,0 +1,142 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import sqlite3
+import pytest
+import morph_kgc
+import pandas as pd
+
+from morph_kgc.args_parser import load_config_from_argument
+from morph_kgc.constants import RML_TRIPLES_MAP_CLASS, RML_TABLE_NAME
+from morph_kgc.mapping.mapping_parser import retrieve_mappings
+from morph_kgc.mapping.mapping_scheduler import schedule_mapping_groups
+from morph_kgc.materializer import _materialize_mapping_groups_to_set
+from morph_kgc.data_source.relational_db import get_sql_table_ranges, estimate_sql_table_rows, \
+    clear_relational_db_caches
+
+
+MAPPING = """
+@prefix rr: <http://www.w3.org/ns/r2rml#> .
+@prefix ex: <http://example.com/> .
+
+<#TM1> a rr:TriplesMap;
+    rr:logicalTable [ rr:tableName "Student" ];
+    rr:subjectMap [ rr:template "http://example.com/student/{ID}" ];
+    rr:predicateObjectMap [
+        rr:predicate ex:name;
+        rr:objectMap [ rr:column "Name" ]
+    ];
+    rr:predicateObjectMap [
+        rr:predicate ex:practises;
+        rr:objectMap [
+            rr:parentTriplesMap <#TM2>;
+            rr:joinCondition [ rr:child "Sport"; rr:parent "ID" ]
+        ]
+    ].
+
+<#TM2> a rr:TriplesMap;
+    rr:logicalTable [ rr:tableName "Sport" ];
+    rr:subjectMap [ rr:template "http://example.com/sport/{ID}" ];
+    rr:predicateObjectMap [
+        rr:predicate ex:name;
+        rr:objectMap [ rr:column "Name" ]
+    ].
+"""
+
+
+@pytest.fixture
+def config(tmp_path):
+    db_path = os.path.join(tmp_path, 'resource.db')
+    connection = sqlite3.connect(db_path)
+    connection.execute('CREATE TABLE Student (ID INTEGER PRIMARY KEY, Name VARCHAR(50), Sport VARCHAR(50))')
+    connection.executemany('INSERT INTO Student VALUES (?, ?, ?)',
+                           [(i, f'Student {i % 7}', f'S{i % 3}') for i in range(1, 51)])
+    # without primary key, it is split by rowid
+    connection.execute('CREATE TABLE Sport (ID VARCHAR(50), Name VARCHAR(50))')
+    connection.executemany('INSERT INTO Sport VALUES (?, ?)', [(f'S{i}', f'Sport {i}') for i in range(3)])
+    connection.commit()
+    connection.close()
+
+    mapping_path = os.path.join(tmp_path, 'mapping.ttl')
+    with open(mapping_path, 'w') as mapping_file:
+        mapping_file.write(MAPPING)
+
+    return f'[CONFIGURATION]\n[DataSource]\nmappings={mapping_path}\n' \
+           f'db_url=sqlite:///{db_path}'
+
+
+def _get_rml_rule(table_name):
+    return pd.Series({'source_name': 'DataSource', 'logical_source_type': RML_TABLE_NAME,
+                      'logical_source_value': table_name})
+
+
+@pytest.mark.parametrize('table_name, number_of_rows', [('Student', 50), ('Sport', 3)])
+def test_get_sql_table_ranges(config, table_name, number_of_rows):
+    config = load_config_from_argument(config)
+    table_ranges = get_sql_table_ranges(config, _get_rml_rule(table_name), 4)
+
+    db_path = config.get_db_url('DataSource')[len('sqlite:///'):]
+    connection = sqlite3.connect(db_path)
+    rows_in_ranges = [connection.execute(f'SELECT COUNT(*) FROM {table_name} WHERE {table_range}').fetchone()[0]
+                      for table_range in table_ranges]
+    connection.close()
+    clear_relational_db_caches()
+
+    # the ranges cover every row exactly once
+    assert 1 < len(table_ranges) <= 4
+    assert sum(rows_in_ranges) == number_of_rows
+
+
+def test_estimate_sql_table_rows(config):
+    config = load_config_from_argument(config)
+
+    # tables are not scanned, there are no statistics until the database is analyzed
+    assert estimate_sql_table_rows(config, _get_rml_rule('Student')) is None
+
+    connection = sqlite3.connect(config.get_db_url('DataSource')[len('sqlite:///'):])
+    connection.execute('ANALYZE')
+    connection.commit()
+    connection.close()
+
+    assert estimate_sql_table_rows(config, _get_rml_rule('Student')) == 50
+    assert estimate_sql_table_rows(config, _get_rml_rule('Sport')) == 3
+    clear_relational_db_caches()
+
+
+def test_schedule_table_ranges(config):
+    config = load_config_from_argument(config.replace('[DataSource]', 'number_of_processes=4\ntable_partitions=3\n'
+                                                                      '[DataSource]'))
+    rml_df, fnml_df, _ = retrieve_mappings(config)
+    asserted_mapping_df = rml_df.loc[rml_df['triples_map_type'] == RML_TRIPLES_MAP_CLASS]
+    mapping_groups = [group for _, group in asserted_mapping_df.groupby(by='mapping_partition')]
+
+    # the 2 mapping groups reading Student are split into ranges, the one reading Sport does not reference its
+    # primary key
+    mapping_tasks = schedule_mapping_groups(mapping_groups, rml_df, config)
+    table_ranges = [task[0].iloc[0].get('sql_table_range') for task in mapping_tasks
+                    if task[0].iloc[0]['logical_source_value'] == 'Student']
+    assert len(table_ranges) == 6 and len(set(table_ranges)) == 3 and None not in table_ranges
+    assert all('sql_table_range' not in task[0].columns for task in mapping_tasks
+               if task[0].iloc[0]['logical_source_value'] == 'Sport')
+
+    # the triples generated for the different ranges are disjoint
+    ranges_triples = [_materialize_mapping_groups_to_set(task, rml_df, fnml_df, config) for task in mapping_tasks
+                      if 'sql_table_range' in task[0].columns]
+    clear_relational_db_caches()
+    assert sum(len(triples) for triples in ranges_triples) == len(set().union(*ranges_triples)) == 100
+
+
+def test_table_partitions(config):
+    expected_triples = morph_kgc.materialize_set(config.replace('[DataSource]', 'number_of_processes=1\n[DataSource]'))
+
+    triples = morph_kgc.materialize_set(config.replace('[DataSource]', 'number_of_processes=4\ntable_partitions=3\n'
+                                                                       '[DataSource]'))
+
+    assert len(expected_triples) == 103
+    assert triples == expected_triples
@@ -0,0 +1,34 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import pandas as pd
+
+from pathlib import Path
+
+from morph_kgc.args_parser import load_config_from_argument
+from morph_kgc.utils import TriplesWriter
+
+
+HERE = Path(__file__).parent
+
+
+def test_triples_writer(tmp_path: Path):
+    output_path = tmp_path / 'output.nt'
+    config = load_config_from_argument(f'[CONFIGURATION]\noutput_file={output_path.as_posix()}\n'
+                                       f'[DataSource]\nmappings={HERE.as_posix()}\n')
+
+    triples = [f'<http://example.com/s{i}> <http://example.com/p> "o{i}"' for i in range(10)]
+
+    # a small block size forces several writes to the file
+    with TriplesWriter(config, block_size=64) as triples_writer:
+        triples_writer.write(pd.Series(triples[:4]))
+        triples_writer.write([])
+        triples_writer.write(triples[4:6])
+        triples_writer.write(iter(triples[6:]))
+
+    assert output_path.read_text(encoding='utf-8').splitlines() == [f'{triple} .' for triple in triples]
@@ -0,0 +1,74 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import pytest
+import pandas as pd
+
+from morph_kgc.utils import normalize_hierarchical_data
+from morph_kgc.data_source.json_extractor import get_json_extractor, get_jsonpath
+from morph_kgc.data_source.data_file import _filter_json_objects, _get_jsonpath_projection
+
+
+JSON_DATA = {
+    'students': [
+        {'ID': 1, 'Name': 'Venus', 'Sports': [{'Code': 'S1', 'Name': 'Tennis'}, {'Code': 'S2', 'Name': 'Golf'}],
+         'Languages': ['en', 'es', 'fr'], 'Address': {'City': 'Madrid', 'Zip': '28040'}},
+        {'ID': 2, 'Name': 'Serena', 'Sports': [{'Code': 'S1', 'Name': 'Tennis'}], 'Languages': ['en'],
+         'Address': {'City': None}},
+        {'ID': 3, 'Name': {'First': 'Carlos'}, 'Sports': [], 'Address': {'City': 'Murcia'}},
+        {'ID': 4, 'Sports': [{'Code': 'S3'}], 'Address': {}},
+    ],
+}
+
+
+@pytest.mark.parametrize('references', [
+    ('ID', 'Name'),
+    ('ID', 'Address.City'),
+    ('ID', 'Sports.Code'),
+    ('ID', 'Languages'),
+    ('Name', 'Missing'),
+])
+def test_json_extractor(references):
+    records = get_json_extractor('$.students[*]', references).extract(JSON_DATA)
+
+    # same data records as the normalization of the projected objects, only nulls in the references discard records
+    jsonpath_result = get_jsonpath(f'$.students[*]{_get_jsonpath_projection(references)}').parse(JSON_DATA)
+    expected_json_df = pd.json_normalize(_filter_json_objects(jsonpath_result, references))
+    expected_json_df[list(set(references).difference(expected_json_df.columns))] = None
+    expected_json_df.dropna(axis=0, how='any', subset=list(references), inplace=True)
+
+    json_df = get_json_extractor('$.students[*]', references).get_dataframe(records)
+    assert sorted(map(tuple, json_df.values.tolist())) == \
+           sorted(map(tuple, expected_json_df[list(references)].values.tolist()))
+
+
+def test_json_extractor_arrays():
+    # references under the same array take the values of the same item
+    json_extractor = get_json_extractor('$.students[*]', ('ID', 'Sports.Code', 'Sports.Name'))
+    assert json_extractor.extract(JSON_DATA) == [
+        {'ID': 1, 'Sports.Code': 'S1', 'Sports.Name': 'Tennis'}, {'ID': 1, 'Sports.Code': 'S2', 'Sports.Name': 'Golf'},
+        {'ID': 2, 'Sports.Code': 'S1', 'Sports.Name': 'Tennis'}]
+
+    # values of independent arrays are combined
+    json_extractor = get_json_extractor('$.students[*]', ('Sports.Code', 'Languages'))
+    assert len(json_extractor.extract(JSON_DATA)) == 2 * 3 + 1 * 1
+
+    # arrays that are not referenced are not expanded
+    assert len(list(normalize_hierarchical_data(get_jsonpath('$.students[0]').parse(JSON_DATA)))) == 6
+    assert get_json_extractor('$.students[*]', ('Address.Zip',)).extract(JSON_DATA) == [{'Address.Zip': '28040'}]
+
+
+def test_get_json_extractor():
+    # the extraction plan is compiled once per process
+    assert get_json_extractor('$.students[*]', ('ID', 'Name')) is get_json_extractor('$.students[*]', ('ID', 'Name'))
+    assert get_jsonpath('$.students[*]') is get_jsonpath('$.students[*]')
+
+    # JSONPath is evaluated for references that are not paths of object keys
+    assert get_json_extractor('$.students[*]', ('Sports[0].Code',)) is None
+    assert get_json_extractor('$.students[*]', ("Sports[?(@.Code=='S1')].Name",)) is None
+    assert get_json_extractor('$.students[*]', ()) is None
@@ -0,0 +1,131 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import io
+import os
+import json
+import pytest
+import morph_kgc
+import pandas as pd
+
+from jsonpath import JSONPath
+from morph_kgc.data_source.json_stream import get_streamable_jsonpath_keys, iter_json_items, JSONTokenizer
+from morph_kgc.data_source.data_file import get_file_data
+
+
+JSON_DATA = {
+    'metadata': {'numbers': [1.5e10, -2, 123456789], 'nested': [{'students': 'not these'}], 'text': 'a "[{" b'},
+    'university': {
+        'name': 'UPM',
+        'students': [{'ID': 10 + i, 'Name': f'Student é {i % 7}', 'Sports': [f'S{i % 3}', 'S9'],
+                      'Address': {'City': 'Madrid'}} for i in range(50)] +
+                    [{'ID': 1000, 'Name': None}, {'Name': 'No ID'}, {'ID': 1001, 'Name': 'Last', 'Sports': []}],
+    },
+}
+
+
+@pytest.mark.parametrize('iterator, keys', [
+    ('$[*]', []),
+    ('$.students[*]', ['students']),
+    ('$.university.students[*]', ['university', 'students']),
+    ('$.students', None),
+    ('$.students[0]', None),
+    ('$..students[*]', None),
+    ("$.students[?(@.ID > 1)]", None),
+])
+def test_get_streamable_jsonpath_keys(iterator, keys):
+    assert get_streamable_jsonpath_keys(iterator) == keys
+
+
+@pytest.mark.parametrize('keys', [[], ['university'], ['university', 'students'], ['metadata', 'numbers'],
+                                  ['university', 'missing'], ['university', 'name', 'students']])
+@pytest.mark.parametrize('block_size', [1, 7, 1024])
+def test_iter_json_items(monkeypatch, keys, block_size):
+    monkeypatch.setattr(JSONTokenizer.__init__, '__defaults__', (block_size,))
+    jsonpath = '$' + ''.join(f'.{key}' for key in keys) + '[*]'
+
+    # values spanning several blocks (and numbers truncated at the end of the buffer) are decoded as a whole
+    items = list(iter_json_items(io.StringIO(json.dumps(JSON_DATA, indent=2)), keys))
+
+    assert items == JSONPath(jsonpath).parse(JSON_DATA)
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    json_path = os.path.join(tmp_path, 'university.json')
+    with open(json_path, 'w', encoding='utf-8') as json_file:
+        json.dump(JSON_DATA, json_file)
+
+    return json_path
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    jsonl_path = os.path.join(tmp_path, 'students.jsonl')
+    with open(jsonl_path, 'w', encoding='utf-8') as jsonl_file:
+        for student in JSON_DATA['university']['students']:
+            jsonl_file.write(json.dumps(student) + '\n\n')
+
+    return jsonl_path
+
+
+def _get_rml_rule(source_type, file_path, iterator):
+    return pd.Series({'source_type': source_type, 'logical_source_type': 'http://w3id.org/rml/source',
+                      'logical_source_value': file_path, 'iterator': iterator})
+
+
+@pytest.mark.parametrize('references', [['ID', 'Name'], ['ID', 'Sports', 'Address.City'], ['Missing']])
+def test_read_json_in_chunks(json_path, jsonl_path, references):
+    json_df = get_file_data(_get_rml_rule('JSON', json_path, '$.university.students[*]'), references)
+    assert len(json_df) == {'Name': 51, 'Address.City': 100, 'Missing': 0}[references[-1]]
+
+    json_chunks = list(get_file_data(_get_rml_rule('JSON', json_path, '$.university.students[*]'), references, 8))
+    assert all(len(json_chunk) <= 8 for json_chunk in json_chunks)
+    assert pd.concat(json_chunks)[references].values.tolist() == json_df[references].values.tolist()
+
+    # each line is a document
+    jsonl_df = get_file_data(_get_rml_rule('JSONL', jsonl_path, '$'), references)
+    assert jsonl_df[references].values.tolist() == json_df[references].values.tolist()
+
+    jsonl_chunks = list(get_file_data(_get_rml_rule('JSONL', jsonl_path, '$'), references, 8))
+    assert pd.concat(jsonl_chunks)[references].values.tolist() == json_df[references].values.tolist()
+
+
+MAPPING = """
+@prefix rml: <http://w3id.org/rml/> .
+@prefix ex: <http://example.com/> .
+
+<#TM> a rml:TriplesMap;
+    rml:logicalSource [ rml:source "{file_path}"; rml:referenceFormulation rml:JSONPath; rml:iterator "{iterator}" ];
+    rml:subjectMap [ rml:template "http://example.com/student/{{ID}}" ];
+    rml:predicateObjectMap [
+        rml:predicate ex:practises;
+        rml:objectMap [ rml:template "http://example.com/sport/{{Sports}}" ]
+    ];
+    rml:predicateObjectMap [
+        rml:predicate ex:city;
+        rml:objectMap [ rml:reference "Address.City" ]
+    ].
+"""
+
+
+def test_materialize_json_lines(tmp_path, json_path, jsonl_path):
+    mappings = []
+    for file_path, iterator in [(json_path, '$.university.students[*]'), (jsonl_path, '$')]:
+        mapping_path = os.path.join(tmp_path, f'{os.path.basename(file_path)}.ttl')
+        with open(mapping_path, 'w') as mapping_file:
+            mapping_file.write(MAPPING.format(file_path=file_path, iterator=iterator))
+        mappings.append(mapping_path)
+
+    json_triples = morph_kgc.materialize_set(f'[CONFIGURATION]\nnumber_of_processes=1\n'
+                                             f'[DataSource]\nmappings={mappings[0]}')
+    jsonl_triples = morph_kgc.materialize_set(f'[CONFIGURATION]\nnumber_of_processes=1\nchunk_size=10\n'
+                                              f'[DataSource]\nmappings={mappings[1]}')
+
+    assert len(json_triples) == 150
+    assert jsonl_triples == json_triples
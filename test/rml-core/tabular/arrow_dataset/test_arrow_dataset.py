@@ -0,0 +1,151 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import os
+import pytest
+import morph_kgc
+import pandas as pd
+import pyarrow as pa
+
+from morph_kgc.data_source.data_file import get_file_data, get_file_arrow_data
+
+
+STUDENTS = pa.table({
+    'ID': pa.array(range(20), type=pa.int64()),
+    'Name': pa.array([None if i % 5 == 0 else f'Student {i}' for i in range(20)], type=pa.string()),
+    'Score': pa.array([None if i % 4 == 0 else i / 2 for i in range(20)], type=pa.float64()),
+    'Age': pa.array([None if i % 3 == 0 else 18 + i for i in range(20)], type=pa.int64()),
+})
+
+
+def _write_table(table, file_path, file_format):
+    if file_format == 'PARQUET':
+        import pyarrow.parquet as pq
+        pq.write_table(table, file_path)
+    elif file_format == 'ORC':
+        import pyarrow.orc as orc
+        orc.write_table(table, file_path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, file_path)
+
+
+def _get_rml_rule(file_path, file_format):
+    return pd.Series({'source_type': file_format, 'logical_source_type': 'http://w3id.org/rml/source',
+                      'logical_source_value': file_path})
+
+
+@pytest.fixture
+def partitioned_path(tmp_path):
+    # Hive partitioned directory, `Year` is a column of the logical source
+    for year in [2023, 2024]:
+        os.makedirs(os.path.join(tmp_path, 'students.parquet', f'Year={year}'))
+        _write_table(STUDENTS.slice(10 * (year - 2023), 10),
+                     os.path.join(tmp_path, 'students.parquet', f'Year={year}', 'part-0.parquet'), 'PARQUET')
+
+    return os.path.join(tmp_path, 'students.parquet')
+
+
+@pytest.mark.parametrize('file_format', ['PARQUET', 'ORC', 'FEATHER'])
+def test_read_arrow_dataset(tmp_path, file_format):
+    file_path = os.path.join(tmp_path, f'students.{file_format.lower()}')
+    _write_table(STUDENTS, file_path, file_format)
+    references = ['ID', 'Name', 'Score']
+
+    data = get_file_data(_get_rml_rule(file_path, file_format), references)
+    assert data.astype(str).values.tolist() == STUDENTS.select(references).to_pandas().astype(str).values.tolist()
+
+    # the rows with nulls are discarded in the scan
+    data = get_file_data(_get_rml_rule(file_path, file_format), references, na_values=['', 'nan', 'None'])
+    assert data['ID'].tolist() == [i for i in range(20) if i % 5 and i % 4]
+
+    data_chunks = list(get_file_data(_get_rml_rule(file_path, file_format), references, 3, na_values=['None']))
+    assert all(len(data_chunk) <= 3 for data_chunk in data_chunks)
+    assert pd.concat(data_chunks)['ID'].tolist() == [i for i in range(20) if i % 5]
+
+    # at least one DataFrame is generated
+    _write_table(STUDENTS.take([0, 5, 10]), file_path, file_format)
+    data_chunks = list(get_file_data(_get_rml_rule(file_path, file_format), references, 3, na_values=['None']))
+    assert len(data_chunks) == 1 and data_chunks[0].empty and list(data_chunks[0].columns) == references
+
+
+@pytest.mark.parametrize('na_values, expected_ids', [
+    ([''], list(range(20))),
+    (['nan'], [i for i in range(20) if i % 4]),
+    (['None', 'nan'], [i for i in range(20) if i % 5 and i % 4]),
+])
+def test_not_null_filter(tmp_path, na_values, expected_ids):
+    file_path = os.path.join(tmp_path, 'students.parquet')
+    _write_table(STUDENTS, file_path, 'PARQUET')
+
+    # nulls are only filtered if they are converted to some of `na_values`, and not in integer columns
+    table = get_file_arrow_data(_get_rml_rule(file_path, 'PARQUET'), ['ID', 'Name', 'Score', 'Age'],
+                                na_values=na_values)
+    assert table.column('ID').to_pylist() == expected_ids
+    assert table.column('Age').null_count == len([i for i in expected_ids if i % 3 == 0])
+
+    tables = list(get_file_arrow_data(_get_rml_rule(file_path, 'PARQUET'), ['ID', 'Name'], 100, ['None']))
+    assert len(tables) == 1 and tables[0].column('ID').to_pylist() == [i for i in range(20) if i % 5]
+
+
+def test_read_partitioned_dataset(partitioned_path):
+    expected_data = STUDENTS.select(['ID', 'Name']).to_pandas()
+    expected_data['Year'] = [2023] * 10 + [2024] * 10
+
+    for file_path in [partitioned_path, os.path.join(partitioned_path, '*', '*.parquet'),
+                      os.path.join(partitioned_path, '**', '*.parquet')]:
+        data = get_file_data(_get_rml_rule(file_path, 'PARQUET'), ['ID', 'Name', 'Year'])
+        assert data.astype(str).values.tolist() == expected_data.astype(str).values.tolist()
+
+    data = get_file_data(_get_rml_rule(os.path.join(partitioned_path, 'Year=2024', '*.parquet'), 'PARQUET'), ['ID'])
+    assert data['ID'].tolist() == list(range(10, 20))
+
+    with pytest.raises(FileNotFoundError):
+        get_file_data(_get_rml_rule(os.path.join(partitioned_path, '*.orc'), 'PARQUET'), ['ID'])
+
+
+MAPPING = """
+@prefix rml: <http://w3id.org/rml/> .
+@prefix ex: <http://example.com/> .
+
+<#TM> a rml:TriplesMap;
+    rml:logicalSource [ rml:source "{file_path}"; rml:referenceFormulation rml:Parquet ];
+    rml:subjectMap [ rml:template "http://example.com/student/{{ID}}" ];
+    rml:predicateObjectMap [
+        rml:predicate ex:name;
+        rml:objectMap [ rml:reference "Name" ]
+    ];
+    rml:predicateObjectMap [
+        rml:predicate ex:score;
+        rml:objectMap [ rml:reference "Score" ]
+    ];
+    rml:predicateObjectMap [
+        rml:predicate ex:age;
+        rml:objectMap [ rml:reference "Age" ]
+    ];
+    rml:predicateObjectMap [
+        rml:predicate ex:year;
+        rml:objectMap [ rml:reference "Year" ]
+    ].
+"""
+
+
+@pytest.mark.parametrize('configuration', ['chunk_size=4', 'source_cache_size=256', 'engine=arrow'])
+def test_materialize_partitioned_dataset(tmp_path, partitioned_path, configuration):
+    mapping_path = os.path.join(tmp_path, 'mapping.ttl')
+    with open(mapping_path, 'w') as mapping_file:
+        mapping_file.write(MAPPING.format(file_path=os.path.join(partitioned_path, '*', '*.parquet')))
+
+    config = f'[CONFIGURATION]\nnumber_of_processes=1\nna_values=,nan,None\n[DataSource]\nmappings={mapping_path}'
+    expected_triples = morph_kgc.materialize_set(config)
+
+    triples = morph_kgc.materialize_set(config.replace('[DataSource]', f'{configuration}\n[DataSource]'))
+
+    assert triples == expected_triples
+    assert len([triple for triple in triples if '/age>' in triple]) == 13
+    assert len([triple for triple in triples if '/year>' in triple]) == 20
@@ -0,0 +1,95 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import io
+import os
+import pytest
+import pandas as pd
+
+from morph_kgc.data_source.data_file import get_file_data, _get_streamable_xpath_steps, _parse_xml_file
+
+
+XML_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<university xmlns:ex="http://example.com/" name="UPM">
+    <metadata><students><student id="0"><name>Not a student</name></student></students></metadata>
+    <students>
+        {students}
+        <student id="100"><name>No sports</name></student>
+        <ex:student id="200"><name>Other namespace</name></ex:student>
+    </students>
+    <students>
+        <student id="300"><name>Second list</name><sport code="S1">Tennis</sport></student>
+    </students>
+</university>
+"""
+
+STUDENTS = ''.join(f'<student id="{i}"><name>Student {i % 7}</name><sport code="S{i % 3}">Sport {i % 3}</sport>'
+                   f'<sport code="S9">Chess</sport><address><city>Madrid</city></address></student>'
+                   for i in range(1, 51))
+
+DEFAULT_NAMESPACE_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<university xmlns="http://example.com/university/">
+    <students><student id="1"><name>Venus</name></student><student id="2"><name>Serena</name></student></students>
+</university>
+"""
+
+
+@pytest.mark.parametrize('iterator, xpath_steps', [
+    ('/university/students/student', ['university', 'students', 'student']),
+    ('/university/students/ex:student', ['university', 'students', 'ex:student']),
+    ('student', None),
+    ('//student', None),
+    ('/university/students/student[@id > 10]', None),
+    ('/university/*/student', None),
+])
+def test_get_streamable_xpath_steps(iterator, xpath_steps):
+    assert _get_streamable_xpath_steps(iterator) == xpath_steps
+
+
+@pytest.fixture
+def xml_path(tmp_path):
+    xml_path = os.path.join(tmp_path, 'university.xml')
+    with open(xml_path, 'w', encoding='utf-8') as xml_file:
+        xml_file.write(XML_DOCUMENT.format(students=STUDENTS))
+
+    return xml_path
+
+
+def _get_rml_rule(file_path, iterator):
+    return pd.Series({'source_type': 'XML', 'logical_source_type': 'http://w3id.org/rml/source',
+                      'logical_source_value': file_path, 'iterator': iterator})
+
+
+@pytest.mark.parametrize('iterator', ['/university/students/student', '/university/students/ex:student',
+                                      '/university/metadata/students/student'])
+@pytest.mark.parametrize('references', [['@id', 'name'], ['@id', 'sport', 'sport@code', 'address/city'],
+                                        ['name']])
+def test_read_xml(xml_path, iterator, references):
+    with open(xml_path, encoding='utf-8') as xml_file:
+        expected_xml_df = _parse_xml_file(xml_file, _get_rml_rule(xml_path, iterator), references)
+
+    xml_df = get_file_data(_get_rml_rule(xml_path, iterator), references)
+    assert xml_df.astype(str).values.tolist() == expected_xml_df.astype(str).values.tolist()
+
+    xml_chunks = list(get_file_data(_get_rml_rule(xml_path, iterator), references, 7))
+    assert all(len(xml_chunk) <= 7 for xml_chunk in xml_chunks)
+    assert pd.concat(xml_chunks).astype(str).values.tolist() == expected_xml_df.astype(str).values.tolist()
+
+
+def test_read_xml_default_namespace(tmp_path):
+    xml_path = os.path.join(tmp_path, 'university.xml')
+    with open(xml_path, 'w', encoding='utf-8') as xml_file:
+        xml_file.write(DEFAULT_NAMESPACE_DOCUMENT)
+
+    rml_rule = _get_rml_rule(xml_path, '/university/students/student')
+    with open(xml_path, encoding='utf-8') as xml_file:
+        expected_xml_df = _parse_xml_file(xml_file, rml_rule, ['@id', 'name'])
+
+    # names without prefix are in the default namespace
+    assert get_file_data(rml_rule, ['@id', 'name']).values.tolist() == expected_xml_df.values.tolist() == \
+           [['1', 'Venus'], ['2', 'Serena']]
@@ -0,0 +1,95 @@
+__author__ = "Julián Arenas-Guerrero"
+__credits__ = ["Julián Arenas-Guerrero"]
+
+__license__ = "Apache-2.0"
+__maintainer__ = "Julián Arenas-Guerrero"
+__email__ = "arenas.guerrero.julian@outlook.com"
+
+
+import pytest
+import pandas as pd
+
+from morph_kgc.fnml.built_in_functions import bif_dict
+
+
+GREL = 'http://users.ugent.be/~bjdmeest/function/grel.ttl#'
+BUILT_IN = 'https://github.com/morph-kgc/morph-kgc/function/built-in.ttl#'
+
+INTEGERS = ['0', '7', '-12', '+3', '00', '123456789012345678']
+FLOATS = ['-0.0', '2.5', '-2.5', '3.5', '1e3', '.25', '7.']
+STRINGS = ['Venus Williams', '  Serena  ', 'ROGER', 'rafael nadal', '', 'a,b,c', 'Ça va ß', 'ab-ab-']
+DATES = ['2014-03-14T05:30:04.000789', '2020-01-01', '1999-12-31 23:59:59', '2021-06-15T10:00:00']
+
+
+def _execute_by_row(fun_id, params):
+    function = bif_dict[fun_id]['function']
+    number_of_rows = max(len(value) for value in params.values() if isinstance(value, pd.Series))
+    rows = [{name: value.iloc[i] if isinstance(value, pd.Series) else value for name, value in params.items()}
+            for i in range(number_of_rows)]
+
+    return [str(function(**row_params)) for row_params in rows]
+
+
+@pytest.mark.parametrize('fun_id, params', [
+    (f'{GREL}toLowerCase', {'string': STRINGS}),
+    (f'{GREL}toUpperCase', {'string': STRINGS}),
+    (f'{GREL}string_toTitlecase', {'string': STRINGS}),
+    (f'{GREL}string_trim', {'string': STRINGS}),
+    (f'{GREL}string_length', {'string': STRINGS}),
+    (f'{GREL}reverse', {'string': STRINGS}),
+    (f'{GREL}string_contains', {'string': STRINGS, 'substring': 'a'}),
+    (f'{GREL}string_startsWith', {'string': STRINGS, 'substring': 'ab'}),
+    (f'{GREL}string_endsWith', {'string': STRINGS, 'substring': '-'}),
+    (f'{GREL}string_replace', {'string': STRINGS, 'old_substring': 'a', 'new_substring': 'o'}),
+    (f'{GREL}string_split', {'string': STRINGS, 'separator': ','}),
+    (f'{GREL}string_substring', {'string': STRINGS, 'param_int_i_from': '1', 'param_int_i_opt_to': '4'}),
+    (f'{GREL}string_chomp', {'string': STRINGS, 'separator': 'ab-'}),
+    (f'{BUILT_IN}concat', {'string1': STRINGS, 'string2': 'x', 'separator': '_'}),
+    (f'{BUILT_IN}concat', {'string1': STRINGS, 'string2': STRINGS[::-1]}),
+    (f'{GREL}math_abs', {'value': INTEGERS}),
+    (f'{GREL}math_ceil', {'value': INTEGERS}),
+    (f'{GREL}math_floor', {'number': INTEGERS}),
+    (f'{GREL}math_even', {'value': INTEGERS}),
+    (f'{GREL}math_odd', {'value': INTEGERS}),
+    (f'{GREL}math_max', {'number': INTEGERS, 'number2': INTEGERS[::-1]}),
+    (f'{GREL}math_abs', {'value': FLOATS}),
+    (f'{GREL}math_ceil', {'value': FLOATS}),
+    (f'{GREL}math_floor', {'number': FLOATS}),
+    (f'{GREL}math_even', {'value': FLOATS}),
+    (f'{GREL}math_odd', {'value': FLOATS}),
+    (f'{GREL}math_max', {'number': FLOATS, 'number2': FLOATS[::-1]}),
+    (f'{GREL}math_round', {'number': FLOATS + ['4,894.57', '10,7']}),
+    (f'{GREL}math_min', {'number': FLOATS, 'number2': '2.5'}),
+    (f'{GREL}math_mod', {'value': ['7', '-7', '12', '0'], 'value2': '-3'}),
+    (f'{BUILT_IN}date_toDate', {'string': ['2014-03-14 05:30:04.000789', '2020-01-01 00:00:00.000000'],
+                                'format_code': '%Y-%m-%d %H:%M:%S.%f'}),
+    (f'{GREL}date_toDate', {'string': ['14/03/2014', '01/12/2020'], 'format_code': 'dd/MM/yyyy'}),
+    (f'{GREL}date_datePart', {'date': DATES, 'unit': 'minutes'}),
+    (f'{GREL}date_datePart', {'date': DATES, 'unit': 'weekday'}),
+    (f'{GREL}date_datePart', {'date': DATES, 'unit': 'ms'}),
+])
+def test_vectorized_function(fun_id, params):
+    params = {name: pd.Series(value, dtype=object) if isinstance(value, list) else value
+              for name, value in params.items()}
+
+    results = bif_dict[fun_id]['vectorized_function'](**params)
+
+    assert results is not None
+    assert results.astype(str).tolist() == _execute_by_row(fun_id, params)
+
+
+@pytest.mark.parametrize('fun_id, params', [
+    # mixed integers and floats
+    (f'{GREL}math_abs', {'value': ['1', '1.5']}),
+    # not parsed equally by literal_eval and pandas
+    (f'{GREL}math_floor', {'number': ['007', ' 5']}),
+    (f'{GREL}math_mod', {'value': ['7'], 'value2': '0'}),
+    (f'{GREL}date_datePart', {'date': ['2014-03-14T10:00:00+01:00', '2014-03-14T10:00:00+02:00'], 'unit': 'day'}),
+    (f'{GREL}date_datePart', {'date': ['20140314'], 'unit': 'day'}),
+])
+def test_vectorized_function_fallback(fun_id, params):
+    params = {name: pd.Series(value, dtype=object) if isinstance(value, list) else value
+              for name, value in params.items()}
+
+    # the scalar function is used for these values
+    assert bif_dict[fun_id]['vectorized_function'](**params) is None